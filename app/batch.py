@@ -0,0 +1,108 @@
+########################
+# Batch Evaluation     #
+########################
+
+from dataclasses import dataclass, field
+import datetime
+from decimal import Decimal
+from typing import Iterable, List, Optional
+
+from app.calculation import Calculation
+from app.exceptions import CalculatorError, OperationError, ValidationError
+from app.input_validators import InputValidator
+from app.operations import Operation
+
+
+@dataclass
+class BatchResult:
+    """
+    Outcome of evaluating one operation over columns of operands.
+
+    Rows are reported positionally: ``mask[i]`` is True when row ``i`` was
+    evaluated successfully, in which case ``results[i]`` holds its value.
+    Failed rows have a ``None`` result and the exception in ``errors[i]``.
+    ``calculations`` holds the successful rows, in input order, ready to be
+    recorded in the history.
+    """
+
+    operation: str
+    results: List[Optional[Decimal]] = field(default_factory=list)
+    mask: List[bool] = field(default_factory=list)
+    errors: List[Optional[CalculatorError]] = field(default_factory=list)
+    calculations: List[Calculation] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.mask)
+
+    @property
+    def success_count(self) -> int:
+        """Number of rows that evaluated successfully."""
+        return sum(self.mask)
+
+    @property
+    def error_count(self) -> int:
+        """Number of rows that failed validation or execution."""
+        return len(self.mask) - self.success_count
+
+
+def evaluate_batch(
+    operation: Operation,
+    operands_a: Iterable,
+    operands_b: Iterable,
+) -> BatchResult:
+    """
+    Validate and evaluate an operation over pairs of operands.
+
+    Per-row failures are collected into the result mask rather than raised,
+    so a single bad row does not abort the batch. Both operand columns are
+    validated up front with ``InputValidator.validate_numbers``.
+
+    Args:
+        operation (Operation): The operation strategy to apply.
+        operands_a (Iterable): First operands.
+        operands_b (Iterable): Second operands.
+
+    Returns:
+        BatchResult: Results, success mask and per-row errors.
+
+    Raises:
+        ValidationError: If the operand columns have different lengths.
+    """
+    name = str(operation)
+    batch = BatchResult(operation=name)
+    results = batch.results
+    mask = batch.mask
+    errors = batch.errors
+    calculations = batch.calculations
+    execute = operation.execute
+    from_result = Calculation.from_result
+    # One timestamp for the whole batch avoids a clock read per row
+    timestamp = datetime.datetime.now()
+
+    values_a, errors_a = InputValidator.validate_numbers(operands_a)
+    values_b, errors_b = InputValidator.validate_numbers(operands_b)
+    if len(values_a) != len(values_b):
+        raise ValidationError("Operand columns must have the same length")
+
+    for validated_a, validated_b, error_a, error_b in zip(values_a, values_b, errors_a, errors_b):
+        error = error_a or error_b
+        if error is None:
+            try:
+                result = execute(validated_a, validated_b)
+            except CalculatorError as e:
+                error = e
+            except Exception as e:
+                error = OperationError(f"Operation failed: {str(e)}")
+        if error is not None:
+            results.append(None)
+            mask.append(False)
+            errors.append(error)
+            continue
+        results.append(result)
+        mask.append(True)
+        errors.append(None)
+        calculations.append(
+            from_result(name, validated_a, validated_b, result, timestamp)
+        )
+
+    return batch
@@ -0,0 +1,91 @@
+########################
+# LRU Cache            #
+########################
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass
+import threading
+from typing import Any, Hashable
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Snapshot of a cache's counters."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LRUCache:
+    """
+    Bounded mapping that evicts the least recently used entry.
+
+    One cache can be shared between threads: insertions and eviction take a
+    lock, while lookups rely on the atomicity of the underlying C-level
+    ``OrderedDict`` calls so that hits stay cheap. Hits, misses and evictions
+    are counted and reported by ``stats``; under heavy concurrent use the
+    counters are approximate.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for ``key`` and mark it recently used."""
+        value = self._data.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        try:
+            self._data.move_to_end(key)
+        except KeyError:
+            # Evicted by another thread since the lookup; the value is still valid
+            pass
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store ``value``, evicting the least recently used entry when full."""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def stats(self) -> CacheStats:
+        """Return the current hit/miss/eviction counters."""
+        with self._lock:
+            return CacheStats(self.hits, self.misses, self.evictions, len(self._data), self.maxsize)
@@ -2,13 +2,22 @@
 # Calculation Model    #
 ########################
 
-from dataclasses import dataclass, field
+from dataclasses import FrozenInstanceError, dataclass, field
 import datetime
 from decimal import Decimal, InvalidOperation
 from app.logger import logger
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
-from app.exceptions import OperationError
+from app.exceptions import OperationError, ValidationError
+from app.operations import Operation, OperationFactory
+
+
+# Mapping of operation names (as reported by ``str(operation)``) to a shared
+# strategy instance, built once at import time.
+_DISPATCH: Dict[str, Operation] = {
+    operation_class.__name__: operation_class()
+    for operation_class in OperationFactory._operations.values()
+}
 
 
 @dataclass
@@ -40,13 +49,47 @@ class Calculation:
         """
         self.result = self.calculate()
 
+    @classmethod
+    def from_result(
+        cls,
+        operation: str,
+        operand1: Decimal,
+        operand2: Decimal,
+        result: Decimal,
+        timestamp: Optional[datetime.datetime] = None,
+    ) -> 'Calculation':
+        """
+        Create a calculation from an already-computed result.
+
+        Bypasses ``__post_init__`` so the operation is not evaluated a second
+        time. Used by the calculator, which has just executed the operation
+        strategy, and by loaders that trust the stored result.
+
+        Args:
+            operation (str): The name of the operation (e.g., "Addition").
+            operand1 (Decimal): The first operand.
+            operand2 (Decimal): The second operand.
+            result (Decimal): The precomputed result.
+            timestamp (datetime, optional): Time of the calculation. Defaults to now.
+
+        Returns:
+            Calculation: A new instance holding the given result.
+        """
+        calc = cls.__new__(cls)
+        calc.operation = operation
+        calc.operand1 = operand1
+        calc.operand2 = operand2
+        calc.result = result
+        calc.timestamp = timestamp if timestamp is not None else datetime.datetime.now()
+        return calc
+
     def calculate(self) -> Decimal:
         """
         Execute calculation using the specified operation.
 
-        Utilizes a dictionary to map operation names to their corresponding
-        lambda functions, enabling dynamic execution of operations based on
-        the operation name.
+        Looks up the operation name in the module-level dispatch table, which
+        maps operation names to the shared ``Operation`` strategies, so the
+        arithmetic is identical to what the calculator itself performs.
 
         Returns:
             Decimal: The result of the calculation.
@@ -54,72 +97,18 @@ class Calculation:
         Raises:
             OperationError: If the operation is unknown or the calculation fails.
         """
-        # Mapping of operation names to their corresponding functions
-        operations = {
-            "Addition": lambda x, y: x + y,
-            "Subtraction": lambda x, y: x - y,
-            "Multiplication": lambda x, y: x * y,
-            "Division": lambda x, y: x / y if y != 0 else self._raise_div_zero(),
-            "Power": lambda x, y: Decimal(pow(float(x), float(y))) if y >= 0 else self._raise_neg_power(),
-            "Root": lambda x, y: (
-                Decimal(pow(float(x), 1 / float(y))) 
-                if x >= 0 and y != 0 
-                else self._raise_invalid_root(x, y)
-            ),
-            "Modulus": lambda x, y: x % y if y != 0 else self._raise_div_zero(),
-            "IntegerDivision": lambda x, y: x // y if y != 0 else self._raise_div_zero(),
-            "Percentage": lambda x, y: (x * y) / Decimal(100) if y != 0 else self._raise_div_zero(),
-            "AbsoluteDifference": lambda x, y: abs(x - y)
-        }
-
-        # Retrieve the operation function based on the operation name
-        op = operations.get(self.operation)
+        # Retrieve the operation strategy based on the operation name
+        op = _DISPATCH.get(self.operation)
         if not op:
             raise OperationError(f"Unknown operation: {self.operation}")
 
         try:
             # Execute the operation with the provided operands
-            return op(self.operand1, self.operand2)
-        except (InvalidOperation, ValueError, ArithmeticError) as e:
+            return op.execute(self.operand1, self.operand2)
+        except (ValidationError, InvalidOperation, ValueError, ArithmeticError) as e:
             # Handle any errors that occur during calculation
             raise OperationError(f"Calculation failed: {str(e)}")
 
-    @staticmethod
-    def _raise_div_zero():  # pragma: no cover
-        """
-        Helper method to raise division by zero error.
-
-        This method is called when a division by zero is attempted.
-        """
-        raise OperationError("Division by zero is not allowed")
-
-    @staticmethod
-    def _raise_neg_power():  # pragma: no cover
-        """
-        Helper method to raise negative power error.
-
-        This method is called when a negative exponent is used in a power operation.
-        """
-        raise OperationError("Negative exponents are not supported")
-
-    @staticmethod
-    def _raise_invalid_root(x: Decimal, y: Decimal):  # pragma: no cover
-        """
-        Helper method to raise invalid root error.
-
-        This method is called when an invalid root operation is attempted, such as
-        taking the root of a negative number or using zero as the root degree.
-
-        Args:
-            x (Decimal): The number from which the root is taken.
-            y (Decimal): The degree of the root.
-        """
-        if y == 0:
-            raise OperationError("Zero root is undefined")
-        if x < 0:
-            raise OperationError("Cannot calculate root of negative number")
-        raise OperationError("Invalid root operation")
-
     def to_dict(self) -> Dict[str, Any]:
         """
         Convert calculation to dictionary for serialization.
@@ -156,23 +145,23 @@ class Calculation:
             OperationError: If data is invalid or missing required fields.
         """
         try:
-            # Create the calculation object with the original operands
-            calc = Calculation(
+            # Create the calculation object from the stored result
+            calc = Calculation.from_result(
                 operation=data['operation'],
                 operand1=Decimal(data['operand1']),
-                operand2=Decimal(data['operand2'])
+                operand2=Decimal(data['operand2']),
+                result=Decimal(data['result']),
+                timestamp=datetime.datetime.fromisoformat(data['timestamp']),
             )
 
-            # Set the timestamp from the saved data
-            calc.timestamp = datetime.datetime.fromisoformat(data['timestamp'])
-
             # Verify the result matches (helps catch data corruption)
-            saved_result = Decimal(data['result'])
-            if calc.result != saved_result:
+            computed = calc.calculate()
+            if computed != calc.result:
                 logger.warning(
-                    f"Loaded calculation result {saved_result} "
-                    f"differs from computed result {calc.result}"
+                    f"Loaded calculation result {calc.result} "
+                    f"differs from computed result {computed}"
                 )  # pragma: no cover
+                calc.result = computed
 
             return calc
 
@@ -222,7 +211,7 @@ class Calculation:
         Returns:
             bool: True if calculations are equal, False otherwise.
         """
-        if not isinstance(other, Calculation):
+        if not isinstance(other, (Calculation, FrozenCalculation)):
             return NotImplemented
         return (
             self.operation == other.operation and
@@ -231,6 +220,17 @@ class Calculation:
             self.result == other.result
         )
 
+    def freeze(self) -> 'FrozenCalculation':
+        """
+        Return an immutable, hashable copy of this calculation.
+
+        Returns:
+            FrozenCalculation: A frozen calculation with the same data.
+        """
+        return FrozenCalculation(
+            self.operation, self.operand1, self.operand2, self.result, self.timestamp
+        )
+
     def format_result(self, precision: int | None = None) -> str:
         """
         Format the calculation result with specified precision.
@@ -255,3 +255,97 @@ class Calculation:
             )
         except InvalidOperation:  # pragma: no cover
             return str(self.result)
+
+
+
+class FrozenCalculation:
+    """
+    Immutable, slotted Value Object representing a single calculation.
+
+    Holds the same data as Calculation but without a per-instance ``__dict__``,
+    and can be used as a dict key or set member. The hash covers the
+    operation and operands and is computed once at construction; equality
+    also compares the result, matching Calculation. The constructor takes an
+    already-computed result, like Calculation.from_result.
+    """
+
+    __slots__ = ("operation", "operand1", "operand2", "result", "timestamp", "_hash")
+
+    def __init__(
+        self,
+        operation: str,
+        operand1: Decimal,
+        operand2: Decimal,
+        result: Decimal,
+        timestamp: Optional[datetime.datetime] = None,
+    ) -> None:
+        """
+        Initialize the frozen calculation.
+
+        Args:
+            operation (str): The name of the operation (e.g., "Addition").
+            operand1 (Decimal): The first operand.
+            operand2 (Decimal): The second operand.
+            result (Decimal): The precomputed result.
+            timestamp (datetime, optional): Time of the calculation. Defaults to now.
+        """
+        # Slot descriptors are set directly, bypassing the frozen __setattr__
+        _set_operation(self, operation)
+        _set_operand1(self, operand1)
+        _set_operand2(self, operand2)
+        _set_result(self, result)
+        _set_timestamp(self, timestamp if timestamp is not None else datetime.datetime.now())
+        _set_hash(self, hash((operation, operand1, operand2)))
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name: str) -> None:
+        raise FrozenInstanceError(f"cannot delete field '{name}'")
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __reduce__(self):
+        return (
+            FrozenCalculation,
+            (self.operation, self.operand1, self.operand2, self.result, self.timestamp),
+        )
+
+    # Behaviour shared with Calculation reads the same attributes
+    calculate = Calculation.calculate
+    to_dict = Calculation.to_dict
+    format_result = Calculation.format_result
+    __str__ = Calculation.__str__
+    __eq__ = Calculation.__eq__
+
+    def __repr__(self) -> str:
+        """Return detailed string representation of the frozen calculation."""
+        return "Frozen" + Calculation.__repr__(self)
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> 'FrozenCalculation':
+        """
+        Create a frozen calculation from dictionary.
+
+        Accepts the format produced by ``to_dict`` and verifies the stored
+        result exactly like Calculation.from_dict.
+
+        Raises:
+            OperationError: If data is invalid or missing required fields.
+        """
+        return Calculation.from_dict(data).freeze()
+
+    def thaw(self) -> Calculation:
+        """Return a mutable Calculation with the same data."""
+        return Calculation.from_result(
+            self.operation, self.operand1, self.operand2, self.result, self.timestamp
+        )
+
+
+_set_operation = FrozenCalculation.operation.__set__
+_set_operand1 = FrozenCalculation.operand1.__set__
+_set_operand2 = FrozenCalculation.operand2.__set__
+_set_result = FrozenCalculation.result.__set__
+_set_timestamp = FrozenCalculation.timestamp.__set__
+_set_hash = FrozenCalculation._hash.__set__
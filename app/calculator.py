@@ -2,18 +2,33 @@
 # Calculator Class      #
 ########################
 
-from decimal import Decimal, getcontext
+from decimal import Context, Decimal, getcontext, localcontext
+import threading
+from time import perf_counter, perf_counter_ns
 from app.logger import logger
-from typing import Union, List
+from typing import Dict, Iterable, Iterator, Union, List
 from pathlib import Path
 
+from app.batch import BatchResult, evaluate_batch
 from app.calculation import Calculation
 from app.exceptions import OperationError, ValidationError
 from app.input_validators import InputValidator
-from app.operations import Operation
-from app.history import History
-from app.observers import Observer, LoggingObserver, AutoSaveObserver
+from app.operations import Operation, OperationFactory
+from app.history import History, HistoryEvent
+from app.history_buffer import HistoryBuffer
+from app.history_binary import BINARY_HISTORY_SUFFIX
+from app.observer_dispatch import AsyncObserverDispatcher
+from app.observers import (
+    Observer,
+    LoggingObserver,
+    AutoSaveObserver,
+    MetricsObserver,
+    SQLiteHistoryObserver,
+    forward_appends,
+)
 from app.calculator_config import config
+from app.metrics import registry as metrics
+from app.timing import LatencySummary, StageTimer
 
 # Type aliases for better readability
 Number = Union[int, float, Decimal]
@@ -22,19 +37,57 @@ CalculationResult = Union[Number, str]
 
 class Calculator:
 
-    def __init__(self):
-        """Initialize the Calculator and its history manager."""
+    def __init__(self, auto_save_mode: str | None = None):
+        """
+        Initialize the Calculator and its history manager.
+
+        Args:
+            auto_save_mode (str, optional): Overrides ``CALCULATOR_AUTO_SAVE_MODE``
+                for this calculator's auto-save observer.
+        """
         self.operation_strategy: Operation = None
         self.history = History()
         self._observers: List[Observer] = []
+        # Per-stage latency histograms, or None while timing is off
+        self._timer: StageTimer | None = StageTimer() if config.stage_timing else None
+        # Time spent delivering observer notifications synchronously
+        self._notify_ns = 0
        
-        # Apply configuration settings
-        getcontext().prec = config.precision
+        # Decimal context for every calculation, entered per call so the
+        # caller's and other threads' contexts are never read or changed
+        self._context = getcontext().copy()
+        self._context.prec = config.precision
+
+        # Guards the history; calculations from calculate() are buffered per
+        # thread and committed under it in call order
+        self._lock = threading.RLock()
+        self._history_buffer = HistoryBuffer(
+            self._commit, self._lock, config.history_buffer_size
+        )
+        # Operation instances for calculate(), shared by all threads
+        self._operations: Dict[str, Operation] = {}
 
         # Register default observers
         self.add_observer(LoggingObserver())
         if config.auto_save:
-            self.add_observer(AutoSaveObserver())
+            self.add_observer(AutoSaveObserver(mode=auto_save_mode))
+        if config.sqlite_history:
+            self.add_observer(SQLiteHistoryObserver())
+        if config.metrics:
+            self.add_observer(MetricsObserver(config.metrics_file, config.metrics_interval))
+
+        # Optionally move observer work to a background thread
+        self._dispatcher: AsyncObserverDispatcher | None = None
+        if config.async_observers:
+            self._dispatcher = AsyncObserverDispatcher(
+                self._deliver,
+                maxsize=config.observer_queue_size,
+                backpressure=config.observer_backpressure,
+            )
+
+        # Observers are notified of every history change, including undo,
+        # redo, clear and load
+        self.history.subscribe(self._notify_observers)
 
         logger.info("Calculator initialized with configuration.")
         
@@ -48,13 +101,102 @@ class Calculator:
         if observer in self._observers:
             self._observers.remove(observer)
 
-    def _notify_observers(self, calculation: Calculation) -> None:
+    def _notify_observers(self, events: List[HistoryEvent]) -> None:
+        """Pass history change events to the observers.
+
+        Observers get a live read-only view of the history rather than a
+        copy; the async dispatcher takes a snapshot only when an observer
+        asks for the history.
+        """
+        if self._dispatcher is not None:
+            needs_history = any(
+                getattr(obs, "needs_history", None) is None or obs.needs_history(events)
+                for obs in self._observers
+            )
+            # Auto-save files must not miss changes, or they diverge
+            droppable = not any(getattr(obs, "persistent", False) for obs in self._observers)
+            self._dispatcher.submit(events, self.history.view(), needs_history, droppable)
+        elif self._timer is not None:
+            start = perf_counter_ns()
+            self._deliver(events, self.history.view())
+            self._notify_ns += perf_counter_ns() - start
+        else:
+            self._deliver(events, self.history.view())
+
+    def _deliver(self, events: List[HistoryEvent], history) -> None:
+        timer = self._timer
+        if timer is not None:
+            # Appends are timed under their operation, other changes by kind
+            first = events[0]
+            label = (
+                first.calculations[0].operation
+                if first.kind == "append" and first.calculations
+                else first.kind
+            )
         for obs in list(self._observers):
+            if timer is not None:
+                start = perf_counter_ns()
             try:
-                obs.update(calculation, self.history.get_history())
+                if hasattr(obs, "on_history_events"):
+                    obs.on_history_events(events, history)
+                else:
+                    forward_appends(obs, events, history)
             except Exception as exc:  # pragma: no cover - observer errors
                 logger.error(f"Observer {obs} failed: {exc}")
-        
+            if timer is not None:
+                timer.record(label, f"observer:{type(obs).__name__}", perf_counter_ns() - start)
+
+    def flush(self) -> None:
+        """Wait for pending observer notifications and flush observer output."""
+        self._history_buffer.drain()
+        if self._dispatcher is not None:
+            self._dispatcher.flush()
+        for obs in list(self._observers):
+            if hasattr(obs, "flush"):
+                obs.flush()
+
+    def close(self) -> None:
+        """Drain pending notifications, stop the dispatcher and close observers.
+
+        Notifications issued after closing are delivered synchronously.
+        """
+        self._history_buffer.drain()
+        if self._dispatcher is not None:
+            self._dispatcher.close()
+            self._dispatcher = None
+        for obs in list(self._observers):
+            if hasattr(obs, "close"):
+                obs.close()
+
+    # ------------------------------------------------------------------
+    # Stage timing
+    def enable_stats(self, enabled: bool = True) -> None:
+        """Turn per-stage timing on or off; turning it off discards the timings."""
+        if not enabled:
+            self._timer = None
+        elif self._timer is None:
+            self._timer = StageTimer()
+
+    def get_stats(self) -> Dict[str, Dict[str, LatencySummary]]:
+        """
+        Return per-stage latency percentiles recorded while timing was on.
+
+        ``perform_operation`` is split into ``validate``, ``execute``,
+        ``calculation`` (building the record), ``history`` (insert, memento
+        and trimming, excluding observers) and ``total``; every observer is
+        timed separately as ``observer:<class name>``.
+
+        Returns:
+            Dict[str, Dict[str, LatencySummary]]: ``{operation: {stage:
+            summary}}``, empty when timing is off (``CALCULATOR_STAGE_TIMING``).
+        """
+        return self._timer.snapshot() if self._timer is not None else {}
+
+    def reset_stats(self) -> None:
+        """Discard the recorded timings."""
+        if self._timer is not None:
+            self._timer.reset()
+
     def set_operation(self, operation: Operation) -> None:
         self.operation_strategy = operation
         logger.info(f"Set operation: {operation}")
@@ -68,54 +210,313 @@ class Calculator:
             raise OperationError("No operation set")
 
         try:
-            # Validate and convert inputs to Decimal
-            validated_a = InputValidator.validate_number(a)
-            validated_b = InputValidator.validate_number(b)
-
-            # Execute the operation strategy
-            result = self.operation_strategy.execute(validated_a, validated_b)
-
-            # Create a new Calculation instance with the operation details
-            calculation = Calculation(
-                operation=str(self.operation_strategy),
-                operand1=validated_a,
-                operand2=validated_b
-            )
+            with localcontext(self._context):
+                if self._timer is not None:
+                    return self._perform_timed(self._timer, a, b)
+
+                # Validate and convert inputs to Decimal
+                validated_a = InputValidator.validate_number(a)
+                validated_b = InputValidator.validate_number(b)
+
+                # Execute the operation strategy
+                result = self.operation_strategy.execute(validated_a, validated_b)
+
+                # Record the already-computed result without evaluating it again
+                calculation = Calculation.from_result(
+                    operation=str(self.operation_strategy),
+                    operand1=validated_a,
+                    operand2=validated_b,
+                    result=result
+                )
         
-            self.history.add_calculation(calculation)
-            self._notify_observers(calculation)
+                self.record_calculations([calculation])
 
-            return result
+                return result
 
         except ValidationError as e:
             # Log and re-raise validation errors
+            metrics.record_error(e)
             logger.error(f"Validation error: {str(e)}")
             raise
         except Exception as e:
             # Log and raise operation errors for any other exceptions
+            metrics.record_error(e)
             logger.error(f"Operation failed: {str(e)}")
             raise OperationError(f"Operation failed: {str(e)}")
 
+    def _perform_timed(
+        self,
+        timer: StageTimer,
+        a: Union[str, Number],
+        b: Union[str, Number]
+    ) -> Decimal:
+        """``perform_operation`` with each stage timed into ``timer``."""
+        operation = self.operation_strategy
+        name = str(operation)
+        start = perf_counter_ns()
+        validated_a = InputValidator.validate_number(a)
+        validated_b = InputValidator.validate_number(b)
+        validated = perf_counter_ns()
+        result = operation.execute(validated_a, validated_b)
+        executed = perf_counter_ns()
+        calculation = Calculation.from_result(name, validated_a, validated_b, result)
+        built = perf_counter_ns()
+        notified = self._notify_ns
+        self.record_calculations([calculation])
+        end = perf_counter_ns()
+
+        timer.record(name, "validate", validated - start)
+        timer.record(name, "execute", executed - validated)
+        timer.record(name, "calculation", built - executed)
+        timer.record(name, "history", end - built - (self._notify_ns - notified))
+        timer.record(name, "total", end - start)
+        return result
+
+    def calculate(
+        self,
+        op_name: str,
+        a: Union[str, Number],
+        b: Union[str, Number]
+    ) -> Decimal:
+        """
+        Perform one operation, safely callable from many threads at once.
+
+        Unlike ``set_operation``/``perform_operation`` this keeps no
+        per-call state on the calculator: the operation is looked up by
+        name and evaluated in a private copy of the calculator's Decimal
+        context (``CALCULATOR_PRECISION``), whatever the calling thread's
+        own context is. The calculation is recorded as its own undoable
+        step, through a per-thread buffer that is committed to the history
+        in call order once ``CALCULATOR_HISTORY_BUFFER_SIZE`` calculations
+        are pending and before the history is read or changed.
+
+        Args:
+            op_name (str): Operation identifier understood by OperationFactory.
+            a: First operand.
+            b: Second operand.
+
+        Returns:
+            Decimal: The result.
+
+        Raises:
+            ValidationError: If an operand is invalid or rejected by the operation.
+            OperationError: If the operation is unknown or fails.
+        """
+        operation = self._operations.get(op_name)
+        if operation is None:
+            try:
+                operation = OperationFactory.create_operation(op_name)
+            except ValueError as e:
+                raise OperationError(str(e)) from e
+            self._operations[op_name] = operation
+
+        try:
+            with localcontext(self._context):
+                validated_a = InputValidator.validate_number(a)
+                validated_b = InputValidator.validate_number(b)
+                result = operation.execute(validated_a, validated_b)
+        except ValidationError as e:
+            metrics.record_error(e)
+            logger.error(f"Validation error: {str(e)}")
+            raise
+        except Exception as e:
+            metrics.record_error(e)
+            logger.error(f"Operation failed: {str(e)}")
+            raise OperationError(f"Operation failed: {str(e)}") from e
+
+        self._history_buffer.record(
+            Calculation.from_result(str(operation), validated_a, validated_b, result)
+        )
+        return result
+
+    def record_calculations(self, calculations: List[Calculation]) -> None:
+        """
+        Add already computed calculations to the history as one undoable step.
+
+        Safe to call from any thread: the step is committed under the
+        calculator's lock, after every calculation ``calculate`` has buffered
+        so far, so history order follows call order. Used to record batches
+        evaluated elsewhere, e.g. by ``ParallelBatchExecutor``.
+
+        Args:
+            calculations (List[Calculation]): The calculations, in order.
+        """
+        with self._lock:
+            self._history_buffer.drain()
+            self.history.add_calculations(calculations)
+
+    def _commit(self, calculations: List[Calculation]) -> None:
+        # Called by the history buffer, under self._lock
+        self.history.add_steps(calculations)
+
+    @property
+    def decimal_context(self) -> Context:
+        """A copy of the Decimal context calculations are evaluated in."""
+        return self._context.copy()
+
+    def perform_batch(
+        self,
+        op_name: str,
+        operands_a: Iterable[Union[str, Number]],
+        operands_b: Iterable[Union[str, Number]]
+    ) -> BatchResult:
+        """
+        Evaluate one operation over columns of operands.
+
+        Rows that fail validation or execution are reported through the
+        result mask instead of raising. Successful rows are recorded in the
+        history as a single undoable step and observers are notified once.
+
+        Args:
+            op_name (str): Operation identifier understood by OperationFactory.
+            operands_a (Iterable): First operands.
+            operands_b (Iterable): Second operands, same length as operands_a.
+
+        Returns:
+            BatchResult: Per-row results, success mask and errors.
+
+        Raises:
+            OperationError: If the operation name is unknown.
+            ValidationError: If the operand columns differ in length.
+        """
+        try:
+            operation = OperationFactory.create_operation(op_name)
+        except ValueError as e:
+            raise OperationError(str(e)) from e
+
+        with localcontext(self._context):
+            batch = evaluate_batch(operation, operands_a, operands_b)
+        if batch.error_count:
+            for error in batch.errors:
+                if error is not None:
+                    metrics.record_error(error)
+            logger.error(
+                f"Batch {batch.operation}: {batch.error_count} of {len(batch)} rows failed"
+            )
+
+        if batch.calculations:
+            self.record_calculations(batch.calculations)
+
+        return batch
+
+    def evaluate(self, expression: str, /, **variables: Union[str, Number]) -> Decimal:
+        """
+        Evaluate an infix expression such as ``(a + b) * c / d``.
+
+        The expression may use ``+ - * / // % ^``, parentheses, any
+        registered operation as a two-argument function (``root(x, 3)``) and
+        variables passed as keyword arguments. Compiled plans are cached by
+        source text. Every operation applied is recorded in the history as
+        one undoable step, and observers are notified once.
+
+        Args:
+            expression (str): The expression to evaluate.
+            **variables: Variable values, validated like operation inputs.
+
+        Returns:
+            Decimal: The result.
+
+        Raises:
+            ValidationError: If the expression is malformed, a variable is
+                missing or invalid, or an operation rejects its operands.
+            OperationError: If the expression calls an unknown function or an
+                operation fails.
+        """
+        from app.expression import compile_expression
+
+        plan = compile_expression(expression)
+        values = {
+            name: InputValidator.validate_number(value)
+            for name, value in variables.items()
+        }
+        try:
+            with localcontext(self._context):
+                result, steps = plan.evaluate(values)
+        except ValidationError as e:
+            metrics.record_error(e)
+            logger.error(f"Validation error: {str(e)}")
+            raise
+        except OperationError as e:
+            metrics.record_error(e)
+            logger.error(f"Operation failed: {str(e)}")
+            raise
+
+        if steps:
+            self.record_calculations(steps)
+        return result
+
     def undo(self) -> None:
         """Undo the last calculation."""
-        self.history.undo()
+        with self._lock:
+            self._history_buffer.drain()
+            self.history.undo()
 
     def redo(self) -> None:
         """Redo the last undone calculation."""
-        self.history.redo()
+        with self._lock:
+            self._history_buffer.drain()
+            self.history.redo()
 
     def clear_history(self) -> None:
         """Clear all recorded calculations."""
-        self.history.clear()
+        with self._lock:
+            self._history_buffer.drain()
+            self.history.clear()
+
+    def clear_undo(self) -> None:
+        """Forget the undo and redo steps, keeping the calculations."""
+        with self._lock:
+            self._history_buffer.drain()
+            self.history.clear_undo()
 
     def get_history(self) -> list[Calculation]:
         """Return a copy of the calculation history."""
-        return self.history.get_history()
+        with self._lock:
+            self._history_buffer.drain()
+            return self.history.get_history()
     
+    def query_history(self, **filters) -> Iterator[Calculation]:
+        """
+        Stream calculations from the SQLite history log.
+
+        Pending observer output is flushed first so the results include the
+        current session. Accepts the filters of ``SQLiteHistoryStore.query``
+        (operation, start, end, min_result, max_result, limit).
+
+        Raises:
+            DataError: If the database cannot be read.
+        """
+        from app.history_sqlite import SQLiteHistoryStore
+
+        self.flush()
+        for obs in self._observers:
+            if isinstance(obs, SQLiteHistoryObserver):
+                return obs.store.query(**filters)
+        return SQLiteHistoryStore(config.history_db).query(**filters)
+
     def save_history(self, file_path: str | Path) -> None:
-        """Save calculation history to a CSV file."""
-        self.history.save_to_csv(file_path)
+        """Save calculation history to a CSV or binary (``.chist``) file."""
+        start = perf_counter()
+        with self._lock:
+            self._history_buffer.drain()
+            if Path(file_path).suffix == BINARY_HISTORY_SUFFIX:
+                self.history.save_to_binary(file_path)
+                file_format = "binary"
+            else:
+                self.history.save_to_csv(file_path)
+                file_format = "csv"
+        metrics.observe("calculator_history_save_seconds", perf_counter() - start, format=file_format)
 
     def load_history(self, file_path: str | Path) -> None:
-        """Load calculation history from a CSV file."""
-        self.history.load_from_csv(file_path)
\ No newline at end of file
+        """Load calculation history from a CSV or binary (``.chist``) file."""
+        start = perf_counter()
+        # Sampled results are recomputed at the calculator's precision
+        with self._lock, localcontext(self._context):
+            self._history_buffer.drain()
+            if Path(file_path).suffix == BINARY_HISTORY_SUFFIX:
+                self.history.load_from_binary(file_path)
+                file_format = "binary"
+            else:
+                self.history.load_from_csv(file_path)
+                file_format = "csv"
+        metrics.observe("calculator_history_load_seconds", perf_counter() - start, format=file_format)
\ No newline at end of file
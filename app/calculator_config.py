@@ -4,20 +4,29 @@ import os
 from dataclasses import dataclass
 from pathlib import Path
 
-try:
-    from dotenv import load_dotenv
-except Exception:  # pragma: no cover - optional dependency
-    def load_dotenv(path: str | Path, override: bool = True) -> None:
-        """Minimal .env loader used when python-dotenv is unavailable."""
-        path = Path(path)
-        if not path.exists():
-            return
-        for line in path.read_text().splitlines():
-            if '=' not in line or line.strip().startswith('#'):
-                continue
-            key, value = line.split('=', 1)
-            if override or key not in os.environ:
-                os.environ[key] = value
+def _read_env_file(path: str | Path, override: bool = True) -> None:
+    """Minimal .env loader used when python-dotenv is unavailable."""
+    path = Path(path)
+    if not path.exists():
+        return
+    for line in path.read_text().splitlines():
+        if '=' not in line or line.strip().startswith('#'):
+            continue
+        key, value = line.split('=', 1)
+        if override or key not in os.environ:
+            os.environ[key] = value
+
+
+def load_dotenv(path: str | Path, override: bool = True) -> None:
+    """Load a .env file, importing python-dotenv only when one exists."""
+    if not Path(path).exists():
+        return
+    try:
+        from dotenv import load_dotenv as _load
+    except Exception:  # pragma: no cover - optional dependency
+        _load = _read_env_file
+    _load(path, override=override)
+
 
 from app.exceptions import ConfigurationError
 
@@ -33,6 +42,35 @@ class CalculatorConfig:
     precision: int = 16
     max_input_value: int = 10 ** 20
     default_encoding: str = "utf-8"
+    auto_save_mode: str = "rewrite"
+    auto_save_fsync_interval: int = 100
+    async_observers: bool = False
+    observer_queue_size: int = 1000
+    observer_backpressure: str = "block"
+    log_buffer_size: int = 8192
+    log_flush_interval: float = 1.0
+    log_max_bytes: int = 0
+    log_backup_count: int = 3
+    load_verify_interval: int = 100
+    history_backend: str = "deque"
+    sqlite_history: bool = False
+    history_db: Path = Path("history.db")
+    history_db_batch_size: int = 100
+    operation_cache_size: int = 0
+    parse_cache_size: int = 0
+    parallel_workers: int = 0
+    parallel_chunk_size: int = 1000
+    expression_cache_size: int = 256
+    stage_timing: bool = False
+    metrics: bool = False
+    metrics_file: Path = Path("calculator.prom")
+    metrics_interval: float = 15.0
+    history_buffer_size: int = 64
+
+
+AUTO_SAVE_MODES = ("rewrite", "append")
+HISTORY_BACKENDS = ("deque", "columnar")
+BACKPRESSURE_POLICIES = ("block", "drop", "coalesce")
 
 
 def load_config(dotenv_path: str | Path = ".env") -> CalculatorConfig:
@@ -48,18 +86,63 @@ def load_config(dotenv_path: str | Path = ".env") -> CalculatorConfig:
             precision=int(os.getenv("CALCULATOR_PRECISION", "16")),
             max_input_value=int(os.getenv("CALCULATOR_MAX_INPUT_VALUE", "100000000000000000000")),
             default_encoding=os.getenv("CALCULATOR_DEFAULT_ENCODING", "utf-8"),
+            auto_save_mode=os.getenv("CALCULATOR_AUTO_SAVE_MODE", "rewrite").lower(),
+            auto_save_fsync_interval=int(os.getenv("CALCULATOR_AUTO_SAVE_FSYNC_INTERVAL", "100")),
+            async_observers=os.getenv("CALCULATOR_ASYNC_OBSERVERS", "false").lower() == "true",
+            observer_queue_size=int(os.getenv("CALCULATOR_OBSERVER_QUEUE_SIZE", "1000")),
+            observer_backpressure=os.getenv("CALCULATOR_OBSERVER_BACKPRESSURE", "block").lower(),
+            log_buffer_size=int(os.getenv("CALCULATOR_LOG_BUFFER_SIZE", "8192")),
+            log_flush_interval=float(os.getenv("CALCULATOR_LOG_FLUSH_INTERVAL", "1.0")),
+            log_max_bytes=int(os.getenv("CALCULATOR_LOG_MAX_BYTES", "0")),
+            log_backup_count=int(os.getenv("CALCULATOR_LOG_BACKUP_COUNT", "3")),
+            load_verify_interval=int(os.getenv("CALCULATOR_LOAD_VERIFY_INTERVAL", "100")),
+            history_backend=os.getenv("CALCULATOR_HISTORY_BACKEND", "deque").lower(),
+            sqlite_history=os.getenv("CALCULATOR_SQLITE_HISTORY", "false").lower() == "true",
+            history_db=Path(os.getenv("CALCULATOR_HISTORY_DB", "history.db")),
+            history_db_batch_size=int(os.getenv("CALCULATOR_HISTORY_DB_BATCH_SIZE", "100")),
+            operation_cache_size=int(os.getenv("CALCULATOR_OPERATION_CACHE_SIZE", "0")),
+            parse_cache_size=int(os.getenv("CALCULATOR_PARSE_CACHE_SIZE", "0")),
+            parallel_workers=int(os.getenv("CALCULATOR_PARALLEL_WORKERS", "0")),
+            parallel_chunk_size=int(os.getenv("CALCULATOR_PARALLEL_CHUNK_SIZE", "1000")),
+            expression_cache_size=int(os.getenv("CALCULATOR_EXPRESSION_CACHE_SIZE", "256")),
+            stage_timing=os.getenv("CALCULATOR_STAGE_TIMING", "false").lower() == "true",
+            metrics=os.getenv("CALCULATOR_METRICS", "false").lower() == "true",
+            metrics_file=Path(os.getenv("CALCULATOR_METRICS_FILE", "calculator.prom")),
+            metrics_interval=float(os.getenv("CALCULATOR_METRICS_INTERVAL", "15.0")),
+            history_buffer_size=int(os.getenv("CALCULATOR_HISTORY_BUFFER_SIZE", "64")),
         )
     except ValueError as exc:  # pragma: no cover - configuration errors
         raise ConfigurationError(f"Invalid configuration value: {exc}") from exc
+    if cfg.auto_save_mode not in AUTO_SAVE_MODES:
+        raise ConfigurationError(f"Invalid auto-save mode: {cfg.auto_save_mode}")
+    if cfg.history_backend not in HISTORY_BACKENDS:
+        raise ConfigurationError(f"Invalid history backend: {cfg.history_backend}")
+    if cfg.observer_backpressure not in BACKPRESSURE_POLICIES:
+        raise ConfigurationError(f"Invalid observer backpressure: {cfg.observer_backpressure}")
+    if cfg.operation_cache_size < 0:
+        raise ConfigurationError(f"Invalid operation cache size: {cfg.operation_cache_size}")
+    if cfg.parse_cache_size < 0:
+        raise ConfigurationError(f"Invalid parse cache size: {cfg.parse_cache_size}")
+    if cfg.parallel_workers < 0:
+        raise ConfigurationError(f"Invalid parallel worker count: {cfg.parallel_workers}")
+    if cfg.parallel_chunk_size <= 0:
+        raise ConfigurationError(f"Invalid parallel chunk size: {cfg.parallel_chunk_size}")
+    if cfg.expression_cache_size < 0:
+        raise ConfigurationError(f"Invalid expression cache size: {cfg.expression_cache_size}")
+    if cfg.metrics_interval < 0:
+        raise ConfigurationError(f"Invalid metrics interval: {cfg.metrics_interval}")
+    if cfg.history_buffer_size <= 0:
+        raise ConfigurationError(f"Invalid history buffer size: {cfg.history_buffer_size}")
 
-    cfg.log_dir.mkdir(parents=True, exist_ok=True)
-    cfg.history_dir.mkdir(parents=True, exist_ok=True)
+    # Directories are created lazily by whichever component first writes there
     if not cfg.log_file.is_absolute():
         cfg.log_file = cfg.log_dir / cfg.log_file
+    if not cfg.metrics_file.is_absolute():
+        cfg.metrics_file = cfg.log_dir / cfg.metrics_file
     if not cfg.history_file.is_absolute():
         cfg.history_file = cfg.history_dir / cfg.history_file
-    cfg.log_file.parent.mkdir(parents=True, exist_ok=True)
-    cfg.history_file.parent.mkdir(parents=True, exist_ok=True)
+    if not cfg.history_db.is_absolute():
+        cfg.history_db = cfg.history_dir / cfg.history_db
     return cfg
 
 
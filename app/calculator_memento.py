@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import List
 
 from app.calculation import Calculation
@@ -6,6 +6,13 @@ from app.calculation import Calculation
 
 @dataclass
 class CalculatorMemento:
-    """Snapshot of the calculator history state."""
-    
-    state: List[Calculation]
\ No newline at end of file
+    """Change between two consecutive history states.
+
+    Rather than a full snapshot, a memento records only the calculations that
+    a step appended (those that fit in the history) and the oldest ones it
+    evicted to respect the size limit, which is enough to undo or redo that
+    step.
+    """
+
+    added: List[Calculation] = field(default_factory=list)
+    evicted: List[Calculation] = field(default_factory=list)
@@ -2,13 +2,16 @@
 # Calculator REPL       #
 ########################
 
-from decimal import Decimal
+import datetime
+from decimal import Decimal, InvalidOperation
+import sys
+from typing import Iterable, TextIO
 
 from app.calculator import Calculator
 from app.exceptions import OperationError, ValidationError, DataError
 from app.calculator_config import config
 from app.operations import OperationFactory
-from colorama import Fore, Style, init
+from app.timing import format_stats
 
 
 def calculator_repl():  # pragma: no cover - interactive loop
@@ -18,6 +21,10 @@ def calculator_repl():  # pragma: no cover - interactive loop
     Implements a Read-Eval-Print Loop (REPL) that continuously prompts the user
     for commands, processes arithmetic operations, and manages calculation history.
     """
+    # Imported here so non-interactive entry points don't pay for it
+    from colorama import Fore, init
+
+    calc = None
     try:
         init(autoreset=True)
         # Initialize the Calculator instance
@@ -38,8 +45,11 @@ def calculator_repl():  # pragma: no cover - interactive loop
                     print("  clear - Clear calculation history")
                     print("  undo - Undo the last calculation")
                     print("  redo - Redo the last undone calculation")
-                    print("  save - Save calculation history to file")
-                    print("  load - Load calculation history from file")
+                    print("  save - Save calculation history to file (.csv, or .chist for binary)")
+                    print("  load - Load calculation history from file (.csv or .chist)")
+                    print("  eval - Evaluate an expression, e.g. (a + b) * root(c, 3)")
+                    print("  query - Search the SQLite history log by operation, time and result")
+                    print("  stats - Show per-stage timings (p50/p95/p99/max) of operations")
                     print("  exit - Exit the calculator")
                     continue # pragma: no cover
 
@@ -96,6 +106,41 @@ def calculator_repl():  # pragma: no cover - interactive loop
                         print(Fore.RED + f"Error: {e}")
                     continue # pragma: no cover
 
+                if command == 'eval':
+                    try:
+                        expression = input("Expression: ")
+                        variables = parse_variables(input("Variables (e.g. a=1, b=2): "))
+                        result = calc.evaluate(expression, **variables)
+                        print(Fore.GREEN + f"\nResult: {result.normalize()}")
+                    except (ValidationError, OperationError) as e:
+                        print(Fore.RED + f"Error: {e}")
+                    continue # pragma: no cover
+
+                if command == 'query':
+                    print(Fore.CYAN + "Leave a filter blank to skip it.")
+                    try:
+                        filters = parse_query_filters(
+                            operation=input("Operation: "),
+                            start=input("From (YYYY-MM-DD[THH:MM:SS]): "),
+                            end=input("To (YYYY-MM-DD[THH:MM:SS]): "),
+                            min_result=input("Minimum result: "),
+                            max_result=input("Maximum result: "),
+                        )
+                        count = 0
+                        for count, calc_entry in enumerate(calc.query_history(**filters), start=1):
+                            print(f"{calc_entry.timestamp.isoformat()}  {calc_entry}")
+                        print(Fore.GREEN + f"{count} matching calculations.")
+                    except (ValidationError, DataError) as e:
+                        print(Fore.RED + f"Error: {e}")
+                    continue # pragma: no cover
+
+                if command == 'stats':
+                    if config.stage_timing:
+                        print(format_stats(calc.get_stats()))
+                    else:
+                        print(Fore.YELLOW + "Stage timing is off; set CALCULATOR_STAGE_TIMING=true to enable it.")
+                    continue # pragma: no cover
+
                 if command in ['add', 'subtract', 'multiply', 'divide', 'power', 'root','int_divide', 'percent', 'abs_dif']:
                     # Perform the specified arithmetic operation
                     try:
@@ -149,3 +194,137 @@ def calculator_repl():  # pragma: no cover - interactive loop
         # Handle fatal errors during initialization
         print(Fore.RED + f"Fatal error: {e}")
         raise
+    finally:
+        # Deliver pending observer notifications before exiting
+        if calc is not None:
+            calc.close()
+
+
+
+def parse_variables(text: str) -> dict:
+    """
+    Parse the REPL's ``eval`` variable answer, e.g. ``a=1, b=2.5``.
+
+    Values are returned as strings for ``Calculator.evaluate`` to validate.
+
+    Raises:
+        ValidationError: If an item is not of the form ``name=value``.
+    """
+    variables = {}
+    for item in text.split(","):
+        if not item.strip():
+            continue
+        name, sep, value = (part.strip() for part in item.partition("="))
+        if not sep or not name.isidentifier() or not value:
+            raise ValidationError(f"Invalid variable assignment: {item.strip()}")
+        variables[name] = value
+    return variables
+
+
+def parse_query_filters(
+    operation: str = "",
+    start: str = "",
+    end: str = "",
+    min_result: str = "",
+    max_result: str = "",
+) -> dict:
+    """
+    Convert the REPL's ``query`` answers into ``Calculator.query_history`` filters.
+
+    Blank answers are left out. The operation may be given as a command name
+    (``add``) or as the recorded operation name (``Addition``). Times are ISO
+    8601 dates or date-times; a bare date as the upper bound covers that
+    whole day.
+
+    Raises:
+        ValidationError: If a time or result bound cannot be parsed.
+    """
+    filters = {}
+    operation = operation.strip()
+    if operation:
+        try:
+            operation = str(OperationFactory.create_operation(operation))
+        except ValueError:
+            pass
+        filters["operation"] = operation
+    for key, text in (("start", start), ("end", end)):
+        text = text.strip()
+        if not text:
+            continue
+        try:
+            value = datetime.datetime.fromisoformat(text)
+        except ValueError as e:
+            raise ValidationError(f"Invalid date/time: {text}") from e
+        if key == "end" and len(text) == 10:
+            value += datetime.timedelta(days=1, microseconds=-1)
+        filters[key] = value
+    for key, text in (("min_result", min_result), ("max_result", max_result)):
+        text = text.strip()
+        if not text:
+            continue
+        try:
+            value = Decimal(text)
+        except InvalidOperation as e:
+            raise ValidationError(f"Invalid number: {text}") from e
+        if not value.is_finite():
+            raise ValidationError(f"Invalid number: {text}")
+        filters[key] = value
+    return filters
+
+
+def calculator_batch(
+    lines: Iterable[str],
+    out: TextIO | None = None,
+    chunk_size: int = 1024,
+) -> int:
+    """
+    Non-interactive counterpart of the REPL.
+
+    Evaluates one ``<operation> <a> <b>`` expression per line (e.g.
+    ``add 1 2``) and writes one output line per expression: the normalized
+    result, or ``Error: <message>`` if it failed. Blank lines and lines
+    starting with ``#`` are skipped. Input is consumed line by line and output
+    is written in chunks. Batch mode has no undo, so the undo log is dropped
+    after every chunk, and auto-save appends rows instead of rewriting the
+    whole file per line; memory use is bounded by ``CALCULATOR_MAX_HISTORY_SIZE``
+    rather than growing with the input size.
+
+    Args:
+        lines (Iterable[str]): Input lines, e.g. an open file or sys.stdin.
+        out (TextIO, optional): Output stream. Defaults to sys.stdout.
+        chunk_size (int): Number of output lines buffered between writes.
+
+    Returns:
+        int: Process exit status; 1 if any expression failed, else 0.
+    """
+    out = out if out is not None else sys.stdout
+    calc = Calculator(auto_save_mode="append")
+    pending = []
+    failed = False
+    try:
+        for line in lines:
+            parts = line.split()
+            if not parts or parts[0].startswith('#'):
+                continue
+            try:
+                if len(parts) != 3:
+                    raise ValidationError(f"Expected '<operation> <a> <b>', got: {line.strip()}")
+                command, a, b = parts
+                # calculate() looks the operation up by name without logging
+                # a "Set operation" record per line
+                result = calc.calculate(command, a, b)
+                # Plain notation keeps output machine-readable ("10", not "1E+1")
+                result = format(result.normalize(), 'f')
+                pending.append(f"{result}\n")
+            except (ValidationError, OperationError) as e:
+                failed = True
+                pending.append(f"Error: {e}\n")
+            if len(pending) >= chunk_size:
+                out.write("".join(pending))
+                pending.clear()
+                calc.clear_undo()
+        out.write("".join(pending))
+        out.flush()
+    finally:
+        calc.close()
+    return 1 if failed else 0
@@ -0,0 +1,289 @@
+########################
+# Expressions          #
+########################
+
+"""
+Infix expressions over the OperationFactory registry.
+
+Grammar, lowest precedence first::
+
+    expression := term (("+" | "-") term)*
+    term       := unary (("*" | "/" | "//" | "%") unary)*
+    unary      := ("-" | "+") unary | power
+    power      := primary ("^" unary)?            (right-associative)
+    primary    := NUMBER | NAME | NAME "(" expression "," expression ")"
+                | "(" expression ")"
+
+Infix operators map to ``add``, ``subtract``, ``multiply``, ``divide``,
+``int_divide``, ``modulus`` and ``power``; every registered operation can
+also be called by name, e.g. ``root(x, 3)`` or ``percent(part, total)``.
+Other names are variables, bound when the expression is evaluated.
+
+Source text is compiled once into a flat stack program
+(``CompiledExpression``) and cached, so evaluating the same formula again
+skips tokenizing and parsing.
+"""
+
+from __future__ import annotations
+
+import datetime
+from decimal import Decimal
+import re
+from typing import Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+from app.cache import LRUCache
+from app.calculation import Calculation
+from app.calculator_config import config
+from app.exceptions import CalculatorError, OperationError, ValidationError
+from app.input_validators import InputValidator
+from app.operations import OperationFactory
+
+_TOKEN = re.compile(
+    r"\s*(?:(?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)"
+    r"|(?P<name>[A-Za-z_]\w*)"
+    r"|(?P<op>//|[-+*/^%(),]))"
+)
+
+BINARY_OPERATORS: Dict[str, str] = {
+    "+": "add",
+    "-": "subtract",
+    "*": "multiply",
+    "/": "divide",
+    "//": "int_divide",
+    "%": "modulus",
+    "^": "power",
+}
+
+# Stack program instructions
+_CONST, _VAR, _NEG, _APPLY = range(4)
+
+Token = Tuple[str, str, int]
+
+# Compiled plans keyed by source text, sized by config.expression_cache_size
+_plan_cache: Optional[LRUCache] = None
+
+
+def tokenize(source: str) -> List[Token]:
+    """
+    Split an expression into ``(kind, text, position)`` tokens.
+
+    Raises:
+        ValidationError: If the source contains an unexpected character.
+    """
+    tokens: List[Token] = []
+    position = 0
+    end = len(source.rstrip())
+    while position < end:
+        match = _TOKEN.match(source, position)
+        if match is None:
+            rest = source[position:]
+            where = position + len(rest) - len(rest.lstrip())
+            raise ValidationError(
+                f"Invalid expression: unexpected '{source[where]}' at position {where}"
+            )
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind), match.start(kind)))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser emitting a postfix program."""
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.tokens = tokenize(source)
+        self.index = 0
+        self.program: List[tuple] = []
+        self.variables: set = set()
+
+    def _peek(self) -> Optional[Token]:
+        return self.tokens[self.index] if self.index < len(self.tokens) else None
+
+    def _accept(self, *texts: str) -> Optional[str]:
+        token = self._peek()
+        if token is not None and token[0] == "op" and token[1] in texts:
+            self.index += 1
+            return token[1]
+        return None
+
+    def _expect(self, text: str) -> None:
+        if self._accept(text) is None:
+            self._error(f"expected '{text}'")
+
+    def _error(self, message: str) -> None:
+        token = self._peek()
+        where = f"'{token[1]}' at position {token[2]}" if token else "end of input"
+        raise ValidationError(f"Invalid expression: {message}, got {where}")
+
+    def parse(self) -> List[tuple]:
+        if not self.tokens:
+            raise ValidationError("Expression cannot be empty")
+        self._expression()
+        if self._peek() is not None:
+            self._error("expected an operator")
+        return self.program
+
+    def _emit_apply(self, name: str) -> None:
+        self.program.append((_APPLY, OperationFactory.create_operation(name)))
+
+    def _expression(self) -> None:
+        self._term()
+        while (operator := self._accept("+", "-")) is not None:
+            self._term()
+            self._emit_apply(BINARY_OPERATORS[operator])
+
+    def _term(self) -> None:
+        self._unary()
+        while (operator := self._accept("*", "/", "//", "%")) is not None:
+            self._unary()
+            self._emit_apply(BINARY_OPERATORS[operator])
+
+    def _unary(self) -> None:
+        operator = self._accept("-", "+")
+        if operator is None:
+            self._power()
+            return
+        self._unary()
+        if operator == "-":
+            last = self.program[-1]
+            if last[0] == _CONST:
+                # Fold negative literals instead of negating at run time
+                self.program[-1] = (_CONST, -last[1])
+            else:
+                self.program.append((_NEG, None))
+
+    def _power(self) -> None:
+        self._primary()
+        if self._accept("^") is not None:
+            self._unary()
+            self._emit_apply(BINARY_OPERATORS["^"])
+
+    def _primary(self) -> None:
+        token = self._peek()
+        if token is None:
+            self._error("expected a number, name or '('")
+        kind, text, _ = token
+        if kind == "number":
+            self.index += 1
+            self.program.append((_CONST, InputValidator.validate_number(text)))
+        elif kind == "name":
+            self.index += 1
+            if self._accept("(") is not None:
+                try:
+                    OperationFactory.create_operation(text)
+                except ValueError as e:
+                    raise OperationError(f"Unknown function: {text}") from e
+                self._expression()
+                self._expect(",")
+                self._expression()
+                self._expect(")")
+                self._emit_apply(text)
+            else:
+                self.program.append((_VAR, text))
+                self.variables.add(text)
+        elif self._accept("(") is not None:
+            self._expression()
+            self._expect(")")
+        else:
+            self._error("expected a number, name or '('")
+
+
+class CompiledExpression:
+    """
+    Reusable evaluation plan for one expression.
+
+    Holds the expression as a postfix program of constants, variable loads,
+    negations and operation applications, with operation instances created
+    once at compile time.
+    """
+
+    __slots__ = ("source", "variables", "_program")
+
+    def __init__(self, source: str) -> None:
+        parser = _Parser(source)
+        try:
+            self._program = tuple(parser.parse())
+        except RecursionError:
+            raise ValidationError("Invalid expression: nested too deeply") from None
+        self.source = source
+        self.variables: FrozenSet[str] = frozenset(parser.variables)
+
+    def evaluate(
+        self,
+        variables: Mapping[str, Decimal] | None = None,
+    ) -> Tuple[Decimal, List[Calculation]]:
+        """
+        Evaluate the plan.
+
+        Args:
+            variables: Values for the expression's variables, already validated.
+
+        Returns:
+            Tuple[Decimal, List[Calculation]]: The result and one calculation
+            per operation applied, in evaluation order.
+
+        Raises:
+            ValidationError: If a variable is unbound or an operation rejects
+                its operands.
+            OperationError: If an operation fails.
+        """
+        variables = variables or {}
+        stack: List[Decimal] = []
+        push = stack.append
+        pop = stack.pop
+        steps: List[Calculation] = []
+        timestamp = datetime.datetime.now()
+        for code, argument in self._program:
+            if code == _CONST:
+                push(argument)
+            elif code == _VAR:
+                try:
+                    push(variables[argument])
+                except KeyError:
+                    raise ValidationError(f"Undefined variable: {argument}") from None
+            elif code == _NEG:
+                stack[-1] = -stack[-1]
+            else:
+                b = pop()
+                a = pop()
+                try:
+                    result = argument.execute(a, b)
+                except CalculatorError:
+                    raise
+                except Exception as e:
+                    raise OperationError(f"Operation failed: {str(e)}") from e
+                steps.append(Calculation.from_result(str(argument), a, b, result, timestamp))
+                push(result)
+        return stack[0], steps
+
+    def __repr__(self) -> str:
+        return f"CompiledExpression({self.source!r})"
+
+
+def _get_plan_cache() -> Optional[LRUCache]:
+    global _plan_cache
+    size = config.expression_cache_size
+    if size <= 0:
+        return None
+    if _plan_cache is None or _plan_cache.maxsize != size:
+        _plan_cache = LRUCache(size)
+    return _plan_cache
+
+
+def compile_expression(source: str) -> CompiledExpression:
+    """
+    Compile an expression, reusing the cached plan for the same source text.
+
+    Raises:
+        ValidationError: If the expression is malformed.
+        OperationError: If it calls an unknown function.
+    """
+    cache = _get_plan_cache()
+    if cache is None:
+        return CompiledExpression(source)
+    plan = cache.get(source)
+    if plan is None:
+        plan = CompiledExpression(source)
+        cache.put(source, plan)
+    return plan
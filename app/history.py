@@ -1,75 +1,294 @@
 from __future__ import annotations
 
-from typing import List
+from collections import deque
+from collections.abc import Sequence
+import csv
+import datetime
+from decimal import Decimal
+from itertools import islice
+from typing import Callable, Deque, Iterator, List, NamedTuple, Tuple
 
 from app.calculation import Calculation
 from app.calculator_memento import CalculatorMemento
 from app.calculator_config import config
+from app.logger import logger
 from pathlib import Path
 
+# Column order used by the CSV persistence format
+CSV_COLUMNS = ["operation", "operand1", "operand2", "result", "timestamp"]
+
+# Number of rows converted at a time when loading a CSV file
+LOAD_CHUNK_SIZE = 10_000
+
+# Kinds of change reported to history listeners
+HISTORY_EVENT_KINDS = ("append", "evict", "undo", "redo", "clear", "load")
+
+
+class HistoryEvent(NamedTuple):
+    """One change to a History, carrying only the entries it affected.
+
+    - ``append``: ``calculations`` were added at the end.
+    - ``evict``: ``calculations`` were dropped from the front to respect the
+      size limit; follows the ``append``/``redo`` that caused it.
+    - ``undo``: ``calculations`` were removed from the end and the previously
+      evicted ``restored`` entries were put back at the front.
+    - ``redo``: ``calculations`` were added at the end again.
+    - ``clear``: every entry was removed.
+    - ``load``: the history was replaced by ``calculations``.
+    """
+
+    kind: str
+    calculations: Sequence[Calculation] = ()
+    restored: Sequence[Calculation] = ()
+
+    def __repr__(self) -> str:
+        return (
+            f"HistoryEvent({self.kind!r}, {len(self.calculations)} calculations, "
+            f"{len(self.restored)} restored)"
+        )
+
+
+HistoryListener = Callable[[List[HistoryEvent]], None]
+
+
+class HistoryView(Sequence):
+    """Read-only, zero-copy view over the calculations held by a History.
+
+    The view reflects later changes to the history; call ``list(view)`` for
+    a stable snapshot.
+    """
+
+    __slots__ = ("_calculations",)
+
+    def __init__(self, calculations: Deque[Calculation]) -> None:
+        self._calculations = calculations
+
+    def __len__(self) -> int:
+        return len(self._calculations)
+
+    def __iter__(self) -> Iterator[Calculation]:
+        return iter(self._calculations)
+
+    def __reversed__(self) -> Iterator[Calculation]:
+        return reversed(self._calculations)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self._calculations))
+            if step == 1:
+                return list(islice(self._calculations, start, stop))
+            return [self._calculations[i] for i in range(start, stop, step)]
+        return self._calculations[index]
+
+    def __repr__(self) -> str:
+        return f"HistoryView({list(self._calculations)!r})"
+
 
 class History:
-    """Manages a list of calculations with undo/redo support."""
+    """Manages a list of calculations with undo/redo support.
+
+    Calculations live in a ring buffer bounded by ``config.max_history_size``
+    (read when the history is created; 0 means unbounded), so appending and
+    evicting the oldest entry are both O(1). The buffer is a ``deque`` of
+    ``Calculation`` objects, or a compact ``ColumnarStore`` when
+    ``config.history_backend`` is ``"columnar"``.
+    """
+
+    def __init__(self, backend: str | None = None) -> None:
+        backend = backend or config.history_backend
+        maxlen = config.max_history_size or None
+        if backend == "columnar":
+            from app.history_columnar import ColumnarStore
+
+            self._calculations: Deque[Calculation] = ColumnarStore(maxlen=maxlen)
+        elif backend == "deque":
+            self._calculations = deque(maxlen=maxlen)
+        else:
+            from app.exceptions import ConfigurationError
+            raise ConfigurationError(f"Unknown history backend: {backend}")
+        # A step adds at least one entry, so steps older than the newest
+        # maxlen can no longer be undone
+        self._undo_stack: Deque[CalculatorMemento] = deque(maxlen=maxlen)
+        self._redo_stack: Deque[CalculatorMemento] = deque(maxlen=maxlen)
+        self._listeners: List[HistoryListener] = []
+
+    # ------------------------------------------------------------------
+    # Change events
+    def subscribe(self, listener: HistoryListener) -> None:
+        """Call ``listener`` with a list of HistoryEvents after every change.
 
-    def __init__(self) -> None:
-        self._calculations: List[Calculation] = []
-        self._undo_stack: List[CalculatorMemento] = []
-        self._redo_stack: List[CalculatorMemento] = []
+        Events describe only the affected entries; listeners that need the
+        whole history can read ``view()``, which already reflects the change.
+        """
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: HistoryListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _emit(self, events: List[HistoryEvent]) -> None:
+        for listener in list(self._listeners):
+            listener(events)
+
+    def _replace(self, calculations: List[Calculation]) -> None:
+        """Replace the whole history (after a load) and reset undo/redo."""
+        maxlen = self._calculations.maxlen
+        if maxlen and len(calculations) > maxlen:
+            calculations = calculations[-maxlen:]
+        self._calculations.clear()
+        self._calculations.extend(calculations)
+        self._undo_stack.clear()
+        self._redo_stack.clear()
+        if self._listeners:
+            self._emit([HistoryEvent("load", calculations)])
 
     # ------------------------------------------------------------------
     # Memento helpers
-    def _create_memento(self) -> CalculatorMemento:
-        return CalculatorMemento(self._calculations.copy())
+    def _revert_memento(
+        self, memento: CalculatorMemento
+    ) -> Tuple[List[Calculation], List[Calculation]]:
+        """Return to the state before the step recorded in the memento.
+
+        Returns:
+            Tuple[List, List]: The entries removed from the end and the
+            evicted entries put back at the front.
+        """
+        calculations = self._calculations
+        removed = min(len(memento.added), len(calculations))
+        for _ in range(removed):
+            calculations.pop()
+        # Added entries that were already evicted again are not re-inserted
+        restored = memento.evicted[:len(memento.evicted) - (len(memento.added) - removed)]
+        calculations.extendleft(reversed(restored))
+        return memento.added[len(memento.added) - removed:], restored
+
+    def _apply_memento(self, memento: CalculatorMemento) -> List[Calculation]:
+        """
+        Replay the step recorded in the memento, returning the evicted entries.
+
+        Added entries pushed out by the same step never enter the history, so
+        undo need not restore them: the memento keeps only the added entries
+        that fit and the entries evicted from the existing history, which
+        bounds it by ``maxlen`` however large the step.
+        """
+        calculations = self._calculations
+        added = memento.added
+        evicted: List[Calculation] = []
+        maxlen = calculations.maxlen
+        overflow = len(calculations) + len(added) - maxlen if maxlen else 0
+        if overflow > 0:
+            from_history = min(overflow, len(calculations))
+            evicted = [calculations.popleft() for _ in range(from_history)]
+            memento.evicted = list(evicted)
+            if len(added) > maxlen:
+                evicted.extend(added[:-maxlen])
+                memento.added = added = added[-maxlen:]
+        else:
+            memento.evicted = []
+        calculations.extend(added)
+        return evicted
 
-    def _restore_memento(self, memento: CalculatorMemento) -> None:
-        self._calculations = memento.state.copy()
+    def _emit_added(self, kind: str, added: List[Calculation], evicted: List[Calculation]) -> None:
+        events = [HistoryEvent(kind, added)]
+        if evicted:
+            events.append(HistoryEvent("evict", evicted))
+        self._emit(events)
 
     # ------------------------------------------------------------------
     # History manipulation
     def add_calculation(self, calculation: Calculation) -> None:
         """Add a new calculation and update undo stack."""
-        self._undo_stack.append(self._create_memento())
-        self._calculations.append(calculation)
+        self.add_calculations([calculation])
+
+    def add_calculations(self, calculations: List[Calculation]) -> None:
+        """Add several calculations as a single undoable step."""
+        if not calculations:
+            return
+        calculations = list(calculations)
+        memento = CalculatorMemento(added=calculations)
+        evicted = self._apply_memento(memento)
+        self._undo_stack.append(memento)
         self._redo_stack.clear()
-          
-        # Trim history if it exceeds the configured maximum size
-        if config.max_history_size and len(self._calculations) > config.max_history_size:
-            self._calculations = self._calculations[-config.max_history_size :]
+        if self._listeners:
+            self._emit_added("append", calculations, evicted)
 
     def clear(self) -> None:
         self._calculations.clear()
         self._undo_stack.clear()
         self._redo_stack.clear()
+        if self._listeners:
+            self._emit([HistoryEvent("clear")])
+
+    def add_steps(self, calculations: List[Calculation]) -> None:
+        """Add each calculation as its own undoable step, notifying listeners once."""
+        if not calculations:
+            return
+        evicted: List[Calculation] = []
+        for calculation in calculations:
+            memento = CalculatorMemento(added=[calculation])
+            evicted.extend(self._apply_memento(memento))
+            self._undo_stack.append(memento)
+        self._redo_stack.clear()
+        if self._listeners:
+            self._emit_added("append", list(calculations), evicted)
+
+    def clear_undo(self) -> None:
+        """Forget every undo and redo step, keeping the calculations."""
+        self._undo_stack.clear()
+        self._redo_stack.clear()
 
     def get_history(self) -> List[Calculation]:
-        return self._calculations.copy()
+        return list(self._calculations)
+
+    def view(self) -> HistoryView:
+        """Return a read-only view of the history without copying it."""
+        return HistoryView(self._calculations)
 
     # ------------------------------------------------------------------
     # Undo/Redo operations
     def undo(self) -> None:
         if not self._undo_stack:
             raise IndexError("No operations to undo")
-        self._redo_stack.append(self._create_memento())
         memento = self._undo_stack.pop()
-        self._restore_memento(memento)
+        removed, restored = self._revert_memento(memento)
+        self._redo_stack.append(memento)
+        if self._listeners:
+            self._emit([HistoryEvent("undo", removed, restored)])
 
     def redo(self) -> None:
         if not self._redo_stack:
             raise IndexError("No operations to redo")
-        self._undo_stack.append(self._create_memento())
         memento = self._redo_stack.pop()
-        self._restore_memento(memento)
+        evicted = self._apply_memento(memento)
+        self._undo_stack.append(memento)
+        if self._listeners:
+            self._emit_added("redo", memento.added, evicted)
 
     # ------------------------------------------------------------------
     # Persistence operations
+    def iter_rows(self) -> Iterator[Tuple[str, str, str, str, str]]:
+        """Yield the history as tuples of strings in ``CSV_COLUMNS`` order."""
+        if hasattr(self._calculations, "iter_rows"):
+            return self._calculations.iter_rows()
+        return (
+            (
+                c.operation,
+                str(c.operand1),
+                str(c.operand2),
+                str(c.result),
+                c.timestamp.isoformat(),
+            )
+            for c in self._calculations
+        )
+
     def to_dataframe(self):
         """Return the history as a pandas DataFrame."""
         import pandas as pd
 
-        data = [c.to_dict() for c in self._calculations]
-        return pd.DataFrame(
-            data,
-            columns=["operation", "operand1", "operand2", "result", "timestamp"],
+        return pd.DataFrame.from_records(
+            list(self.iter_rows()),
+            columns=CSV_COLUMNS,
         )
 
     def from_dataframe(self, df) -> None:
@@ -78,31 +297,156 @@ class History:
             Calculation.from_dict(row.to_dict())
             for _, row in df.iterrows()
         ]
-        self._calculations = calculations
-        self._undo_stack.clear()
-        self._redo_stack.clear()
+        self._replace(calculations)
 
     def save_to_csv(self, file_path: str | Path | None = None) -> None:
         """Save history to a CSV file."""
         try:
-            import pandas as pd
             path = Path(file_path) if file_path else config.history_dir / config.history_file
-            df = self.to_dataframe()
-            df.to_csv(path, index=False, encoding=config.default_encoding)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w", newline="", encoding=config.default_encoding) as fh:
+                writer = csv.writer(fh)
+                writer.writerow(CSV_COLUMNS)
+                writer.writerows(self.iter_rows())
         except Exception as exc:  # pragma: no cover - I/O errors
             from app.exceptions import DataError
             raise DataError(f"Failed to save history to CSV: {exc}") from exc
 
-    def load_from_csv(self, file_path: str | Path | None = None) -> None:
-        """Load history from a CSV file."""
+    def load_from_csv(
+        self,
+        file_path: str | Path | None = None,
+        verify_every: int | None = None,
+    ) -> None:
+        """
+        Load history from a CSV file.
+
+        The file is streamed with the stdlib ``csv`` module. Only the rows
+        that fit in the history (the last ``max_history_size``) are kept as
+        raw strings while reading, so peak memory does not depend on the file
+        size; those rows are then converted in chunks, with each column
+        (numbers, timestamps) parsed in one pass. Stored results are trusted
+        rather than recomputed, except for a sample of rows.
+
+        Args:
+            file_path: CSV file to read. Defaults to the configured history file.
+            verify_every: Recompute every Nth row's result to detect corrupt
+                data; 1 checks all rows, 0 none. Defaults to
+                ``config.load_verify_interval``.
+
+        Raises:
+            DataError: If the file is missing or malformed.
+        """
+        from app.exceptions import DataError
+
+        path = Path(file_path) if file_path else config.history_dir / config.history_file
+        if verify_every is None:
+            verify_every = config.load_verify_interval
         try:
-            import pandas as pd
-            path = Path(file_path) if file_path else config.history_dir / config.history_file
-            df = pd.read_csv(path, encoding=config.default_encoding)
-            self.from_dataframe(df)
+            with open(path, newline="", encoding=config.default_encoding) as fh:
+                reader = csv.reader(fh)
+                header = next(reader, None)
+                # Consume the file at C speed, keeping only the rows that fit
+                rows = deque(reader, maxlen=self._calculations.maxlen)
+            calculations = self._rows_to_calculations(header, rows, verify_every)
         except FileNotFoundError as exc:
-            from app.exceptions import DataError
             raise DataError(f"File not found: {path}") from exc
-        except Exception as exc:  # pragma: no cover - I/O errors
-            from app.exceptions import DataError
+        except DataError:
+            raise
+        except Exception as exc:
             raise DataError(f"Failed to load history from CSV: {exc}") from exc
+
+        self._replace(calculations)
+
+    @staticmethod
+    def _rows_to_calculations(
+        header: List[str] | None,
+        rows: Deque[List[str]],
+        verify_every: int,
+    ) -> List[Calculation]:
+        """Convert raw CSV rows to calculations, column by column."""
+        from app.exceptions import DataError
+
+        if header is None or (not rows and not "".join(header).strip()):
+            # Empty file, or an empty history saved without a header
+            return []
+        try:
+            indexes = [header.index(column) for column in CSV_COLUMNS]
+        except ValueError as exc:
+            raise DataError(f"Missing history column: {exc}") from exc
+
+        width = len(header)
+        calculations: List[Calculation] = []
+        from_result = Calculation.from_result
+        while rows:
+            chunk = [rows.popleft() for _ in range(min(LOAD_CHUNK_SIZE, len(rows)))]
+            if any(len(row) != width for row in chunk):
+                raise DataError("Malformed history row")
+            columns = list(zip(*chunk))
+            operations, operand1, operand2, results, timestamps = (
+                columns[index] for index in indexes
+            )
+            calculations.extend(map(
+                from_result,
+                operations,
+                map(Decimal, operand1),
+                map(Decimal, operand2),
+                map(Decimal, results),
+                map(datetime.datetime.fromisoformat, timestamps),
+            ))
+
+        History._verify_sample(calculations, verify_every)
+        return calculations
+
+    @staticmethod
+    def _verify_sample(calculations: List[Calculation], verify_every: int) -> None:
+        """Recompute every Nth loaded result, fixing and logging mismatches."""
+        if verify_every <= 0:
+            return
+        for calc in islice(calculations, 0, None, verify_every):
+            computed = calc.calculate()
+            if computed != calc.result:
+                logger.warning(
+                    f"Loaded calculation result {calc.result} "
+                    f"differs from computed result {computed}"
+                )
+                calc.result = computed
+
+    def save_to_binary(self, file_path: str | Path) -> None:
+        """Save history to a binary history file (see app.history_binary)."""
+        from app.history_binary import write_binary_history
+
+        write_binary_history(file_path, self.iter_rows())
+
+    def load_from_binary(
+        self,
+        file_path: str | Path,
+        verify_every: int | None = None,
+    ) -> None:
+        """
+        Load history from a binary history file.
+
+        The file is memory-mapped and only the records that fit in the
+        history (the last ``max_history_size``) are decoded.
+
+        Args:
+            file_path: Binary history file to read.
+            verify_every: Recompute every Nth row's result, as for
+                ``load_from_csv``. Defaults to ``config.load_verify_interval``.
+
+        Raises:
+            DataError: If the file is missing or malformed.
+        """
+        from app.exceptions import DataError
+        from app.history_binary import BinaryHistoryFile
+
+        if verify_every is None:
+            verify_every = config.load_verify_interval
+        with BinaryHistoryFile(file_path) as history_file:
+            maxlen = self._calculations.maxlen
+            try:
+                calculations = history_file.tail(maxlen) if maxlen else history_file[:]
+            except (ValueError, ArithmeticError, UnicodeDecodeError) as exc:
+                raise DataError(f"Corrupt binary history file: {exc}") from exc
+        self._verify_sample(calculations, verify_every)
+
+        self._replace(calculations)
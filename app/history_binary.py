@@ -0,0 +1,300 @@
+########################
+# Binary History File  #
+########################
+
+"""
+Versioned binary history format with memory-mapped random access.
+
+Layout (all integers little-endian)::
+
+    header       HEADER struct, see below
+    heap         UTF-8 text of every operand and result, back to back
+    op table     op_count entries of (u16 length, UTF-8 operation name)
+    records      record_count fixed-width RECORD structs
+
+Each record holds the operation code, the timestamp as microseconds since
+the Unix epoch plus a UTC offset in minutes (``NAIVE_OFFSET`` for naive
+timestamps), and a (heap offset, length) reference for each of operand1,
+operand2 and result. Because records are fixed-width, entry ``i`` is read
+straight from the mapped file without parsing the entries before it.
+
+Conversion tools::
+
+    python -m app.history_binary to-binary history.csv history.chist
+    python -m app.history_binary to-csv history.chist history.csv
+"""
+
+from __future__ import annotations
+
+import csv
+import datetime
+from decimal import Decimal
+import mmap
+import os
+from pathlib import Path
+import struct
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from app.calculation import Calculation
+from app.calculator_config import config
+from app.exceptions import DataError
+
+MAGIC = b"CALCHIST"
+VERSION = 1
+BINARY_HISTORY_SUFFIX = ".chist"
+
+# magic, version, reserved, op_count, record_count, heap_offset, op_table_offset, records_offset
+HEADER = struct.Struct("<8sHHIQQQQ")
+# op code, utc offset (minutes), epoch micros, (heap offset, length) x 3
+RECORD = struct.Struct("<HhqQHQHQH")
+NAME_LENGTH = struct.Struct("<H")
+
+NAIVE_OFFSET = -(2 ** 15)
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_UTC_EPOCH = _EPOCH.replace(tzinfo=datetime.timezone.utc)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+Row = Tuple[str, str, str, str, str]
+
+
+def _encode_timestamp(timestamp: datetime.datetime) -> Tuple[int, int]:
+    offset = timestamp.utcoffset()
+    if offset is None:
+        return NAIVE_OFFSET, (timestamp - _EPOCH) // _MICROSECOND
+    return offset // datetime.timedelta(minutes=1), (timestamp - _UTC_EPOCH) // _MICROSECOND
+
+
+def _decode_timestamp(offset: int, micros: int) -> datetime.datetime:
+    if offset == NAIVE_OFFSET:
+        return _EPOCH + micros * _MICROSECOND
+    zone = datetime.timezone(datetime.timedelta(minutes=offset))
+    return (_UTC_EPOCH + micros * _MICROSECOND).astimezone(zone)
+
+
+def write_binary_history(path: str | Path, rows: Iterable[Row]) -> int:
+    """
+    Write history rows to a binary history file.
+
+    Rows are ``(operation, operand1, operand2, result, timestamp)`` string
+    tuples, as produced by ``History.iter_rows`` or read from a history CSV.
+    The heap is streamed to the target file and the record table is spooled
+    to a temporary file, so memory use does not depend on the row count. The
+    file is written next to ``path`` and renamed into place.
+
+    Returns:
+        int: Number of records written.
+
+    Raises:
+        DataError: If a row is malformed or the file cannot be written.
+    """
+    import shutil
+    import tempfile
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    codes: Dict[str, int] = {}
+    count = 0
+    try:
+        with open(tmp_path, "wb") as out, tempfile.TemporaryFile() as records:
+            out.write(bytes(HEADER.size))
+            heap_offset = HEADER.size
+            position = 0
+            pack = RECORD.pack
+            for operation, operand1, operand2, result, timestamp in rows:
+                code = codes.setdefault(operation, len(codes))
+                offset, micros = _encode_timestamp(datetime.datetime.fromisoformat(timestamp))
+                refs = []
+                for text in (operand1, operand2, result):
+                    data = text.encode("utf-8")
+                    out.write(data)
+                    refs += (position, len(data))
+                    position += len(data)
+                records.write(pack(code, offset, micros, *refs))
+                count += 1
+
+            op_table_offset = heap_offset + position
+            for name in codes:
+                data = name.encode("utf-8")
+                out.write(NAME_LENGTH.pack(len(data)))
+                out.write(data)
+            records_offset = out.tell()
+            records.seek(0)
+            shutil.copyfileobj(records, out)
+
+            out.seek(0)
+            out.write(HEADER.pack(
+                MAGIC, VERSION, 0, len(codes), count,
+                heap_offset, op_table_offset, records_offset,
+            ))
+        os.replace(tmp_path, path)
+    except IndexError as exc:
+        # A row with too few fields
+        tmp_path.unlink(missing_ok=True)
+        raise DataError("Malformed history row") from exc
+    except (ValueError, struct.error, OSError) as exc:
+        tmp_path.unlink(missing_ok=True)
+        raise DataError(f"Failed to write binary history: {exc}") from exc
+    return count
+
+
+class BinaryHistoryFile:
+    """
+    Read-only, memory-mapped view of a binary history file.
+
+    Supports ``len``, indexing, slicing and ``tail`` without deserializing
+    the whole file; only the requested records are decoded. Use as a
+    context manager, or call ``close`` when done.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        try:
+            with open(self.path, "rb") as fh:
+                self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError as exc:
+            raise DataError(f"File not found: {self.path}") from exc
+        except (OSError, ValueError) as exc:
+            raise DataError(f"Failed to open binary history: {exc}") from exc
+        try:
+            self._read_header()
+        except (struct.error, UnicodeDecodeError) as exc:
+            self.close()
+            raise DataError(f"Corrupt binary history file: {self.path}") from exc
+        except DataError:
+            self.close()
+            raise
+
+    def _read_header(self) -> None:
+        (
+            magic, version, _, op_count, self._count,
+            self._heap_offset, op_table_offset, self._records_offset,
+        ) = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise DataError(f"Not a binary history file: {self.path}")
+        if version != VERSION:
+            raise DataError(f"Unsupported binary history version {version}")
+        if self._records_offset + self._count * RECORD.size > len(self._map):
+            raise DataError(f"Truncated binary history file: {self.path}")
+        names: List[str] = []
+        position = op_table_offset
+        for _ in range(op_count):
+            (length,) = NAME_LENGTH.unpack_from(self._map, position)
+            position += NAME_LENGTH.size
+            names.append(self._map[position:position + length].decode("utf-8"))
+            position += length
+        self._operations = names
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> "BinaryHistoryFile":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _text(self, offset: int, length: int) -> str:
+        start = self._heap_offset + offset
+        return self._map[start:start + length].decode("utf-8")
+
+    def _record(self, index: int):
+        return RECORD.unpack_from(self._map, self._records_offset + index * RECORD.size)
+
+    def _calculation(self, index: int) -> Calculation:
+        code, offset, micros, o1, l1, o2, l2, o3, l3 = self._record(index)
+        return Calculation.from_result(
+            self._operations[code],
+            Decimal(self._text(o1, l1)),
+            Decimal(self._text(o2, l2)),
+            Decimal(self._text(o3, l3)),
+            _decode_timestamp(offset, micros),
+        )
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._calculation(i) for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("history index out of range")
+        return self._calculation(index)
+
+    def __iter__(self) -> Iterator[Calculation]:
+        for index in range(self._count):
+            yield self._calculation(index)
+
+    def tail(self, count: int) -> List[Calculation]:
+        """Return the last ``count`` calculations."""
+        return self[max(self._count - count, 0):]
+
+    def iter_rows(self) -> Iterator[Row]:
+        """Yield records as CSV string tuples without building Decimals."""
+        names = self._operations
+        for index in range(self._count):
+            code, offset, micros, o1, l1, o2, l2, o3, l3 = self._record(index)
+            yield (
+                names[code],
+                self._text(o1, l1),
+                self._text(o2, l2),
+                self._text(o3, l3),
+                _decode_timestamp(offset, micros).isoformat(),
+            )
+
+
+def csv_to_binary(csv_path: str | Path, binary_path: str | Path) -> int:
+    """Convert a history CSV file to the binary format, streaming rows."""
+    from app.history import CSV_COLUMNS
+
+    try:
+        with open(csv_path, newline="", encoding=config.default_encoding) as fh:
+            reader = csv.reader(fh)
+            header = next(reader, None) or CSV_COLUMNS
+            try:
+                indexes = [header.index(column) for column in CSV_COLUMNS]
+            except ValueError as exc:
+                raise DataError(f"Missing history column: {exc}") from exc
+            rows = (tuple(row[i] for i in indexes) for row in reader)
+            return write_binary_history(binary_path, rows)
+    except FileNotFoundError as exc:
+        raise DataError(f"File not found: {csv_path}") from exc
+
+
+def binary_to_csv(binary_path: str | Path, csv_path: str | Path) -> int:
+    """Convert a binary history file to CSV, streaming records."""
+    from app.history import CSV_COLUMNS
+
+    with BinaryHistoryFile(binary_path) as history_file:
+        Path(csv_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(csv_path, "w", newline="", encoding=config.default_encoding) as fh:
+            writer = csv.writer(fh)
+            writer.writerow(CSV_COLUMNS)
+            writer.writerows(history_file.iter_rows())
+        return len(history_file)
+
+
+def main(argv: List[str] | None = None) -> int:
+    """Command-line entry point for converting between CSV and binary history."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Convert calculator history files")
+    parser.add_argument("direction", choices=["to-binary", "to-csv"])
+    parser.add_argument("source")
+    parser.add_argument("target")
+    args = parser.parse_args(argv)
+    convert = csv_to_binary if args.direction == "to-binary" else binary_to_csv
+    try:
+        count = convert(args.source, args.target)
+    except DataError as exc:
+        print(f"Error: {exc}")
+        return 1
+    print(f"Converted {count} records to {args.target}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    raise SystemExit(main())
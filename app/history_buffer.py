@@ -0,0 +1,99 @@
+########################
+# History Buffer       #
+########################
+
+from __future__ import annotations
+
+from itertools import count
+import threading
+from typing import Callable, List, Tuple
+
+from app.calculation import Calculation
+
+
+class _ThreadBuffer:
+    __slots__ = ("lock", "items", "thread")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.items: List[Tuple[int, Calculation]] = []
+        self.thread = threading.current_thread()
+
+
+class HistoryBuffer:
+    """
+    Collects calculations from many threads and commits them in call order.
+
+    Each thread appends to its own buffer, guarded by a lock that only the
+    owner and ``drain`` ever take, so recording threads do not contend with
+    each other. Calls are numbered from one shared counter while the owner
+    holds its buffer lock. ``drain`` holds every buffer lock at once while
+    emptying the buffers, so each number it collects was taken before any
+    number it leaves behind. Committing the collected calculations sorted by
+    number therefore preserves the global call order across drains.
+
+    ``commit`` is called under ``lock`` with calculations in call order. A
+    thread drains the buffers itself once its own buffer holds
+    ``buffer_size`` calculations; callers that read the history should
+    drain first.
+    """
+
+    def __init__(
+        self,
+        commit: Callable[[List[Calculation]], None],
+        lock: threading.RLock,
+        buffer_size: int = 64,
+    ) -> None:
+        self._commit = commit
+        self._lock = lock
+        self.buffer_size = max(1, buffer_size)
+        self._sequence = count()
+        self._local = threading.local()
+        self._buffers: List[_ThreadBuffer] = []
+        self._registry_lock = threading.Lock()
+
+    def _own_buffer(self) -> _ThreadBuffer:
+        buffer = _ThreadBuffer()
+        with self._registry_lock:
+            self._buffers.append(buffer)
+        self._local.buffer = buffer
+        return buffer
+
+    def record(self, calculation: Calculation) -> None:
+        """Buffer a calculation from the calling thread."""
+        buffer = getattr(self._local, "buffer", None) or self._own_buffer()
+        with buffer.lock:
+            buffer.items.append((next(self._sequence), calculation))
+            full = len(buffer.items) >= self.buffer_size
+        if full:
+            self.drain()
+
+    def drain(self) -> None:
+        """Commit every buffered calculation, in call order."""
+        # Unlocked peek: a calculation recorded concurrently with this check
+        # is simply committed by a later drain
+        if not any(buffer.items for buffer in self._buffers):
+            return
+        with self._lock:
+            with self._registry_lock:
+                buffers = list(self._buffers)
+            for buffer in buffers:
+                buffer.lock.acquire()
+            try:
+                collected = []
+                for buffer in buffers:
+                    collected.extend(buffer.items)
+                    buffer.items = []
+            finally:
+                for buffer in buffers:
+                    buffer.lock.release()
+            # Forget the buffers of threads that have exited
+            with self._registry_lock:
+                self._buffers = [b for b in self._buffers if b.thread.is_alive()]
+            if collected:
+                collected.sort(key=lambda item: item[0])
+                self._commit([calculation for _, calculation in collected])
+
+    def pending(self) -> int:
+        """Return the number of buffered calculations (approximate while recording)."""
+        return sum(len(buffer.items) for buffer in list(self._buffers))
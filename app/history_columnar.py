@@ -0,0 +1,259 @@
+########################
+# Columnar History     #
+########################
+
+from __future__ import annotations
+
+from array import array
+import datetime
+from decimal import Context, Decimal
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.calculation import Calculation
+
+# Marks a slot whose value did not fit the compact encoding and lives in the
+# overflow dictionary of its column instead.
+_OVERFLOW_EXPONENT = -(2 ** 31)
+_OVERFLOW_MICROS = -(2 ** 63)
+
+# Coefficients are stored as int64, so at most 18 digits are kept inline
+_MAX_INLINE_DIGITS = 18
+# Wide enough to rescale any inline coefficient without rounding
+_EXACT = Context(prec=40)
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+_INITIAL_CAPACITY = 16
+
+
+class _DecimalColumn:
+    """Decimals packed as an int64 coefficient and an int32 exponent."""
+
+    __slots__ = ("coefficients", "exponents", "overflow")
+
+    def __init__(self, capacity: int) -> None:
+        self.coefficients = array("q", bytes(8 * capacity))
+        self.exponents = array("i", bytes(4 * capacity))
+        self.overflow: Dict[int, Decimal] = {}
+
+    def set(self, slot: int, value: Decimal) -> None:
+        sign, digits, exponent = value.as_tuple()
+        if (
+            isinstance(exponent, int)
+            and len(digits) <= _MAX_INLINE_DIGITS
+            and not (sign and value.is_zero())
+        ):
+            self.coefficients[slot] = int(value.scaleb(-exponent, _EXACT))
+            self.exponents[slot] = exponent
+            if self.overflow:
+                # Drop the entry of a value this slot held before the ring wrapped
+                self.overflow.pop(slot, None)
+        else:
+            # NaN, infinities, -0 and very long coefficients
+            self.exponents[slot] = _OVERFLOW_EXPONENT
+            self.overflow[slot] = value
+
+    def get(self, slot: int) -> Decimal:
+        exponent = self.exponents[slot]
+        if exponent == _OVERFLOW_EXPONENT:
+            return self.overflow[slot]
+        # String construction is exact regardless of the context precision
+        return Decimal(f"{self.coefficients[slot]}E{exponent}")
+
+    def reorder(self, head: int, size: int, capacity: int) -> None:
+        """Unroll the ring starting at ``head`` into arrays of ``capacity``."""
+        old_capacity = len(self.exponents)
+        order = [(head + i) % old_capacity for i in range(size)]
+        self.coefficients = _unroll(self.coefficients, head, size, capacity)
+        self.exponents = _unroll(self.exponents, head, size, capacity)
+        self.overflow = {
+            new: self.overflow[old]
+            for new, old in enumerate(order)
+            if old in self.overflow
+        }
+
+
+def _unroll(column: array, head: int, size: int, capacity: int) -> array:
+    unrolled = column[head:] + column[:head]
+    del unrolled[size:]
+    unrolled.extend(array(column.typecode, bytes(column.itemsize * (capacity - size))))
+    return unrolled
+
+
+class ColumnarStore:
+    """
+    Compact, column-oriented ring buffer of calculations.
+
+    Drop-in replacement for the ``deque`` that backs ``History``: operation
+    names are stored as small integer codes, operands and results as packed
+    int64 coefficient / int32 exponent pairs, and timestamps as int64
+    microseconds since the epoch. That is under 50 bytes per entry instead of
+    several hundred for a ``Calculation`` with its Decimals and datetime.
+    ``Calculation`` objects are only built when entries are read, and
+    ``iter_rows`` serializes straight from the columns.
+
+    Like ``deque(maxlen=...)``, appending to a full store evicts from the
+    opposite end.
+    """
+
+    def __init__(self, iterable: Iterable[Calculation] = (), maxlen: Optional[int] = None) -> None:
+        self.maxlen = maxlen
+        self._reset()
+        self.extend(iterable)
+
+    def _reset(self) -> None:
+        capacity = min(_INITIAL_CAPACITY, self.maxlen) if self.maxlen else _INITIAL_CAPACITY
+        self._capacity = capacity
+        self._head = 0
+        self._size = 0
+        self._operation_names: List[str] = []
+        self._operation_codes: Dict[str, int] = {}
+        self._operations = array("H", bytes(2 * capacity))
+        self._operand1 = _DecimalColumn(capacity)
+        self._operand2 = _DecimalColumn(capacity)
+        self._results = _DecimalColumn(capacity)
+        self._timestamps = array("q", bytes(8 * capacity))
+        self._timestamp_overflow: Dict[int, datetime.datetime] = {}
+
+    # ------------------------------------------------------------------
+    # Slot helpers
+    def _grow(self) -> None:
+        capacity = self._capacity * 2
+        if self.maxlen:
+            capacity = min(capacity, self.maxlen)
+        head, size = self._head, self._size
+        old_capacity = self._capacity
+        order = [(head + i) % old_capacity for i in range(size)]
+        self._operations = _unroll(self._operations, head, size, capacity)
+        for column in (self._operand1, self._operand2, self._results):
+            column.reorder(head, size, capacity)
+        self._timestamps = _unroll(self._timestamps, head, size, capacity)
+        self._timestamp_overflow = {
+            new: self._timestamp_overflow[old]
+            for new, old in enumerate(order)
+            if old in self._timestamp_overflow
+        }
+        self._capacity = capacity
+        self._head = 0
+
+    def _slot(self, index: int) -> int:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("history index out of range")
+        return (self._head + index) % self._capacity
+
+    def _write(self, slot: int, calculation: Calculation) -> None:
+        code = self._operation_codes.get(calculation.operation)
+        if code is None:
+            code = len(self._operation_names)
+            self._operation_names.append(calculation.operation)
+            self._operation_codes[calculation.operation] = code
+        self._operations[slot] = code
+        self._operand1.set(slot, calculation.operand1)
+        self._operand2.set(slot, calculation.operand2)
+        self._results.set(slot, calculation.result)
+        timestamp = calculation.timestamp
+        if timestamp.tzinfo is None:
+            self._timestamps[slot] = (timestamp - _EPOCH) // _MICROSECOND
+        else:
+            self._timestamps[slot] = _OVERFLOW_MICROS
+            self._timestamp_overflow[slot] = timestamp
+
+    def _timestamp(self, slot: int) -> datetime.datetime:
+        micros = self._timestamps[slot]
+        if micros == _OVERFLOW_MICROS:
+            return self._timestamp_overflow[slot]
+        return _EPOCH + micros * _MICROSECOND
+
+    def _read(self, slot: int) -> Calculation:
+        return Calculation.from_result(
+            self._operation_names[self._operations[slot]],
+            self._operand1.get(slot),
+            self._operand2.get(slot),
+            self._results.get(slot),
+            self._timestamp(slot),
+        )
+
+    # ------------------------------------------------------------------
+    # deque interface used by History
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> Calculation:
+        return self._read(self._slot(index))
+
+    def __iter__(self) -> Iterator[Calculation]:
+        for index in range(self._size):
+            yield self._read((self._head + index) % self._capacity)
+
+    def __reversed__(self) -> Iterator[Calculation]:
+        for index in range(self._size - 1, -1, -1):
+            yield self._read((self._head + index) % self._capacity)
+
+    def append(self, calculation: Calculation) -> None:
+        if self.maxlen is not None and self._size == self.maxlen:
+            if self.maxlen == 0:
+                return
+            # Overwrite the oldest entry
+            self._write(self._head, calculation)
+            self._head = (self._head + 1) % self._capacity
+            return
+        if self._size == self._capacity:
+            self._grow()
+        self._write((self._head + self._size) % self._capacity, calculation)
+        self._size += 1
+
+    def appendleft(self, calculation: Calculation) -> None:
+        if self.maxlen is not None and self._size == self.maxlen:
+            if self.maxlen == 0:
+                return
+            # Make room by dropping the newest entry
+            self._size -= 1
+        if self._size == self._capacity:
+            self._grow()
+        self._head = (self._head - 1) % self._capacity
+        self._write(self._head, calculation)
+        self._size += 1
+
+    def pop(self) -> Calculation:
+        if not self._size:
+            raise IndexError("pop from an empty history")
+        calculation = self[-1]
+        self._size -= 1
+        return calculation
+
+    def popleft(self) -> Calculation:
+        if not self._size:
+            raise IndexError("pop from an empty history")
+        calculation = self._read(self._head)
+        self._head = (self._head + 1) % self._capacity
+        self._size -= 1
+        return calculation
+
+    def extend(self, calculations: Iterable[Calculation]) -> None:
+        for calculation in calculations:
+            self.append(calculation)
+
+    def extendleft(self, calculations: Iterable[Calculation]) -> None:
+        for calculation in calculations:
+            self.appendleft(calculation)
+
+    def clear(self) -> None:
+        self._reset()
+
+    # ------------------------------------------------------------------
+    # Serialization
+    def iter_rows(self) -> Iterator[Tuple[str, str, str, str, str]]:
+        """Yield entries as CSV string tuples without building Calculations."""
+        names = self._operation_names
+        for index in range(self._size):
+            slot = (self._head + index) % self._capacity
+            yield (
+                names[self._operations[slot]],
+                str(self._operand1.get(slot)),
+                str(self._operand2.get(slot)),
+                str(self._results.get(slot)),
+                self._timestamp(slot).isoformat(),
+            )
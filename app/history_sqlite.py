@@ -0,0 +1,284 @@
+########################
+# SQLite History Store #
+########################
+
+"""
+Append-only calculation log in a local SQLite database.
+
+The database complements the in-memory ``History``: every recorded
+calculation is inserted once (undo and clear do not remove rows), and
+``query`` filters by operation, time range and result range with indexed
+lookups, streaming matching rows instead of loading the whole log.
+
+Operands and results are stored as their exact decimal text. Two extra
+columns back the range indexes: ``result_value`` holds the result as a
+REAL and ``timestamp_us`` the timestamp as microseconds since the epoch
+(UTC for timezone-aware timestamps). Because float conversion is
+monotonic, the REAL index never excludes a matching row, and candidates
+are re-checked against the exact Decimal bounds.
+"""
+
+from __future__ import annotations
+
+import csv
+import datetime
+from decimal import Decimal
+from pathlib import Path
+import sqlite3
+import threading
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from app.calculation import Calculation
+from app.calculator_config import config
+from app.exceptions import DataError
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS calculations (
+    id INTEGER PRIMARY KEY,
+    operation TEXT NOT NULL,
+    operand1 TEXT NOT NULL,
+    operand2 TEXT NOT NULL,
+    result TEXT NOT NULL,
+    result_value REAL,
+    timestamp TEXT NOT NULL,
+    timestamp_us INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_calculations_operation
+    ON calculations (operation, timestamp_us);
+CREATE INDEX IF NOT EXISTS idx_calculations_timestamp
+    ON calculations (timestamp_us);
+CREATE INDEX IF NOT EXISTS idx_calculations_result
+    ON calculations (result_value);
+"""
+
+_INSERT = (
+    "INSERT INTO calculations "
+    "(operation, operand1, operand2, result, result_value, timestamp, timestamp_us) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+Row = Tuple[str, str, str, str, str]
+
+
+def _epoch_micros(timestamp: datetime.datetime) -> int:
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return (timestamp - _EPOCH) // _MICROSECOND
+
+
+def _result_value(result: str) -> Optional[float]:
+    value = float(result)
+    # NaN would break the ordering the index relies on
+    return None if value != value else value
+
+
+def _record(row: Row) -> tuple:
+    operation, operand1, operand2, result, timestamp = row
+    return (
+        operation,
+        operand1,
+        operand2,
+        result,
+        _result_value(result),
+        timestamp,
+        _epoch_micros(datetime.datetime.fromisoformat(timestamp)),
+    )
+
+
+class SQLiteHistoryStore:
+    """
+    Calculation log stored in a SQLite database in WAL mode.
+
+    Writes go through one connection guarded by a lock, so the store can be
+    fed from the asynchronous observer thread. Each ``query`` opens its own
+    read connection; with WAL, readers do not block the writer.
+    """
+
+    def __init__(self, db_file: Path | str | None = None) -> None:
+        self.db_file = Path(db_file or config.history_db)
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.db_file.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                connection = sqlite3.connect(self.db_file, check_same_thread=False)
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("PRAGMA synchronous=NORMAL")
+                connection.executescript(_SCHEMA)
+            except sqlite3.Error as exc:
+                raise DataError(f"Failed to open history database {self.db_file}: {exc}") from exc
+            self._connection = connection
+        return self._connection
+
+    def add_rows(self, rows: Iterable[Row]) -> int:
+        """Insert ``(operation, operand1, operand2, result, timestamp)`` rows in one transaction."""
+        try:
+            records = [_record(row) for row in rows]
+        except ValueError as exc:
+            raise DataError(f"Malformed history row: {exc}") from exc
+        if not records:
+            return 0
+        with self._lock:
+            connection = self._connect()
+            try:
+                with connection:
+                    connection.executemany(_INSERT, records)
+            except sqlite3.Error as exc:
+                raise DataError(f"Failed to write history database: {exc}") from exc
+        return len(records)
+
+    def add_calculations(self, calculations: Iterable[Calculation]) -> int:
+        """Insert calculations in one transaction."""
+        return self.add_rows(
+            (
+                calc.operation,
+                str(calc.operand1),
+                str(calc.operand2),
+                str(calc.result),
+                calc.timestamp.isoformat(),
+            )
+            for calc in calculations
+        )
+
+    def query(
+        self,
+        operation: str | None = None,
+        start: datetime.datetime | None = None,
+        end: datetime.datetime | None = None,
+        min_result: Decimal | None = None,
+        max_result: Decimal | None = None,
+        limit: int | None = None,
+    ) -> Iterator[Calculation]:
+        """
+        Yield logged calculations matching every given filter, oldest first.
+
+        Args:
+            operation: Operation class name, e.g. ``"Addition"``.
+            start: Earliest timestamp, inclusive.
+            end: Latest timestamp, inclusive.
+            min_result: Smallest result, inclusive.
+            max_result: Largest result, inclusive.
+            limit: Maximum number of calculations to yield.
+
+        Raises:
+            DataError: If the database cannot be read.
+        """
+        clauses: List[str] = []
+        params: list = []
+        if operation is not None:
+            clauses.append("operation = ?")
+            params.append(operation)
+        if start is not None:
+            clauses.append("timestamp_us >= ?")
+            params.append(_epoch_micros(start))
+        if end is not None:
+            clauses.append("timestamp_us <= ?")
+            params.append(_epoch_micros(end))
+        if min_result is not None:
+            clauses.append("result_value >= ?")
+            params.append(float(min_result))
+        if max_result is not None:
+            clauses.append("result_value <= ?")
+            params.append(float(max_result))
+        sql = "SELECT operation, operand1, operand2, result, timestamp FROM calculations"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY timestamp_us, id"
+
+        if not self.db_file.exists() or (limit is not None and limit <= 0):
+            return
+        remaining = limit
+        try:
+            connection = sqlite3.connect(self.db_file)
+        except sqlite3.Error as exc:
+            raise DataError(f"Failed to open history database {self.db_file}: {exc}") from exc
+        try:
+            for operation_name, operand1, operand2, result, timestamp in connection.execute(sql, params):
+                value = Decimal(result)
+                # The REAL index is approximate; apply the exact bounds here
+                if min_result is not None and value < min_result:
+                    continue
+                if max_result is not None and value > max_result:
+                    continue
+                yield Calculation.from_result(
+                    operation_name,
+                    Decimal(operand1),
+                    Decimal(operand2),
+                    value,
+                    datetime.datetime.fromisoformat(timestamp),
+                )
+                if remaining is not None:
+                    remaining -= 1
+                    if remaining <= 0:
+                        break
+        except sqlite3.Error as exc:
+            raise DataError(f"Failed to query history database: {exc}") from exc
+        finally:
+            connection.close()
+
+    def count(self) -> int:
+        """Return the number of logged calculations."""
+        with self._lock:
+            try:
+                return self._connect().execute("SELECT COUNT(*) FROM calculations").fetchone()[0]
+            except sqlite3.Error as exc:
+                raise DataError(f"Failed to read history database: {exc}") from exc
+
+    def import_csv(self, csv_path: Path | str, chunk_size: int = 10_000) -> int:
+        """Append the rows of a history CSV file, committing every ``chunk_size`` rows."""
+        from app.history import CSV_COLUMNS
+
+        total = 0
+        try:
+            with open(csv_path, newline="", encoding=config.default_encoding) as fh:
+                reader = csv.reader(fh)
+                header = next(reader, None) or CSV_COLUMNS
+                try:
+                    indexes = [header.index(column) for column in CSV_COLUMNS]
+                except ValueError as exc:
+                    raise DataError(f"Missing history column: {exc}") from exc
+                chunk = []
+                for row in reader:
+                    chunk.append(tuple(row[i] for i in indexes))
+                    if len(chunk) >= chunk_size:
+                        total += self.add_rows(chunk)
+                        chunk = []
+                total += self.add_rows(chunk)
+        except FileNotFoundError as exc:
+            raise DataError(f"File not found: {csv_path}") from exc
+        except IndexError as exc:
+            raise DataError("Malformed history row") from exc
+        return total
+
+    def export_csv(self, csv_path: Path | str, **filters) -> int:
+        """Write the calculations matching ``filters`` (see ``query``) to a history CSV file."""
+        from app.history import CSV_COLUMNS
+
+        csv_path = Path(csv_path)
+        csv_path.parent.mkdir(parents=True, exist_ok=True)
+        count = 0
+        with open(csv_path, "w", newline="", encoding=config.default_encoding) as fh:
+            writer = csv.writer(fh)
+            writer.writerow(CSV_COLUMNS)
+            for calc in self.query(**filters):
+                writer.writerow([
+                    calc.operation,
+                    str(calc.operand1),
+                    str(calc.operand2),
+                    str(calc.result),
+                    calc.timestamp.isoformat(),
+                ])
+                count += 1
+        return count
+
+    def close(self) -> None:
+        """Close the write connection."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
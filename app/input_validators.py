@@ -2,44 +2,133 @@
 # Input Validation     #
 ########################
 
+from __future__ import annotations
+
 from dataclasses import dataclass
 from decimal import Decimal, InvalidOperation
-from typing import Any
+from typing import Any, Iterable, List, Optional, Tuple
+from app.cache import LRUCache
 from app.exceptions import ValidationError
 from app.calculator_config import config
 
+# (max_input_value, the same bound as a Decimal), refreshed when the limit changes
+_bound: Tuple[Optional[int], Decimal] = (None, Decimal(0))
+# Shared parse cache for string inputs, sized by config.parse_cache_size
+_parse_cache: Optional[LRUCache] = None
+
+
+def _max_input_bound() -> Decimal:
+    """Return ``config.max_input_value`` as a Decimal, converting it once per value."""
+    global _bound
+    limit = config.max_input_value
+    if _bound[0] != limit:
+        _bound = (limit, Decimal(limit))
+    return _bound[1]
+
+
+def _get_parse_cache() -> Optional[LRUCache]:
+    """Return the string parse cache, or None when it is disabled (size 0)."""
+    global _parse_cache
+    size = config.parse_cache_size
+    if size <= 0:
+        return None
+    if _parse_cache is None or _parse_cache.maxsize != size:
+        _parse_cache = LRUCache(size)
+    return _parse_cache
+
+
+def _parse_string(value: str) -> Decimal:
+    # Decimal() ignores surrounding whitespace itself, so only an input that
+    # fails to parse needs the (rarer) empty check
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        if not value.strip():
+            raise ValidationError("Input cannot be empty") from None
+        raise
+
+
 @dataclass
 class InputValidator:
     """Validates and sanitizes calculator inputs."""
-    
+
     @staticmethod
     def validate_number(value: Any) -> Decimal:
         """
         Validate and convert input to Decimal.
-        
+
+        ``Decimal`` and ``int`` inputs are converted without a round trip
+        through ``str``. Floats are converted from their shortest repr, so
+        ``0.1`` becomes ``Decimal("0.1")`` rather than its binary expansion.
+        Strings are stripped and parsed, through the parse cache when
+        ``config.parse_cache_size`` is positive.
+
         Args:
             value: Input value to validate
-            config: Calculator configuration
-            
+
         Returns:
             Decimal: Validated and converted number
-            
+
         Raises:
             ValidationError: If input is invalid
         """
         try:
-            if value is None or (isinstance(value, str) and not value.strip()):
+            kind = type(value)
+            if kind is Decimal:
+                number = value
+            elif kind is int:
+                number = Decimal(value)
+            elif kind is float:
+                number = Decimal(repr(value))
+            elif kind is str:
+                cache = _get_parse_cache() if config.parse_cache_size else None
+                if cache is None:
+                    number = _parse_string(value)
+                else:
+                    number = cache.get(value)
+                    if number is None:
+                        number = _parse_string(value)
+                        cache.put(value, number)
+            elif value is None:
                 raise ValidationError("Input cannot be empty")
-            if isinstance(value, str):
-                value = value.strip()
-            number = Decimal(str(value))
+            elif isinstance(value, str):
+                number = _parse_string(value)
+            else:
+                number = Decimal(str(value))
 
             # Enforce maximum input value if configured
-            if abs(number) > config.max_input_value:
+            if abs(number) > _max_input_bound():
                 raise ValidationError(
                     f"Input {value} exceeds maximum allowed value {config.max_input_value}"
                 )
-            
+
             return number
-        except InvalidOperation as e:
+        except (InvalidOperation, ValueError) as e:
             raise ValidationError(f"Invalid number format: {value}") from e
+
+    @staticmethod
+    def validate_numbers(
+        values: Iterable[Any],
+    ) -> Tuple[List[Optional[Decimal]], List[Optional[ValidationError]]]:
+        """
+        Validate many inputs without raising.
+
+        Args:
+            values: Inputs to validate.
+
+        Returns:
+            Tuple[List, List]: Positionally aligned lists of validated numbers
+            and errors; each item has either a number (and a None error) or a
+            None number and the ValidationError it raised.
+        """
+        numbers: List[Optional[Decimal]] = []
+        errors: List[Optional[ValidationError]] = []
+        validate = InputValidator.validate_number
+        for value in values:
+            try:
+                numbers.append(validate(value))
+                errors.append(None)
+            except ValidationError as e:
+                numbers.append(None)
+                errors.append(e)
+        return numbers, errors
@@ -8,6 +8,17 @@ from pathlib import Path
 from app.calculator_config import config
 
 
+class _LazyFileHandler(logging.FileHandler):
+    """File handler that creates its directory and file on the first record."""
+
+    def __init__(self, filename: Path, encoding: str) -> None:
+        super().__init__(filename, encoding=encoding, delay=True)
+
+    def _open(self):  # pragma: no cover - file I/O setup
+        Path(self.baseFilename).parent.mkdir(parents=True, exist_ok=True)
+        return super()._open()
+
+
 class Logger:
     """Singleton-style logger configuration."""
 
@@ -28,10 +39,8 @@ class Logger:
         # Avoid duplicated handlers when running tests multiple times
         logger.handlers.clear()
 
-        log_file: Path = config.log_file
-        log_file.parent.mkdir(parents=True, exist_ok=True)
-
-        file_handler = logging.FileHandler(log_file, encoding=config.default_encoding)
+        # The log file is only opened when the first record is emitted
+        file_handler = _LazyFileHandler(config.log_file, encoding=config.default_encoding)
         formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
         file_handler.setFormatter(formatter)
         file_handler.setLevel(logging.DEBUG)
@@ -0,0 +1,218 @@
+########################
+# Metrics              #
+########################
+
+"""
+Process-wide metrics for long-running sessions.
+
+``registry`` collects counters, gauges and histograms that the calculator,
+history and observers update as they work. ``MetricsObserver`` (see
+app.observers) periodically writes it to ``config.metrics_file`` in the
+Prometheus text exposition format, for the node exporter's textfile
+collector, and next to it as JSON.
+
+Updates are plain dictionary operations without a lock, so they cost about
+as much as a dict lookup on the calculation path. As with ``LRUCache``
+statistics, increments racing between threads may occasionally be lost;
+creating a new series and exporting take a lock.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from app.exceptions import ValidationError
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# Upper bounds (seconds) of the duration histogram buckets
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 60.0)
+
+# name: (type, help)
+METRICS: Dict[str, Tuple[str, str]] = {
+    "calculator_calculations_total": ("counter", "Calculations recorded, by operation."),
+    "calculator_errors_total": ("counter", "Failed calculations, by kind (validation/operation) and exception type."),
+    "calculator_history_size": ("gauge", "Calculations currently held in the history."),
+    "calculator_undo_total": ("counter", "Undo steps."),
+    "calculator_redo_total": ("counter", "Redo steps."),
+    "calculator_history_clears_total": ("counter", "Times the history was cleared."),
+    "calculator_autosave_bytes_written_total": ("counter", "Bytes written to the auto-save file."),
+    "calculator_history_save_seconds": ("histogram", "Time to save the history to a file, by format."),
+    "calculator_history_load_seconds": ("histogram", "Time to load the history from a file, by format."),
+}
+
+
+class _Histogram:
+    __slots__ = ("buckets", "count", "sum")
+
+    def __init__(self) -> None:
+        self.buckets = [0] * len(DURATION_BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        for index, bound in enumerate(DURATION_BUCKETS):
+            if value <= bound:
+                self.buckets[index] += 1
+                break
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[int]:
+        total = 0
+        counts = []
+        for bucket in self.buckets:
+            total += bucket
+            counts.append(total)
+        return counts
+
+
+def _labels(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels, extra: Labels = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    escaped = (
+        f'{key}="' + value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') + '"'
+        for key, value in pairs
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, float) and not value.is_integer():
+        return repr(value)
+    return str(int(value))
+
+
+class MetricsRegistry:
+    """Counters, gauges and histograms keyed by metric name and labels."""
+
+    def __init__(self) -> None:
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._gauges: Dict[Tuple[str, Labels], float] = {}
+        self._histograms: Dict[Tuple[str, Labels], _Histogram] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, amount: float = 1, **labels: object) -> None:
+        """Add ``amount`` to a counter."""
+        key = (name, _labels(labels)) if labels else (name, ())
+        counters = self._counters
+        counters[key] = counters.get(key, 0) + amount
+
+    def set(self, name: str, value: float, **labels: object) -> None:
+        """Set a gauge."""
+        self._gauges[(name, _labels(labels)) if labels else (name, ())] = value
+
+    def observe(self, name: str, value: float, **labels: object) -> None:
+        """Record one value (in seconds) in a histogram."""
+        key = (name, _labels(labels)) if labels else (name, ())
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, _Histogram())
+        histogram.observe(value)
+
+    def record_error(self, exc: BaseException) -> None:
+        """Count a failed calculation by kind and exception type."""
+        kind = "validation" if isinstance(exc, ValidationError) else "operation"
+        self.inc("calculator_errors_total", kind=kind, type=type(exc).__name__)
+
+    def value(self, name: str, **labels: object) -> float:
+        """Return a counter or gauge value (0 if never set)."""
+        key = (name, _labels(labels))
+        return self._counters.get(key, self._gauges.get(key, 0))
+
+    def reset(self) -> None:
+        """Drop every series."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    # ------------------------------------------------------------------
+    # Export
+    def _series(self) -> Dict[str, list]:
+        """Group a consistent copy of every series by metric name."""
+        with self._lock:
+            items = (
+                [(key, "value", value) for key, value in list(self._counters.items())]
+                + [(key, "value", value) for key, value in list(self._gauges.items())]
+                + [
+                    (key, "histogram", (h.cumulative(), h.count, h.sum))
+                    for key, h in list(self._histograms.items())
+                ]
+            )
+        grouped: Dict[str, list] = {}
+        for (name, labels), kind, value in sorted(items, key=lambda item: item[0]):
+            grouped.setdefault(name, []).append((labels, kind, value))
+        return grouped
+
+    def render_prometheus(self) -> str:
+        """Return every series in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for name, series in self._series().items():
+            kind, help_text = METRICS.get(name, ("untyped", ""))
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, series_kind, value in series:
+                if series_kind == "value":
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+                    continue
+                cumulative, count, total = value
+                for bound, bucket in zip(DURATION_BUCKETS, cumulative):
+                    lines.append(
+                        f"{name}_bucket{_format_labels(labels, (('le', repr(bound)),))} {bucket}"
+                    )
+                lines.append(f"{name}_bucket{_format_labels(labels, (('le', '+Inf'),))} {count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+                lines.append(f"{name}_count{_format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def to_dict(self) -> Dict[str, object]:
+        """Return every series as JSON-serializable data."""
+        metrics: Dict[str, object] = {}
+        for name, series in self._series().items():
+            entries = []
+            for labels, series_kind, value in series:
+                entry: Dict[str, object] = {"labels": dict(labels)}
+                if series_kind == "value":
+                    entry["value"] = value
+                else:
+                    cumulative, count, total = value
+                    entry.update(
+                        buckets=dict(zip((str(b) for b in DURATION_BUCKETS), cumulative)),
+                        count=count,
+                        sum=total,
+                    )
+                entries.append(entry)
+            metrics[name] = {"type": METRICS.get(name, ("untyped", ""))[0], "series": entries}
+        return {"timestamp": time.time(), "metrics": metrics}
+
+    def write_textfile(self, path: str | Path) -> None:
+        """Atomically write the Prometheus text format to ``path``."""
+        _write_atomic(Path(path), self.render_prometheus())
+
+    def write_json(self, path: str | Path) -> None:
+        """Atomically write ``to_dict()`` as JSON to ``path``."""
+        _write_atomic(Path(path), json.dumps(self.to_dict(), indent=2) + "\n")
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    # Scrapers must never see a half-written file
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = path.with_name(path.name + ".tmp")
+    tmp_file.write_text(text, encoding="utf-8")
+    os.replace(tmp_file, path)
+
+
+registry = MetricsRegistry()
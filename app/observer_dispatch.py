@@ -0,0 +1,142 @@
+########################
+# Observer Dispatch    #
+########################
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Sequence
+import threading
+from typing import Callable, Deque, List, Optional
+
+from app.calculation import Calculation
+from app.calculator_config import BACKPRESSURE_POLICIES
+from app.exceptions import ConfigurationError, OperationError
+from app.history import HistoryEvent
+from app.logger import logger
+
+# Queued notification: [history events, history snapshot or None]
+Notification = List
+
+
+class AsyncObserverDispatcher:
+    """
+    Deliver observer notifications from a background worker thread.
+
+    Notifications (the HistoryEvents of one change, plus a snapshot of the
+    history after it when an observer needs one) are placed on a bounded
+    queue and drained by a single worker, so observer I/O happens off the
+    calculation path while preserving event order. When the queue is full,
+    the backpressure policy decides what happens:
+
+    - ``block``: wait until the worker frees a slot.
+    - ``drop``: discard the new notification and count its dropped events,
+      unless it was submitted with ``droppable=False`` (a persistent
+      observer is listening), in which case it is coalesced instead.
+    - ``coalesce``: merge the new events into the newest queued
+      notification, refreshing its snapshot, so nothing is lost but
+      observers see fewer, larger deliveries.
+    """
+
+    def __init__(
+        self,
+        deliver: Callable[[List[HistoryEvent], Optional[List[Calculation]]], None],
+        maxsize: int = 1000,
+        backpressure: str = "block",
+    ) -> None:
+        if backpressure not in BACKPRESSURE_POLICIES:
+            raise ConfigurationError(f"Invalid observer backpressure: {backpressure}")
+        self._deliver = deliver
+        self.maxsize = max(1, maxsize)
+        self.backpressure = backpressure
+        self.dropped = 0
+        self._events: Deque[Notification] = deque()
+        self._in_flight = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._run, name="calculator-observers", daemon=True
+        )
+        self._thread.start()
+
+    def submit(
+        self,
+        events: List[HistoryEvent],
+        history: Sequence[Calculation],
+        needs_history: bool = True,
+        droppable: bool = True,
+    ) -> None:
+        """
+        Queue history events for delivery to the observers.
+
+        Args:
+            events: The events of one history change.
+            history: The history after the change, usually a live view.
+            needs_history: Whether any observer needs the history; when
+                False it is not copied and None is delivered instead.
+            droppable: Whether the ``drop`` policy may discard the events;
+                when False they are coalesced instead.
+
+        Raises:
+            OperationError: If the dispatcher has been closed.
+        """
+        with self._condition:
+            if self._closed:
+                raise OperationError("Observer dispatcher is closed")
+            while len(self._events) >= self.maxsize:
+                if self.backpressure == "drop" and droppable:
+                    self.dropped += len(events)
+                    logger.warning(f"Observer queue full, dropped {len(events)} history events")
+                    return
+                if self.backpressure != "block":
+                    pending = self._events[-1]
+                    pending[0].extend(events)
+                    if needs_history or pending[1] is not None:
+                        pending[1] = list(history)
+                    return
+                self._condition.wait()
+            self._events.append([list(events), list(history) if needs_history else None])
+            self._condition.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._events and not self._closed:
+                    self._condition.wait()
+                if not self._events:
+                    return
+                events, history = self._events.popleft()
+                self._in_flight = True
+                self._condition.notify_all()
+            try:
+                self._deliver(events, history)
+            except Exception as exc:  # pragma: no cover - deliver logs its own errors
+                logger.error(f"Observer dispatch failed: {exc}")
+            finally:
+                with self._condition:
+                    self._in_flight = False
+                    self._condition.notify_all()
+
+    def pending(self) -> int:
+        """Return the number of queued events not yet delivered."""
+        with self._condition:
+            return len(self._events) + (1 if self._in_flight else 0)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Wait until every queued event has been delivered.
+
+        Returns:
+            bool: False if the timeout expired first.
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._events and not self._in_flight, timeout
+            )
+
+    def close(self) -> None:
+        """Deliver the remaining events and stop the worker thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
@@ -1,57 +1,581 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Sequence
+import csv
+import os
 from pathlib import Path
-from typing import List
+import threading
+import time
+from typing import Iterable, List
 from app.logger import logger
 
 from app.calculation import Calculation
-from app.calculator_config import config
+from app.calculator_config import AUTO_SAVE_MODES, config
+from app.exceptions import ConfigurationError
+from app.history import CSV_COLUMNS, HistoryEvent
+from app.metrics import registry as metrics
+
+
+def appended_calculations(events: List[HistoryEvent]) -> List[Calculation]:
+    """Return the calculations added by ``append`` events, in order."""
+    return [
+        calculation
+        for event in events if event.kind == "append"
+        for calculation in event.calculations
+    ]
+
+
+def forward_appends(
+    observer,
+    events: List[HistoryEvent],
+    history: Sequence[Calculation] | None,
+) -> None:
+    """Deliver the appended calculations in ``events`` through ``update``/``update_batch``.
+
+    Used for observers that predate the change-event protocol; they are not
+    told about undo, redo, eviction, clear or load.
+    """
+    calculations = appended_calculations(events)
+    if len(calculations) == 1:
+        observer.update(calculations[0], history)
+    elif calculations and hasattr(observer, "update_batch"):
+        observer.update_batch(calculations, history)
+    else:
+        for calculation in calculations:
+            observer.update(calculation, history)
+
 
 class Observer(ABC):
-    """Interface for observers reacting to new calculations."""
+    """Interface for observers reacting to history changes.
+
+    The calculator delivers every change to ``on_history_events`` as a list
+    of HistoryEvents (see app.history), together with the history as it is
+    after those events: a live read-only ``HistoryView`` when delivered
+    synchronously, a snapshot list when delivered from the async dispatcher,
+    or None when no observer asked for it through ``needs_history``.
+
+    Observers written against the older protocol only implement ``update``;
+    the default ``on_history_events`` forwards appended calculations to it.
+
+    Observers that keep a durable copy of the history set ``persistent``;
+    the async dispatcher never drops their notifications.
+    """
+
+    persistent: bool = False
 
     @abstractmethod
-    def update(self, calculation: Calculation, history: List[Calculation]) -> None:
+    def update(self, calculation: Calculation, history: Sequence[Calculation]) -> None:
         """React to a new calculation event."""
         raise NotImplementedError
 
+    def update_batch(self, calculations: List[Calculation], history: Sequence[Calculation]) -> None:
+        """React to several calculations recorded at once.
+
+        The default implementation forwards each calculation to ``update``;
+        observers with per-event I/O should override it.
+        """
+        for calculation in calculations:
+            self.update(calculation, history)
+
+    def on_history_events(
+        self,
+        events: List[HistoryEvent],
+        history: Sequence[Calculation] | None,
+    ) -> None:
+        """React to changes to the history."""
+        forward_appends(self, events, history)
+
+    def needs_history(self, events: List[HistoryEvent]) -> bool:
+        """Return True if handling ``events`` requires the full history.
+
+        The async dispatcher copies the history only when an observer needs
+        it; observers that work from the events alone should return False.
+        """
+        return True
+
+    def flush(self) -> None:
+        """Push any buffered output to its destination."""
+
+    def close(self) -> None:
+        """Release resources held by the observer."""
+
+
+class HistoryEventObserver(Observer):
+    """Base class for observers implemented on top of ``on_history_events``.
+
+    ``update`` and ``update_batch`` are kept for callers of the older
+    protocol and are translated into ``append`` events.
+    """
+
+    @abstractmethod
+    def on_history_events(
+        self,
+        events: List[HistoryEvent],
+        history: Sequence[Calculation] | None,
+    ) -> None:
+        raise NotImplementedError
+
+    def needs_history(self, events: List[HistoryEvent]) -> bool:
+        return False
+
+    def update(self, calculation: Calculation, history: Sequence[Calculation]) -> None:
+        self.on_history_events([HistoryEvent("append", [calculation])], history)
+
+    def update_batch(self, calculations: List[Calculation], history: Sequence[Calculation]) -> None:
+        if calculations:
+            self.on_history_events([HistoryEvent("append", list(calculations))], history)
 
-class LoggingObserver(Observer):
-    """Logs calculation details to a file."""
 
-    def __init__(self, log_file: Path | str = config.log_file) -> None:
+class LoggingObserver(HistoryEventObserver):
+    """Logs calculation details to a file.
+
+    Only new calculations (``append`` events) are logged; undo, redo and
+    clear leave the log alone.
+
+    The observer keeps one append handle open and buffers lines in memory,
+    writing them out once ``buffer_size`` characters are pending, and on
+    ``flush``/``close``. A daemon timer armed when the buffer stops being
+    empty writes it out ``flush_interval`` seconds later, so an idle session
+    does not hold logged calculations in memory. With
+    ``max_bytes`` set, the file is rotated to ``.1`` ... ``.<backup_count>``
+    before it would grow past that size.
+
+    Each calculation is also echoed to the application logger at DEBUG level
+    unless ``log_to_app_logger`` is False. By default the echo is skipped when
+    the application logger already writes to the same file, which would
+    otherwise record every calculation twice.
+    """
+
+    def __init__(
+        self,
+        log_file: Path | str = config.log_file,
+        buffer_size: int | None = None,
+        flush_interval: float | None = None,
+        max_bytes: int | None = None,
+        backup_count: int | None = None,
+        log_to_app_logger: bool | None = None,
+    ) -> None:
         self.log_file = Path(log_file)
+        self.buffer_size = config.log_buffer_size if buffer_size is None else buffer_size
+        self.flush_interval = config.log_flush_interval if flush_interval is None else flush_interval
+        self.max_bytes = config.log_max_bytes if max_bytes is None else max_bytes
+        self.backup_count = config.log_backup_count if backup_count is None else backup_count
+        if log_to_app_logger is None:
+            log_to_app_logger = not self._shares_app_log_file()
+        self.log_to_app_logger = log_to_app_logger
+        self._handle = None
+        self._file_size = 0
+        self._buffer: List[str] = []
+        self._buffered = 0
+        self._last_flush = time.monotonic()
+        # Guards the buffer and file against the flush timer's thread
+        self._lock = threading.RLock()
+        self._timer: threading.Timer | None = None
+
+    def _shared_handlers(self) -> list:
+        """Return the application logger's handlers that write to our file."""
+        target = os.path.abspath(self.log_file)
+        return [
+            handler for handler in logger.handlers
+            if getattr(handler, "baseFilename", None) == target
+        ]
+
+    def _shares_app_log_file(self) -> bool:
+        """Return True if an application logger handler writes to our file."""
+        return bool(self._shared_handlers())
+
+    @staticmethod
+    def _format(calculation: Calculation) -> str:
+        return ",".join((
+            calculation.timestamp.isoformat(),
+            calculation.operation,
+            str(calculation.operand1),
+            str(calculation.operand2),
+            str(calculation.result),
+        )) + "\n"
+
+    def on_history_events(
+        self,
+        events: List[HistoryEvent],
+        history: Sequence[Calculation] | None,
+    ) -> None:
+        calculations = appended_calculations(events)
+        if not calculations:
+            return
+        message = "".join(self._format(calc) for calc in calculations)
+        self._write(message)
+        if not self.log_to_app_logger:
+            return
+        if len(calculations) == 1:
+            logger.debug(f"Logged calculation to {self.log_file}: {message.strip()}")
+        else:
+            logger.debug(f"Logged {len(calculations)} calculations to {self.log_file}")
+
+    def _write(self, text: str) -> None:
+        with self._lock:
+            self._buffer.append(text)
+            self._buffered += len(text)
+            remaining = self.flush_interval - (time.monotonic() - self._last_flush)
+            if self._buffered >= self.buffer_size or remaining <= 0:
+                self.flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(remaining, self._flush_on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _flush_on_timer(self) -> None:
+        with self._lock:
+            self._timer = None
+            self.flush()
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _open(self) -> None:
         self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = open(self.log_file, "a", encoding=config.default_encoding)
+        self._file_size = self._handle.tell()
 
-    def update(self, calculation: Calculation, history: List[Calculation]) -> None:
-        message = (
-            f"{calculation.timestamp.isoformat()},"
-            f"{calculation.operation},"
-            f"{calculation.operand1},"
-            f"{calculation.operand2},"
-            f"{calculation.result}\n"
-        )
-        with open(self.log_file, "a", encoding=config.default_encoding) as fh:
-            fh.write(message)
-        logger.debug(f"Logged calculation to {self.log_file}: {message.strip()}")
+    def _rotate(self) -> None:
+        """Shift ``log`` -> ``log.1`` -> ``log.2`` ..., dropping the oldest backup.
 
+        Application logger handlers writing to the same file are closed
+        while it is renamed, so they reopen the new file on their next
+        record instead of writing on into the backup.
+        """
+        self._handle.close()
+        self._handle = None
+        handlers = self._shared_handlers()
+        for handler in handlers:
+            handler.acquire()
+        try:
+            for handler in handlers:
+                if handler.stream is not None:
+                    handler.stream.close()
+                    handler.stream = None
+            if self.backup_count > 0:
+                for index in range(self.backup_count - 1, 0, -1):
+                    source = self.log_file.with_name(f"{self.log_file.name}.{index}")
+                    if source.exists():
+                        os.replace(source, self.log_file.with_name(f"{self.log_file.name}.{index + 1}"))
+                os.replace(self.log_file, self.log_file.with_name(f"{self.log_file.name}.1"))
+            else:
+                self.log_file.unlink()
+        finally:
+            for handler in handlers:
+                handler.release()
+        self._open()
+
+    def flush(self) -> None:
+        """Write buffered lines to the log file."""
+        with self._lock:
+            self._last_flush = time.monotonic()
+            self._cancel_timer()
+            if not self._buffer:
+                return
+            chunk = "".join(self._buffer)
+            self._buffer.clear()
+            self._buffered = 0
+            if self._handle is None:
+                self._open()
+            elif self.max_bytes:
+                # The application logger may append to the same file
+                self._file_size = os.fstat(self._handle.fileno()).st_size
+            if self.max_bytes and self._file_size and self._file_size + len(chunk) > self.max_bytes:
+                self._rotate()
+            self._handle.write(chunk)
+            self._handle.flush()
+            self._file_size += len(chunk)
+
+    def close(self) -> None:
+        """Flush buffered lines and close the log file."""
+        with self._lock:
+            self.flush()
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+
+class AutoSaveObserver(HistoryEventObserver):
+    """Saves calculation history to a CSV file.
 
-class AutoSaveObserver(Observer):
-    """Saves calculation history to a CSV file using pandas."""
+    In ``rewrite`` mode the whole history is written with pandas after every
+    change. In ``append`` mode the file is kept in step with the history from
+    the change events alone: new rows are appended with the stdlib ``csv``
+    module and fsynced every ``fsync_interval`` rows, undo rewrites the file
+    from its own live rows, and clear and load rewrite it outright. Rows
+    evicted from the history stay in the file until they make up more than
+    half of it, when it is compacted. The first change after creation
+    rewrites the file from the history, replacing whatever it held before.
+    """
 
-    def __init__(self, csv_file: Path | str = config.history_dir / "history.csv") -> None:
+    persistent = True
+
+    def __init__(
+        self,
+        csv_file: Path | str = config.history_dir / "history.csv",
+        mode: str | None = None,
+        fsync_interval: int | None = None,
+    ) -> None:
         self.csv_file = Path(csv_file)
-        self.csv_file.parent.mkdir(parents=True, exist_ok=True)
+        self.mode = mode or config.auto_save_mode
+        if self.mode not in AUTO_SAVE_MODES:
+            raise ConfigurationError(f"Invalid auto-save mode: {self.mode}")
+        self.fsync_interval = (
+            config.auto_save_fsync_interval if fsync_interval is None else fsync_interval
+        )
+        self._handle = None
+        self._writer = None
+        self._position = 0
+        # Rows in the file, and how many of them (at the end) mirror the
+        # history; None until the file has been written from the history
+        self._rows_in_file = 0
+        self._live: int | None = None
+        self._unsynced = 0
+
+    def needs_history(self, events: List[HistoryEvent]) -> bool:
+        return self.mode == "rewrite" or self._live is None
+
+    def on_history_events(
+        self,
+        events: List[HistoryEvent],
+        history: Sequence[Calculation] | None,
+    ) -> None:
+        if not events:
+            return
+        if self.mode == "rewrite":
+            self._save(history)
+            return
+        if self._live is None:
+            if history is not None:
+                # The history already reflects these events
+                self.compact(history)
+                return
+            self.compact([])
+        for event in events:
+            if event.kind in ("append", "redo"):
+                self._append(event.calculations)
+            elif event.kind == "evict":
+                self._live = max(0, self._live - len(event.calculations))
+            elif event.kind == "undo":
+                self._undo(event)
+            elif event.kind == "clear":
+                self.compact([])
+            elif event.kind == "load":
+                self.compact(event.calculations)
+        if self._rows_in_file > 2 * max(self._live, 1):
+            self._write_rows(self._read_live_rows())
 
-    def update(self, calculation: Calculation, history: List[Calculation]) -> None:
+    def _save(self, history: Sequence[Calculation]) -> None:
         try:
             import pandas as pd
         except Exception as exc:  # pragma: no cover - dependency issues
             logger.error(f"Pandas not available: {exc}")
             return
         data = [calc.to_dict() for calc in history]
-        df = pd.DataFrame(data)
+        # Explicit columns keep the header when the history is empty
+        df = pd.DataFrame(data, columns=CSV_COLUMNS)
+        self.csv_file.parent.mkdir(parents=True, exist_ok=True)
         df.to_csv(self.csv_file, index=False, encoding=config.default_encoding)
+        if self.csv_file.exists():
+            metrics.inc("calculator_autosave_bytes_written_total", self.csv_file.stat().st_size)
         logger.debug(f"Auto-saved history to {self.csv_file}")
 
+    # ------------------------------------------------------------------
+    # Append mode
+    @staticmethod
+    def _row(calculation: Calculation) -> list:
+        return [
+            calculation.operation,
+            str(calculation.operand1),
+            str(calculation.operand2),
+            str(calculation.result),
+            calculation.timestamp.isoformat(),
+        ]
+
+    def _append(self, calculations: Sequence[Calculation]) -> None:
+        if self._writer is None:
+            self._open()
+        self._writer.writerows(self._row(calc) for calc in calculations)
+        self._handle.flush()
+        position = self._handle.tell()
+        metrics.inc("calculator_autosave_bytes_written_total", position - self._position)
+        self._position = position
+        self._rows_in_file += len(calculations)
+        self._live += len(calculations)
+        self._unsynced += len(calculations)
+        if self._unsynced >= self.fsync_interval:
+            self._sync()
+        logger.debug(f"Appended {len(calculations)} rows to {self.csv_file}")
+
+    def _undo(self, event: HistoryEvent) -> None:
+        rows = self._read_live_rows()
+        if event.calculations:
+            del rows[-len(event.calculations):]
+        self._write_rows([self._row(calc) for calc in event.restored] + rows)
+
+    def _read_live_rows(self) -> List[list]:
+        """Read the rows at the end of the file that mirror the history."""
+        self.close()
+        if not self._live:
+            return []
+        with open(self.csv_file, newline="", encoding=config.default_encoding) as fh:
+            return list(deque(csv.reader(fh), maxlen=self._live))
+
+    def _open(self) -> None:
+        self._handle = open(
+            self.csv_file, "a", newline="", encoding=config.default_encoding
+        )
+        self._writer = csv.writer(self._handle)
+        self._position = self._handle.tell()
+
+    def _sync(self) -> None:
+        if self._handle is not None:
+            self._handle.flush()
+            os.fsync(self._handle.fileno())
+        self._unsynced = 0
+
+    def compact(self, history: Iterable[Calculation]) -> None:
+        """Rewrite the CSV file so it holds exactly ``history``."""
+        self._write_rows([self._row(calc) for calc in history])
+
+    def _write_rows(self, rows: List[list]) -> None:
+        self.close()
+        self.csv_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.csv_file.with_name(self.csv_file.name + ".tmp")
+        with open(tmp_file, "w", newline="", encoding=config.default_encoding) as fh:
+            writer = csv.writer(fh)
+            writer.writerow(CSV_COLUMNS)
+            writer.writerows(rows)
+            fh.flush()
+            os.fsync(fh.fileno())
+            metrics.inc("calculator_autosave_bytes_written_total", fh.tell())
+        os.replace(tmp_file, self.csv_file)
+        self._rows_in_file = self._live = len(rows)
+        logger.debug(f"Compacted auto-save file {self.csv_file}")
+
+    def flush(self) -> None:
+        """Force appended rows to disk."""
+        self._sync()
+
+    def close(self) -> None:
+        """Flush and close the append handle, if open."""
+        if self._handle is not None:
+            self._sync()
+            self._handle.close()
+        self._handle = None
+        self._writer = None
+
+
+class SQLiteHistoryObserver(HistoryEventObserver):
+    """Logs calculations to a SQLite database (see app.history_sqlite).
+
+    Rows are buffered and inserted in one transaction once ``batch_size``
+    calculations are pending, and on ``flush``/``close``. The database is an
+    append-only log of new calculations (``append`` events): undo, redo and
+    clear do not change it.
+    """
+
+    persistent = True
+
+    def __init__(
+        self,
+        db_file: Path | str | None = None,
+        batch_size: int | None = None,
+    ) -> None:
+        from app.history_sqlite import SQLiteHistoryStore
+
+        self.store = SQLiteHistoryStore(db_file or config.history_db)
+        self.batch_size = config.history_db_batch_size if batch_size is None else batch_size
+        self._pending: List[Calculation] = []
+
+    def on_history_events(
+        self,
+        events: List[HistoryEvent],
+        history: Sequence[Calculation] | None,
+    ) -> None:
+        self._pending.extend(appended_calculations(events))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Insert pending calculations in one transaction."""
+        if self._pending:
+            pending, self._pending = self._pending, []
+            self.store.add_calculations(pending)
+            logger.debug(f"Logged {len(pending)} calculations to {self.store.db_file}")
+
+    def close(self) -> None:
+        """Insert pending calculations and close the database."""
+        self.flush()
+        self.store.close()
+
+
+class MetricsObserver(HistoryEventObserver):
+    """Feeds history changes into app.metrics and exports the registry.
+
+    Counts calculations per operation, undo, redo and clear steps, and
+    tracks the history size from the change events. The registry is
+    rewritten to ``metrics_file`` (Prometheus text format) and to the same
+    path with a ``.json`` suffix once ``interval`` seconds have passed since
+    the last export (checked when a change arrives), and on
+    ``flush``/``close``.
+    """
+
+    def __init__(
+        self,
+        metrics_file: Path | str | None = None,
+        interval: float | None = None,
+        history_size: int = 0,
+    ) -> None:
+        self.metrics_file = Path(metrics_file or config.metrics_file)
+        self.json_file = self.metrics_file.with_suffix(".json")
+        self.interval = config.metrics_interval if interval is None else interval
+        self._size = history_size
+        self._last_export = time.monotonic()
+        metrics.set("calculator_history_size", history_size)
+
+    def on_history_events(
+        self,
+        events: List[HistoryEvent],
+        history: Sequence[Calculation] | None,
+    ) -> None:
+        for event in events:
+            kind = event.kind
+            if kind == "append":
+                counts: dict = {}
+                for calculation in event.calculations:
+                    counts[calculation.operation] = counts.get(calculation.operation, 0) + 1
+                for operation, count in counts.items():
+                    metrics.inc("calculator_calculations_total", count, operation=operation)
+                self._size += len(event.calculations)
+            elif kind == "redo":
+                metrics.inc("calculator_redo_total")
+                self._size += len(event.calculations)
+            elif kind == "evict":
+                self._size -= len(event.calculations)
+            elif kind == "undo":
+                metrics.inc("calculator_undo_total")
+                self._size += len(event.restored) - len(event.calculations)
+            elif kind == "clear":
+                metrics.inc("calculator_history_clears_total")
+                self._size = 0
+            elif kind == "load":
+                self._size = len(event.calculations)
+        metrics.set("calculator_history_size", self._size)
+        if time.monotonic() - self._last_export >= self.interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the metrics files."""
+        self._last_export = time.monotonic()
+        metrics.write_textfile(self.metrics_file)
+        metrics.write_json(self.json_file)
+
+    def close(self) -> None:
+        """Write the final metrics files."""
+        self.flush()
@@ -2,10 +2,105 @@
 # Operation Classes    #
 ########################
 
+from __future__ import annotations
+
 from abc import ABC, abstractmethod
-from decimal import Decimal
-from typing import Dict
-from app.exceptions import ValidationError
+from decimal import Decimal, getcontext, localcontext
+import math
+from typing import Any, Dict, Tuple
+from app.cache import CacheStats, LRUCache
+from app.calculator_config import config
+from app.exceptions import OperationError, ValidationError
+
+
+def _require_numpy():
+    """
+    Import NumPy on demand for the vectorized backend.
+
+    Returns:
+        module: The numpy module.
+
+    Raises:
+        OperationError: If NumPy is not installed.
+    """
+    try:
+        import numpy as np
+    except ImportError as exc:
+        raise OperationError("NumPy is required for vectorized operations") from exc
+    return np
+
+
+def _as_array(np, values: Any):
+    """Convert operands to an int64/float64 array, falling back to float64."""
+    array = np.asarray(values)
+    if array.dtype.kind in "iu":
+        return array.astype(np.int64, copy=False)
+    return array.astype(np.float64, copy=False)
+
+
+# Integer results at or beyond this magnitude do not fit in int64
+_INT64_LIMIT = 2.0 ** 63
+# Integer operands below this magnitude cannot overflow int64 in any
+# vectorized operation (their product is below 2**62)
+_INT32_LIMIT = 2 ** 31
+
+# Extra digits carried through intermediate steps before the final rounding
+_GUARD_DIGITS = 5
+
+
+def _is_integral(value: Decimal) -> bool:
+    return value == value.to_integral_value()
+
+
+def _exp_ln_power(a: Decimal, b: Decimal, invert: bool = False) -> Decimal:
+    """Return ``a ** b`` (or ``a ** (1 / b)``) for ``a >= 0`` as ``exp(b * ln(a))``."""
+    with localcontext() as ctx:
+        ctx.prec += _GUARD_DIGITS
+        log = a.ln()
+        result = (log / b if invert else log * b).exp()
+    return +result
+
+
+def _nth_root(a: Decimal, n: int) -> Decimal:
+    """
+    Return the n-th root of a non-negative Decimal at the context precision.
+
+    Uses Newton's iteration ``x = ((n - 1) * x + a / x ** (n - 1)) / n`` with
+    guard digits, starting from a float estimate. When the rounded root is
+    exact it is given the ideal exponent, like ``Decimal.sqrt``, so that the
+    cube root of 27 is ``3`` rather than ``3.000000000000000``.
+    """
+    if not a or n == 1:
+        return +a
+    if n == 2:
+        return a.sqrt()
+    with localcontext() as ctx:
+        ctx.prec += _GUARD_DIGITS
+        # Float estimate computed in log space, with the mantissa in [1, 10)
+        # and the integer part of the result's exponent applied separately,
+        # so that huge or tiny operands and high degrees cannot overflow it
+        adjusted = a.adjusted()
+        exponent = (adjusted + math.log10(float(a.scaleb(-adjusted)))) / n
+        whole = math.floor(exponent)
+        x = Decimal(10.0 ** (exponent - whole)).scaleb(whole)
+        # After one step the estimate is at or above the root (AM-GM), and
+        # from there each step decreases it until rounding stalls it
+        x = ((n - 1) * x + a / x ** (n - 1)) / n
+        while True:
+            step = ((n - 1) * x + a / x ** (n - 1)) / n
+            if step >= x:
+                break
+            x = step
+    root = +x
+    with localcontext() as ctx:
+        ctx.prec = 2 * ctx.prec + _GUARD_DIGITS
+        exact = root ** n == a
+    if exact:
+        ideal = a.as_tuple().exponent // n
+        root = root.normalize()
+        if root.as_tuple().exponent > ideal:
+            root = root.quantize(Decimal(1).scaleb(ideal))
+    return root
 
 
 class Operation(ABC):
@@ -16,6 +111,10 @@ class Operation(ABC):
     implement the execute method and can optionally override operand validation.
     """
 
+    # Whether OperationFactory may put the result cache in front of execute.
+    # Only worth it when execute costs more than a cache lookup (~1 µs).
+    memoize: bool = False
+
     @abstractmethod
     def execute(self, a: Decimal, b: Decimal) -> Decimal:
         """
@@ -51,6 +150,82 @@ class Operation(ABC):
         """
         pass # pragma: no cover
 
+    def validate_operands_array(self, a: Any, b: Any) -> Any:
+        """
+        Validate operands elementwise for the vectorized backend.
+
+        Mirrors validate_operands, but reports invalid rows in a boolean mask
+        instead of raising. Subclasses with validation rules override this.
+
+        Args:
+            a (ndarray): First operands.
+            b (ndarray): Second operands.
+
+        Returns:
+            ndarray: Boolean mask, True where the row is valid.
+        """
+        np = _require_numpy()
+        return np.ones(np.broadcast(a, b).shape, dtype=bool)
+
+    def _execute_array(self, np, a: Any, b: Any) -> Any:
+        """
+        Compute the operation on NumPy arrays.
+
+        Subclasses supporting the vectorized backend override this. Operands
+        are already validated, with invalid rows replaced by harmless values.
+        """
+        raise OperationError(f"{self} does not support vectorized execution")
+
+    @classmethod
+    def supports_arrays(cls) -> bool:
+        """Return True if the operation implements the vectorized backend."""
+        return cls._execute_array is not Operation._execute_array
+
+    def execute_array(self, a: Any, b: Any) -> Tuple[Any, Any]:
+        """
+        Execute the operation elementwise using NumPy.
+
+        Operands are converted to int64 (integer input) or float64 arrays.
+        Integer results that would overflow int64 switch the whole column to
+        float64 instead of wrapping around. The same rules as validate_operands are applied per row; rows that fail
+        them are excluded through the returned mask and their result is zero.
+
+        Args:
+            a (array_like): First operands.
+            b (array_like): Second operands.
+
+        Returns:
+            Tuple[ndarray, ndarray]: The results and the validity mask.
+
+        Raises:
+            OperationError: If NumPy is missing or the operation is unsupported.
+        """
+        np = _require_numpy()
+        a = _as_array(np, a)
+        b = _as_array(np, b)
+        mask = self.validate_operands_array(a, b)
+        # (0, 1) is a valid operand pair for every operation
+        safe_a = np.where(mask, a, 0)
+        safe_b = np.where(mask, b, 1)
+        with np.errstate(all="ignore"):
+            result = self._execute_array(np, safe_a, safe_b)
+            if result.dtype == np.int64:
+                # int64 arithmetic wraps silently; recompute rows with large
+                # operands in float64 and switch the column to float64 when
+                # any of them would leave the int64 range
+                large = (
+                    (safe_a >= _INT32_LIMIT) | (safe_a <= -_INT32_LIMIT)
+                    | (safe_b >= _INT32_LIMIT) | (safe_b <= -_INT32_LIMIT)
+                )
+                if large.any():
+                    wide = self._execute_array(
+                        np, safe_a[large].astype(np.float64), safe_b[large].astype(np.float64)
+                    )
+                    if np.any((wide >= _INT64_LIMIT) | (wide <= -_INT64_LIMIT)):
+                        result = result.astype(np.float64)
+                        result[large] = wide
+        return np.where(mask, result, 0), mask
+
     def __str__(self) -> str:
         """
         Return operation name for display.
@@ -84,6 +259,10 @@ class Addition(Operation):
         self.validate_operands(a, b)
         return a + b
 
+    def _execute_array(self, np, a: Any, b: Any) -> Any:
+        """Add two arrays elementwise."""
+        return a + b
+
 
 class Subtraction(Operation):
     """
@@ -106,6 +285,10 @@ class Subtraction(Operation):
         self.validate_operands(a, b)
         return a - b
 
+    def _execute_array(self, np, a: Any, b: Any) -> Any:
+        """Subtract two arrays elementwise."""
+        return a - b
+
 
 class Multiplication(Operation):
     """
@@ -128,6 +311,10 @@ class Multiplication(Operation):
         self.validate_operands(a, b)
         return a * b
 
+    def _execute_array(self, np, a: Any, b: Any) -> Any:
+        """Multiply two arrays elementwise."""
+        return a * b
+
 
 class Division(Operation):
     """
@@ -167,6 +354,14 @@ class Division(Operation):
         self.validate_operands(a, b)
         return a / b
 
+    def validate_operands_array(self, a: Any, b: Any) -> Any:
+        """Elementwise divisor check; rows dividing by zero are masked out."""
+        return super().validate_operands_array(a, b) & (b != 0)
+
+    def _execute_array(self, np, a: Any, b: Any) -> Any:
+        """Divide two arrays elementwise."""
+        return np.true_divide(a, b)
+
 
 class Power(Operation):
     """
@@ -175,27 +370,37 @@ class Power(Operation):
     Raises one number to the power of another.
     """
 
+    memoize = True
+
     def validate_operands(self, a: Decimal, b: Decimal) -> None:
         """
         Validate operands for power operation.
 
-        Overrides the base class method to ensure that the exponent is not negative.
+        Overrides the base class method to ensure that the exponent is not
+        negative and that negative bases are only raised to whole exponents.
 
         Args:
             a (Decimal): Base number.
             b (Decimal): Exponent.
 
         Raises:
-            ValidationError: If the exponent is negative.
+            ValidationError: If the exponent is negative, or fractional with a
+                negative base.
         """
         super().validate_operands(a, b)
         if b < 0:
             raise ValidationError("Negative exponents not supported")
+        if a < 0 and not _is_integral(b):
+            raise ValidationError("Fractional exponents of negative numbers are not supported")
 
     def execute(self, a: Decimal, b: Decimal) -> Decimal:
         """
         Calculate one number raised to the power of another.
 
+        Computed in Decimal at the context precision: whole exponents use
+        Decimal's exact integer power (rounded once at the end), fractional
+        ones ``exp(b * ln(a))`` with guard digits.
+
         Args:
             a (Decimal): Base number.
             b (Decimal): Exponent.
@@ -204,7 +409,28 @@ class Power(Operation):
             Decimal: Result of the exponentiation.
         """
         self.validate_operands(a, b)
-        return Decimal(pow(float(a), float(b)))
+        if not b:
+            # Decimal leaves 0 ** 0 undefined; keep the conventional 1
+            return Decimal(1)
+        if _is_integral(b):
+            return a ** b
+        return _exp_ln_power(a, b)
+
+    def validate_operands_array(self, a: Any, b: Any) -> Any:
+        """
+        Elementwise exponent check; negative exponents and fractional
+        exponents of negative bases are masked out.
+        """
+        np = _require_numpy()
+        return (
+            super().validate_operands_array(a, b)
+            & (b >= 0)
+            & ~((a < 0) & (b != np.trunc(b)))
+        )
+
+    def _execute_array(self, np, a: Any, b: Any) -> Any:
+        """Raise an array to the power of another, in float64."""
+        return np.power(a.astype(np.float64), b.astype(np.float64))
 
 
 class Root(Operation):
@@ -214,6 +440,8 @@ class Root(Operation):
     Calculates the nth root of a number.
     """
 
+    memoize = True
+
     def validate_operands(self, a: Decimal, b: Decimal) -> None:
         """
         Validate operands for root operation.
@@ -226,18 +454,25 @@ class Root(Operation):
             b (Decimal): Degree of the root.
 
         Raises:
-            ValidationError: If the number is negative or the root degree is zero.
+            ValidationError: If the number is negative, the root degree is
+                zero, or a root of negative degree is taken of zero.
         """
         super().validate_operands(a, b)
         if a < 0:
             raise ValidationError("Cannot calculate root of negative number")
         if b == 0:
             raise ValidationError("Zero root is undefined")
+        if b < 0 and a == 0:
+            raise ValidationError("Cannot calculate negative root of zero")
 
     def execute(self, a: Decimal, b: Decimal) -> Decimal:
         """
         Calculate the nth root of a number.
 
+        Whole degrees use Newton's iteration in Decimal and return exact
+        roots (e.g. the cube root of 27) without trailing zeros; other
+        degrees are computed as ``exp(ln(a) / b)`` with guard digits.
+
         Args:
             a (Decimal): Number from which the root is taken.
             b (Decimal): Degree of the root.
@@ -246,7 +481,29 @@ class Root(Operation):
             Decimal: Result of the root calculation.
         """
         self.validate_operands(a, b)
-        return Decimal(pow(float(a), 1 / float(b)))
+        if not _is_integral(b):
+            return _exp_ln_power(a, b, invert=True)
+        degree = int(b)
+        root = _nth_root(a, abs(degree))
+        if degree < 0:
+            return 1 / root
+        return root
+
+    def validate_operands_array(self, a: Any, b: Any) -> Any:
+        """
+        Elementwise root check; negative numbers, zero degrees and negative
+        degrees of zero are masked out.
+        """
+        return (
+            super().validate_operands_array(a, b)
+            & (a >= 0)
+            & (b != 0)
+            & ~((a == 0) & (b < 0))
+        )
+
+    def _execute_array(self, np, a: Any, b: Any) -> Any:
+        """Calculate the elementwise nth root, in float64."""
+        return np.power(a.astype(np.float64), 1.0 / b.astype(np.float64))
 
 class Modulus(Operation):
     """
@@ -285,6 +542,14 @@ class Modulus(Operation):
         """
         self.validate_operands(a, b)
         return a % b
+
+    def validate_operands_array(self, a: Any, b: Any) -> Any:
+        """Elementwise divisor check; rows with a zero divisor are masked out."""
+        return super().validate_operands_array(a, b) & (b != 0)
+
+    def _execute_array(self, np, a: Any, b: Any) -> Any:
+        """Elementwise remainder with the sign of the dividend, like Decimal."""
+        return np.fmod(a, b)
 class IntegerDivision(Operation):
     """
     Integer division operation implementation.
@@ -325,6 +590,14 @@ class IntegerDivision(Operation):
         # Using // on Decimal yields the integer part of the quotient
         return a // b
 
+    def validate_operands_array(self, a: Any, b: Any) -> Any:
+        """Elementwise divisor check; rows with a zero divisor are masked out."""
+        return super().validate_operands_array(a, b) & (b != 0)
+
+    def _execute_array(self, np, a: Any, b: Any) -> Any:
+        """Elementwise quotient truncated toward zero, like Decimal."""
+        return np.sign(a) * np.sign(b) * (np.abs(a) // np.abs(b))
+
 
 class Percentage(Operation):
     """
@@ -333,6 +606,8 @@ class Percentage(Operation):
     Calculates (a / b) * 100.
     """
 
+    memoize = True
+
     def validate_operands(self, a: Decimal, b: Decimal) -> None:
         """
         Validate operands for percentage calculation.
@@ -364,6 +639,14 @@ class Percentage(Operation):
         self.validate_operands(a, b)
         return (a / b) * Decimal("100")
 
+    def validate_operands_array(self, a: Any, b: Any) -> Any:
+        """Elementwise denominator check; rows with a zero whole are masked out."""
+        return super().validate_operands_array(a, b) & (b != 0)
+
+    def _execute_array(self, np, a: Any, b: Any) -> Any:
+        """Calculate (a / b) * 100 elementwise."""
+        return np.true_divide(a, b) * 100
+
 
 class AbsoluteDifference(Operation):
     """
@@ -393,7 +676,57 @@ class AbsoluteDifference(Operation):
         """
         self.validate_operands(a, b)
         return abs(a - b)
-    
+
+    def _execute_array(self, np, a: Any, b: Any) -> Any:
+        """Calculate the elementwise absolute difference."""
+        return np.abs(a - b)
+
+
+class CachedOperation(Operation):
+    """
+    Memoizing wrapper around another operation.
+
+    Results are looked up in a shared LRU cache keyed by the operation name,
+    the exact text of both operands and the precision and rounding of the
+    current Decimal context. Operands that are numerically equal but written
+    differently (``2`` and ``2.0``) get separate entries because the result
+    keeps their exponent. Failed evaluations are not cached.
+    """
+
+    def __init__(self, operation: Operation, cache: LRUCache) -> None:
+        self.operation = operation
+        self.cache = cache
+        self._name = str(operation)
+
+    def execute(self, a: Decimal, b: Decimal) -> Decimal:
+        """
+        Return the cached result, computing and storing it on a miss.
+
+        Args:
+            a (Decimal): First operand.
+            b (Decimal): Second operand.
+
+        Returns:
+            Decimal: Result of the wrapped operation.
+        """
+        context = getcontext()
+        key = (self._name, str(a), str(b), context.prec, context.rounding)
+        result = self.cache.get(key)
+        if result is None:
+            result = self.operation.execute(a, b)
+            self.cache.put(key, result)
+        return result
+
+    def validate_operands(self, a: Decimal, b: Decimal) -> None:
+        self.operation.validate_operands(a, b)
+
+    def execute_array(self, a: Any, b: Any) -> Tuple[Any, Any]:
+        return self.operation.execute_array(a, b)
+
+    def __str__(self) -> str:
+        return self._name
+
+
 class OperationFactory:
     """
     Factory class for creating operation instances.
@@ -417,6 +750,9 @@ class OperationFactory:
         'abs_dif': AbsoluteDifference
     }
 
+    # Shared memo cache, created on first use when config.operation_cache_size > 0
+    _cache: LRUCache | None = None
+
     @classmethod
     def register_operation(cls, name: str, operation_class: type) -> None:
         """
@@ -436,7 +772,7 @@ class OperationFactory:
         cls._operations[name.lower()] = operation_class
 
     @classmethod
-    def create_operation(cls, operation_type: str) -> Operation:
+    def create_operation(cls, operation_type: str, vectorized: bool = False) -> Operation:
         """
         Create an operation instance based on the operation type.
 
@@ -445,14 +781,50 @@ class OperationFactory:
 
         Args:
             operation_type (str): The type of operation to create (e.g., 'add').
+            vectorized (bool): Require the NumPy backend (``execute_array``).
 
         Returns:
-            Operation: An instance of the specified operation class.
+            Operation: An instance of the specified operation class, wrapped
+            in a CachedOperation when the result cache is enabled and the
+            class sets ``memoize`` (scalar operations only).
 
         Raises:
             ValueError: If the operation type is unknown.
+            OperationError: If vectorized is requested but NumPy is missing or
+                the operation has no vectorized implementation.
         """
         operation_class = cls._operations.get(operation_type.lower())
         if not operation_class:
             raise ValueError(f"Unknown operation: {operation_type}")
-        return operation_class()
+        if vectorized:
+            _require_numpy()
+            if not operation_class.supports_arrays():
+                raise OperationError(
+                    f"Operation {operation_type} does not support vectorized execution"
+                )
+            return operation_class()
+        cache = cls.get_cache() if operation_class.memoize else None
+        if cache is None:
+            return operation_class()
+        return CachedOperation(operation_class(), cache)
+
+    @classmethod
+    def get_cache(cls) -> LRUCache | None:
+        """
+        Return the shared operation result cache.
+
+        The cache is sized by ``config.operation_cache_size`` and is None
+        when caching is disabled (size 0).
+        """
+        size = config.operation_cache_size
+        if size <= 0:
+            return None
+        if cls._cache is None or cls._cache.maxsize != size:
+            cls._cache = LRUCache(size)
+        return cls._cache
+
+    @classmethod
+    def cache_stats(cls) -> CacheStats | None:
+        """Return hit/miss/eviction counters of the result cache, if enabled."""
+        cache = cls.get_cache()
+        return cache.stats() if cache is not None else None
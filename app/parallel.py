@@ -0,0 +1,166 @@
+########################
+# Parallel Batches     #
+########################
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields
+import datetime
+import decimal
+import os
+from typing import Iterable, Optional, Union
+
+from app.batch import BatchResult, evaluate_batch
+from app.calculator_config import CalculatorConfig, config
+from app.exceptions import OperationError, ValidationError
+from app.logger import logger
+from app.operations import OperationFactory
+
+
+def _init_worker(cfg: CalculatorConfig, context: decimal.Context) -> None:
+    """
+    Give a worker process the parent's configuration and Decimal context.
+
+    The shared ``config`` object is updated in place so that every module
+    holding a reference to it sees the parent's values, even when the worker
+    was spawned and loaded its own ``.env``.
+    """
+    from app import calculator_config
+
+    for field in fields(CalculatorConfig):
+        setattr(calculator_config.config, field.name, getattr(cfg, field.name))
+    decimal.setcontext(context)
+
+
+def _evaluate_chunk(op_name: str, operands_a: list, operands_b: list) -> BatchResult:
+    """Evaluate one chunk in a worker process."""
+    return evaluate_batch(OperationFactory.create_operation(op_name), operands_a, operands_b)
+
+
+class ParallelBatchExecutor:
+    """
+    Evaluates large batches across a pool of worker processes.
+
+    Operand columns are split into chunks of ``chunk_size`` rows, evaluated
+    with ``evaluate_batch`` in a ``ProcessPoolExecutor`` and merged back in
+    input order. Each worker starts with the parent's ``CalculatorConfig``
+    and the calculator's Decimal context (without a calculator, the caller's
+    current one). Worth it for expensive rows (high
+    ``CALCULATOR_PRECISION``, power/root); for cheap operations the cost of
+    pickling rows outweighs the extra cores.
+
+    When a ``Calculator`` is given, successful rows are recorded in its
+    history as one undoable step and its observers are notified once, as
+    with ``Calculator.perform_batch``.
+
+    The pool is created on first use and reused; call ``close`` or use the
+    executor as a context manager to shut it down.
+    """
+
+    def __init__(
+        self,
+        calculator=None,
+        max_workers: int | None = None,
+        chunk_size: int | None = None,
+        mp_context=None,
+    ) -> None:
+        self.calculator = calculator
+        workers = config.parallel_workers if max_workers is None else max_workers
+        self.max_workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size or config.parallel_chunk_size
+        self._mp_context = mp_context
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _decimal_context(self) -> decimal.Context:
+        if self.calculator is not None:
+            return self.calculator.decimal_context
+        return decimal.getcontext().copy()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=self._mp_context,
+                initializer=_init_worker,
+                initargs=(config, self._decimal_context()),
+            )
+        return self._pool
+
+    def evaluate(
+        self,
+        op_name: str,
+        operands_a: Iterable[Union[str, int, float, decimal.Decimal]],
+        operands_b: Iterable[Union[str, int, float, decimal.Decimal]],
+    ) -> BatchResult:
+        """
+        Evaluate one operation over columns of operands in parallel.
+
+        Args:
+            op_name (str): Operation identifier understood by OperationFactory.
+            operands_a (Iterable): First operands.
+            operands_b (Iterable): Second operands, same length as operands_a.
+
+        Returns:
+            BatchResult: Per-row results, success mask and errors, in input order.
+
+        Raises:
+            OperationError: If the operation name is unknown.
+            ValidationError: If the operand columns differ in length.
+        """
+        try:
+            operation_name = str(OperationFactory.create_operation(op_name))
+        except ValueError as e:
+            raise OperationError(str(e)) from e
+        operands_a = list(operands_a)
+        operands_b = list(operands_b)
+        if len(operands_a) != len(operands_b):
+            raise ValidationError("Operand columns must have the same length")
+
+        timestamp = datetime.datetime.now()
+        size = self.chunk_size
+        starts = range(0, len(operands_a), size)
+        parts = self._get_pool().map(
+            _evaluate_chunk,
+            [op_name] * len(starts),
+            [operands_a[i:i + size] for i in starts],
+            [operands_b[i:i + size] for i in starts],
+        )
+        batch = _merge(operation_name, parts, timestamp)
+
+        if batch.error_count:
+            logger.error(
+                f"Parallel batch {batch.operation}: {batch.error_count} of {len(batch)} rows failed"
+            )
+        if self.calculator is not None and batch.calculations:
+            self.calculator.record_calculations(batch.calculations)
+        return batch
+
+    def close(self) -> None:
+        """Shut down the worker pool."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self) -> "ParallelBatchExecutor":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _merge(
+    operation: str,
+    parts: Iterable[BatchResult],
+    timestamp: datetime.datetime,
+) -> BatchResult:
+    batch = BatchResult(operation=operation)
+    for part in parts:
+        batch.results.extend(part.results)
+        batch.mask.extend(part.mask)
+        batch.errors.extend(part.errors)
+        batch.calculations.extend(part.calculations)
+    # Chunks finish in any order; stamp the batch once, like evaluate_batch
+    for calculation in batch.calculations:
+        calculation.timestamp = timestamp
+    return batch
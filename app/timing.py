@@ -0,0 +1,153 @@
+########################
+# Stage Timing         #
+########################
+
+"""
+Latency histograms for the stages of a calculation.
+
+Durations are recorded in nanoseconds (``time.perf_counter_ns``) into
+log-linear buckets: exact below 16 ns, then eight buckets per power of two,
+so a reported percentile is within 12.5% of the true value while recording
+stays O(1) and memory stays fixed however many samples arrive.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import threading
+from typing import Dict, List, Tuple
+
+# Sub-buckets per power of two, as a bit count (2**3 = 8)
+_SUB_BUCKET_BITS = 3
+_SUB_BUCKETS = 1 << _SUB_BUCKET_BITS
+# Enough buckets for any duration below 2**64 ns
+_BUCKET_COUNT = (64 + 1) * _SUB_BUCKETS
+
+
+def _bucket_index(value: int) -> int:
+    if value < 2 * _SUB_BUCKETS:
+        return value
+    # Keep the top four bits: a mantissa in [8, 16) and the shift it needs
+    shift = value.bit_length() - _SUB_BUCKET_BITS - 1
+    return (shift << _SUB_BUCKET_BITS) + (value >> shift)
+
+
+def _bucket_upper_bound(index: int) -> int:
+    if index < 2 * _SUB_BUCKETS:
+        return index
+    shift = (index >> _SUB_BUCKET_BITS) - 1
+    mantissa = (index & (_SUB_BUCKETS - 1)) + _SUB_BUCKETS
+    return ((mantissa + 1) << shift) - 1
+
+
+@dataclass(frozen=True)
+class LatencySummary:
+    """Percentiles of one stage's recorded durations, in nanoseconds."""
+
+    count: int
+    total_ns: int
+    p50_ns: int
+    p95_ns: int
+    p99_ns: int
+    max_ns: int
+
+    @property
+    def mean_ns(self) -> float:
+        """Average duration."""
+        return self.total_ns / self.count if self.count else 0.0
+
+
+class LatencyHistogram:
+    """Fixed-size histogram of durations in nanoseconds."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self.counts: List[int] = [0] * _BUCKET_COUNT
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, value: int) -> None:
+        """Add one duration."""
+        self.counts[_bucket_index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, fraction: float) -> int:
+        """Return the duration below which ``fraction`` of samples fall."""
+        if not self.count:
+            return 0
+        rank = max(1, round(fraction * self.count))
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= rank:
+                return min(_bucket_upper_bound(index), self.max)
+        return self.max  # pragma: no cover - counts always sum to count
+
+    def summary(self) -> LatencySummary:
+        return LatencySummary(
+            count=self.count,
+            total_ns=self.total,
+            p50_ns=self.percentile(0.50),
+            p95_ns=self.percentile(0.95),
+            p99_ns=self.percentile(0.99),
+            max_ns=self.max,
+        )
+
+
+class StageTimer:
+    """
+    Per-operation, per-stage latency histograms.
+
+    ``record`` is called from the calculation path and the observer worker
+    without a lock, so under concurrent use the counts are approximate, as
+    with ``LRUCache`` statistics.
+    """
+
+    def __init__(self) -> None:
+        self._histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, operation: str, stage: str, elapsed_ns: int) -> None:
+        """Record one duration for ``stage`` of ``operation``."""
+        histogram = self._histograms.get((operation, stage))
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault((operation, stage), LatencyHistogram())
+        histogram.record(elapsed_ns)
+
+    def snapshot(self) -> Dict[str, Dict[str, LatencySummary]]:
+        """Return ``{operation: {stage: LatencySummary}}`` in recording order."""
+        with self._lock:
+            items = list(self._histograms.items())
+        stats: Dict[str, Dict[str, LatencySummary]] = {}
+        for (operation, stage), histogram in items:
+            stats.setdefault(operation, {})[stage] = histogram.summary()
+        return stats
+
+    def reset(self) -> None:
+        """Discard all recorded durations."""
+        with self._lock:
+            self._histograms.clear()
+
+
+def format_stats(stats: Dict[str, Dict[str, LatencySummary]]) -> str:
+    """Render ``StageTimer.snapshot()`` output as a table in microseconds."""
+    if not stats:
+        return "No timings recorded."
+    lines = [
+        f"{'operation':<16}{'stage':<28}{'count':>8}"
+        f"{'p50 us':>10}{'p95 us':>10}{'p99 us':>10}{'max us':>10}"
+    ]
+    for operation, stages in stats.items():
+        for stage, summary in stages.items():
+            lines.append(
+                f"{operation:<16}{stage:<28}{summary.count:>8}"
+                f"{summary.p50_ns / 1000:>10.1f}{summary.p95_ns / 1000:>10.1f}"
+                f"{summary.p99_ns / 1000:>10.1f}{summary.max_ns / 1000:>10.1f}"
+            )
+    return "\n".join(lines)
@@ -0,0 +1,70 @@
+"""Run the calculator benchmark suite.
+
+Usage::
+
+    python -m benchmarks [--quick] [--filter TEXT] [--repeat N]
+                         [--output results.json] [--baseline baseline.json]
+                         [--threshold 0.25]
+
+Typical use: save a baseline on the main branch with
+``--output baseline.json``, then run with ``--baseline baseline.json`` on a
+change. The exit status is 1 when any case regressed by more than the
+threshold.
+"""
+
+import argparse
+import json
+import sys
+
+from benchmarks.suite import DEFAULT_THRESHOLD, compare, run
+
+
+def _print_result(name, result):
+    print(f"{name:<40}{result['ns_per_item']:>14.1f} ns", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="use smaller history and CSV sizes")
+    parser.add_argument("--filter", metavar="TEXT", help="only run cases whose name contains TEXT")
+    parser.add_argument("--repeat", type=int, default=5, help="timing repeats per case (default 5)")
+    parser.add_argument("--output", metavar="FILE", help="write the results as JSON to FILE")
+    parser.add_argument("--baseline", metavar="FILE", help="compare with a JSON results file")
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD,
+        help=f"slowdown that counts as a regression (default {DEFAULT_THRESHOLD:g}, i.e. {DEFAULT_THRESHOLD * 100:g}%%)",
+    )
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+
+    print(f"{'case':<40}{'time per item':>17}")
+    report = run(quick=args.quick, repeat=args.repeat, pattern=args.filter, progress=_print_result)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+            fh.write("\n")
+
+    if baseline is None:
+        return 0
+    comparisons = compare(report, baseline, args.threshold)
+    print(f"\n{'case':<40}{'baseline ns':>14}{'current ns':>14}{'ratio':>8}  status")
+    for item in comparisons:
+        if args.filter and item.status == "missing":
+            continue
+        before = f"{item.baseline_ns:.1f}" if item.baseline_ns is not None else "-"
+        now = f"{item.current_ns:.1f}" if item.current_ns is not None else "-"
+        ratio = f"{item.ratio:.2f}" if item.ratio is not None else "-"
+        print(f"{item.name:<40}{before:>14}{now:>14}{ratio:>8}  {item.status}")
+    regressions = [item.name for item in comparisons if item.status == "regression"]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""Memory and construction-time comparison of Calculation and FrozenCalculation.
+
+Usage::
+
+    python -m benchmarks.bench_calculation [--count N]
+"""
+
+import argparse
+import datetime
+from decimal import Decimal
+import timeit
+import tracemalloc
+
+from app.calculation import Calculation, FrozenCalculation
+
+
+def _operands(count):
+    return [(Decimal(i), Decimal("1.5"), Decimal(i) + Decimal("1.5")) for i in range(count)]
+
+
+def _bytes_per_instance(factory, operands):
+    timestamp = datetime.datetime.now()
+    tracemalloc.start()
+    instances = [factory(a, b, r, timestamp) for a, b, r in operands]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del instances
+    return size / len(operands)
+
+
+def run(count=100_000):
+    """Return ``{variant: {"bytes": ..., "ns_per_op": ...}}`` for each variant."""
+    operands = _operands(count)
+    variants = {
+        "Calculation()": lambda a, b, r, ts: Calculation("Addition", a, b, ts),
+        "Calculation.from_result": lambda a, b, r, ts: Calculation.from_result("Addition", a, b, r, ts),
+        "FrozenCalculation": lambda a, b, r, ts: FrozenCalculation("Addition", a, b, r, ts),
+    }
+    results = {}
+    for name, factory in variants.items():
+        timestamp = datetime.datetime.now()
+        seconds = min(timeit.repeat(
+            lambda: [factory(a, b, r, timestamp) for a, b, r in operands], number=1, repeat=3
+        ))
+        results[name] = {
+            "bytes": round(_bytes_per_instance(factory, operands), 1),
+            "ns_per_op": round(seconds / count * 1e9, 1),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+    print(f"{'variant':<26}{'bytes/instance':>16}{'ns/construct':>14}")
+    for name, stats in run(args.count).items():
+        print(f"{name:<26}{stats['bytes']:>16}{stats['ns_per_op']:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Scaling of ParallelBatchExecutor across worker counts.
+
+Usage::
+
+    python -m benchmarks.bench_parallel [--rows N] [--precision P] [--max-workers W]
+"""
+
+import argparse
+from decimal import localcontext
+import os
+import time
+
+from app.batch import evaluate_batch
+from app.operations import OperationFactory
+from app.parallel import ParallelBatchExecutor
+
+
+def _operands(rows):
+    return [f"{i + 2}.5" for i in range(rows)], ["2.5"] * rows
+
+
+def run(rows=2_000, precision=200, max_workers=None, operation="root"):
+    """Return ``{label: seconds}`` for a serial run and 1..max_workers workers."""
+    max_workers = max_workers or os.cpu_count() or 1
+    operands_a, operands_b = _operands(rows)
+    results = {}
+    with localcontext() as ctx:
+        ctx.prec = precision
+        start = time.perf_counter()
+        evaluate_batch(OperationFactory.create_operation(operation), operands_a, operands_b)
+        results["serial"] = time.perf_counter() - start
+        for workers in range(1, max_workers + 1):
+            chunk_size = max(1, rows // (workers * 4))
+            with ParallelBatchExecutor(max_workers=workers, chunk_size=chunk_size) as executor:
+                # Start the workers outside the timed region
+                executor.evaluate(operation, operands_a[:workers], operands_b[:workers])
+                start = time.perf_counter()
+                executor.evaluate(operation, operands_a, operands_b)
+                results[f"{workers} workers"] = time.perf_counter() - start
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000)
+    parser.add_argument("--precision", type=int, default=200)
+    parser.add_argument("--max-workers", type=int, default=None)
+    parser.add_argument("--operation", default="root")
+    args = parser.parse_args()
+    results = run(args.rows, args.precision, args.max_workers, args.operation)
+    serial = results["serial"]
+    print(f"{'run':<14}{'seconds':>10}{'speedup':>10}")
+    for label, seconds in results.items():
+        print(f"{label:<14}{seconds:>10.3f}{serial / seconds:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
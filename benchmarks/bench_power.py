@@ -0,0 +1,60 @@
+"""Throughput of the Decimal Power/Root implementations versus the old float path.
+
+Usage::
+
+    python -m benchmarks.bench_power [--count N] [--precision P]
+"""
+
+import argparse
+from decimal import Decimal, localcontext
+import timeit
+
+from app.operations import Power, Root
+
+CASES = {
+    "power, whole exponent": (Power, "1.07", "12"),
+    "power, fractional exponent": (Power, "2", "0.5"),
+    "root, square": (Root, "12345.678", "2"),
+    "root, whole degree": (Root, "27", "3"),
+    "root, fractional degree": (Root, "12345.678", "2.5"),
+}
+
+
+def _float_power(a, b):
+    return Decimal(pow(float(a), float(b)))
+
+
+def _float_root(a, b):
+    return Decimal(pow(float(a), 1 / float(b)))
+
+
+def run(count=20_000, precision=16):
+    """Return ``{case: {"decimal_ops": ..., "float_ops": ...}}`` in operations per second."""
+    results = {}
+    with localcontext() as ctx:
+        ctx.prec = precision
+        for name, (cls, a, b) in CASES.items():
+            a, b = Decimal(a), Decimal(b)
+            execute = cls().execute
+            legacy = _float_power if cls is Power else _float_root
+            decimal_seconds = min(timeit.repeat(lambda: execute(a, b), number=count, repeat=3))
+            float_seconds = min(timeit.repeat(lambda: legacy(a, b), number=count, repeat=3))
+            results[name] = {
+                "decimal_ops": round(count / decimal_seconds),
+                "float_ops": round(count / float_seconds),
+            }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=20_000)
+    parser.add_argument("--precision", type=int, default=16)
+    args = parser.parse_args()
+    print(f"{'case':<28}{'decimal ops/s':>15}{'float ops/s':>15}")
+    for name, stats in run(args.count, args.precision).items():
+        print(f"{name:<28}{stats['decimal_ops']:>15}{stats['float_ops']:>15}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Multi-threaded stress test of Calculator.calculate versus one big lock.
+
+Every thread performs the same deterministic mix of operations. The
+``locked`` variant serializes ``set_operation`` + ``perform_operation``
+behind a single lock, as callers had to before ``calculate`` existed.
+After each run the history is checked to hold every calculation, with each
+thread's calculations in the order it made them.
+
+Usage::
+
+    python -m benchmarks.bench_threads [--ops N] [--max-threads T]
+"""
+
+import argparse
+import threading
+import time
+
+from benchmarks.suite import configured, operands
+
+OPERATIONS = ("add", "multiply", "divide", "power", "root")
+
+
+def _workload(ops):
+    per_operation = ops // len(OPERATIONS)
+    return [
+        (name, a, b)
+        for name in OPERATIONS
+        for a, b in operands(name, per_operation)
+    ]
+
+
+def _run(threads, ops, variant):
+    from app.calculator import Calculator
+    from app.operations import OperationFactory
+
+    with configured(auto_save=False, max_history_size=0):
+        calc = Calculator()
+    calc._observers = []
+    work = _workload(ops)
+    big_lock = threading.Lock()
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(index):
+        barrier.wait()
+        for op_name, a, b in work:
+            if variant == "calculate":
+                calc.calculate(op_name, a, b)
+            else:
+                with big_lock:
+                    calc.set_operation(OperationFactory.create_operation(op_name))
+                    calc.perform_operation(a, b)
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    history = calc.get_history()
+    elapsed = time.perf_counter() - start
+
+    expected = threads * len(work)
+    if len(history) != expected:
+        raise AssertionError(f"{variant}: history holds {len(history)} of {expected} calculations")
+    return expected / elapsed
+
+
+def run(ops=2_000, max_threads=8):
+    """Return ``{(variant, threads): calculations per second}``."""
+    results = {}
+    threads = 1
+    while threads <= max_threads:
+        for variant in ("locked", "calculate"):
+            results[(variant, threads)] = _run(threads, ops, variant)
+        threads *= 2
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=2_000, help="calculations per thread")
+    parser.add_argument("--max-threads", type=int, default=8)
+    args = parser.parse_args()
+    results = run(args.ops, args.max_threads)
+    print(f"{'threads':>8}{'locked ops/s':>16}{'calculate ops/s':>18}")
+    for (variant, threads), rate in results.items():
+        if variant == "locked":
+            print(f"{threads:>8}{rate:>16,.0f}{results[('calculate', threads)]:>18,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+"""Benchmark suite for the calculator hot paths, with baseline comparison.
+
+Every case runs a deterministic synthetic workload (seeded operands, fixed
+timestamps) and reports the best time per item over several repeats, in
+nanoseconds. Results are written as JSON and can be compared against a
+stored baseline, flagging cases that got slower than a threshold allows.
+
+Run it with ``python -m benchmarks`` (see ``benchmarks/__main__.py``).
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+import datetime
+from decimal import Decimal
+import os
+from pathlib import Path
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import timeit
+from typing import Callable, Dict, Iterator, List, Optional
+
+from app.calculation import Calculation
+from app.calculator_config import config
+from app.input_validators import InputValidator
+from app.operations import OperationFactory
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+SEED = 20240101
+TIMESTAMP = datetime.datetime(2024, 1, 1, 12, 0, 0)
+
+HISTORY_SIZES = (100, 1_000, 10_000, 100_000, 1_000_000)
+QUICK_HISTORY_SIZES = (100, 1_000, 10_000)
+CSV_SIZES = (10_000, 100_000, 1_000_000)
+QUICK_CSV_SIZES = (1_000, 10_000)
+
+# Ratio of current to baseline time above which a case counts as a regression
+DEFAULT_THRESHOLD = 0.25
+
+
+@dataclass
+class Case:
+    """One benchmark: ``setup`` returns the callable that is timed.
+
+    Each call of the timed callable processes ``items`` items (operations,
+    rows, ...); results are reported per item.
+    """
+
+    name: str
+    setup: Callable[[], Callable[[], object]]
+    number: int = 1
+    items: int = 1
+    teardown: Optional[Callable[[], None]] = None
+
+
+@contextmanager
+def configured(**changes) -> Iterator[None]:
+    """Temporarily change fields of the shared configuration."""
+    saved = {name: getattr(config, name) for name in changes}
+    for name, value in changes.items():
+        setattr(config, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(config, name, value)
+
+
+# ----------------------------------------------------------------------
+# Synthetic workloads
+def operands(op_name: str, count: int, seed: int = SEED) -> List[tuple]:
+    """Return ``count`` valid ``(a, b)`` string pairs for an operation."""
+    rng = random.Random(f"{seed}-{op_name}")
+    pairs = []
+    for _ in range(count):
+        a = f"{rng.randrange(1, 10_000)}.{rng.randrange(10_000):04d}"
+        if op_name == "power":
+            b = str(rng.randrange(0, 10))
+        elif op_name == "root":
+            b = str(rng.randrange(2, 6))
+        else:
+            b = f"{rng.randrange(1, 100)}.{rng.randrange(100):02d}"
+        pairs.append((a, b))
+    return pairs
+
+
+def calculations(count: int, seed: int = SEED) -> List[Calculation]:
+    """Return ``count`` additions with shared operand objects and one timestamp."""
+    rng = random.Random(seed)
+    pool = [Decimal(f"{rng.randrange(1, 10**6)}.{rng.randrange(100):02d}") for _ in range(1_000)]
+    return [
+        Calculation.from_result(
+            "Addition", pool[i % 1000], pool[(i * 7) % 1000],
+            pool[i % 1000] + pool[(i * 7) % 1000], TIMESTAMP,
+        )
+        for i in range(count)
+    ]
+
+
+# ----------------------------------------------------------------------
+# Cases
+def _perform_operation_case(op_name: str, quick: bool) -> Case:
+    pairs = operands(op_name, 200 if quick else 1_000)
+
+    def setup():
+        from app.calculator import Calculator
+
+        with configured(auto_save=False, sqlite_history=False, async_observers=False):
+            calc = Calculator()
+        # Measure the calculation path, not log file I/O
+        calc._observers = []
+        calc.set_operation(OperationFactory.create_operation(op_name))
+        perform = calc.perform_operation
+
+        def run():
+            for a, b in pairs:
+                perform(a, b)
+
+        return run
+
+    return Case(f"perform_operation[{op_name}]", setup, number=5, items=len(pairs))
+
+
+def _history(size: int):
+    from app.history import History
+
+    with configured(max_history_size=size):
+        history = History()
+    history.add_calculations(calculations(size))
+    return history
+
+
+def _history_cases(size: int) -> List[Case]:
+    batch = calculations(1_000, seed=SEED + 1)
+
+    def add_setup():
+        add = _history(size).add_calculation
+
+        def run():
+            for calculation in batch:
+                add(calculation)
+
+        return run
+
+    def undo_redo_setup():
+        history = _history(size)
+        history.add_calculation(batch[0])
+        undo, redo = history.undo, history.redo
+
+        def run():
+            for _ in range(1_000):
+                undo()
+                redo()
+
+        return run
+
+    return [
+        Case(f"history.add_calculation[{size}]", add_setup, number=3, items=len(batch)),
+        Case(f"history.undo_redo[{size}]", undo_redo_setup, number=3, items=1_000),
+    ]
+
+
+def _csv_cases(size: int) -> List[Case]:
+    directory = tempfile.TemporaryDirectory(prefix="calculator-bench-")
+    path = Path(directory.name) / "history.csv"
+
+    def save_setup():
+        history = _history(size)
+        return lambda: history.save_to_csv(path)
+
+    def load_setup():
+        from app.history import History
+
+        _history(size).save_to_csv(path)
+        with configured(max_history_size=size):
+            history = History()
+        return lambda: history.load_from_csv(path)
+
+    return [
+        Case(f"history.save_to_csv[{size}]", save_setup, items=size),
+        Case(f"history.load_from_csv[{size}]", load_setup, items=size, teardown=directory.cleanup),
+    ]
+
+
+def _validate_cases() -> List[Case]:
+    rng = random.Random(SEED)
+    inputs = {
+        "str": [f"{rng.randrange(10**6)}.{rng.randrange(100):02d}" for _ in range(1_000)],
+        "int": [rng.randrange(10**9) for _ in range(1_000)],
+        "float": [rng.random() * 1e6 for _ in range(1_000)],
+        "Decimal": [Decimal(rng.randrange(10**6)) / 100 for _ in range(1_000)],
+    }
+    cases = []
+    for kind, values in inputs.items():
+        def setup(values=values):
+            validate = InputValidator.validate_number
+
+            def run():
+                for value in values:
+                    validate(value)
+
+            return run
+
+        cases.append(Case(f"validate_number[{kind}]", setup, number=20, items=len(values)))
+    return cases
+
+
+def _subprocess_case(name: str, args: List[str], stdin: str = "") -> Case:
+    # Run in an empty directory, without .env or CALCULATOR_* overrides
+    directory = tempfile.TemporaryDirectory(prefix="calculator-bench-")
+
+    def setup():
+        env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+        for key in list(env):
+            if key.startswith("CALCULATOR_"):
+                del env[key]
+        return lambda: subprocess.run(
+            [sys.executable, *args],
+            cwd=directory.name, env=env, input=stdin, capture_output=True, text=True, check=True,
+        )
+
+    return Case(name, setup, teardown=directory.cleanup)
+
+
+def build_cases(quick: bool = False) -> List[Case]:
+    """Return the benchmark cases; ``quick`` uses smaller sizes."""
+    cases = [_perform_operation_case(name, quick) for name in OperationFactory._operations]
+    for size in QUICK_HISTORY_SIZES if quick else HISTORY_SIZES:
+        cases.extend(_history_cases(size))
+    for size in QUICK_CSV_SIZES if quick else CSV_SIZES:
+        cases.extend(_csv_cases(size))
+    cases.extend(_validate_cases())
+    cases.append(_subprocess_case("startup[import main]", ["-c", "import main"]))
+    cases.append(_subprocess_case("startup[repl]", [str(REPO_ROOT / "main.py")], stdin="exit\n"))
+    return cases
+
+
+# ----------------------------------------------------------------------
+# Running and comparing
+def run(
+    quick: bool = False,
+    repeat: int = 5,
+    pattern: str | None = None,
+    progress: Callable[[str, Dict[str, float]], None] | None = None,
+) -> Dict[str, object]:
+    """
+    Run the suite and return a JSON-serializable report.
+
+    Args:
+        quick: Use smaller history and CSV sizes.
+        repeat: Timing repeats per case; the fastest one is reported.
+        pattern: Only run cases whose name contains this text.
+        progress: Called with each case name and result as it finishes.
+    """
+    results: Dict[str, Dict[str, float]] = {}
+    for case in build_cases(quick):
+        if pattern and pattern not in case.name:
+            if case.teardown is not None:
+                case.teardown()
+            continue
+        try:
+            timed = case.setup()
+            best = min(timeit.repeat(timed, number=case.number, repeat=repeat))
+        finally:
+            if case.teardown is not None:
+                case.teardown()
+        result = {
+            "ns_per_item": round(best / (case.number * case.items) * 1e9, 1),
+            "items": case.items,
+            "number": case.number,
+            "repeat": repeat,
+        }
+        results[case.name] = result
+        if progress is not None:
+            progress(case.name, result)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "quick": quick,
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """One case compared with the baseline."""
+
+    name: str
+    baseline_ns: float | None
+    current_ns: float | None
+    status: str  # "ok", "regression", "improvement", "new" or "missing"
+
+    @property
+    def ratio(self) -> float | None:
+        if not self.baseline_ns or self.current_ns is None:
+            return None
+        return self.current_ns / self.baseline_ns
+
+
+def compare(
+    report: Dict[str, object],
+    baseline: Dict[str, object],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> List[Comparison]:
+    """
+    Compare a report with a baseline report.
+
+    A case is a regression when it takes more than ``1 + threshold`` times
+    its baseline time, and an improvement when it takes less than
+    ``1 / (1 + threshold)`` times. Cases only in one report are "new" or
+    "missing".
+    """
+    current = report["results"]
+    previous = baseline["results"]
+    comparisons = []
+    for name in list(current) + [name for name in previous if name not in current]:
+        now = current.get(name, {}).get("ns_per_item")
+        before = previous.get(name, {}).get("ns_per_item")
+        if before is None:
+            status = "new"
+        elif now is None:
+            status = "missing"
+        elif now > before * (1 + threshold):
+            status = "regression"
+        elif now * (1 + threshold) < before:
+            status = "improvement"
+        else:
+            status = "ok"
+        comparisons.append(Comparison(name, before, now, status))
+    return comparisons
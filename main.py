@@ -1,5 +1,33 @@
-from app.calculator_repl import calculator_repl
+import argparse
+import sys
+
+from app.calculator_config import config
+from app.calculator_repl import calculator_batch, calculator_repl
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the interactive REPL, or batch mode when ``--batch`` is given."""
+    parser = argparse.ArgumentParser(description="Command-line calculator")
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="evaluate one '<operation> <a> <b>' expression per line from FILE "
+             "('-' for stdin) and print the results without prompts",
+    )
+    args = parser.parse_args(argv)
+
+    if args.batch is None:
+        calculator_repl()
+        return 0
+    if args.batch == "-":
+        return calculator_batch(sys.stdin)
+    try:
+        with open(args.batch, encoding=config.default_encoding) as fh:
+            return calculator_batch(fh)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
 
 
 if __name__ == "__main__":  # pragma: no cover - CLI entry point
-    calculator_repl()
\ No newline at end of file
+    sys.exit(main())
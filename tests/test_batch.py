@@ -0,0 +1,35 @@
+from decimal import Decimal
+import pytest
+
+from app.batch import evaluate_batch
+from app.exceptions import OperationError, ValidationError
+from app.operations import Division, Operation
+
+
+def test_evaluate_batch_mask_and_errors():
+    batch = evaluate_batch(Division(), ["6", "1", "abc"], ["3", "0", "1"])
+    assert batch.operation == "Division"
+    assert batch.mask == [True, False, False]
+    assert batch.results == [Decimal("2"), None, None]
+    assert batch.errors[0] is None
+    assert isinstance(batch.errors[1], ValidationError)
+    assert isinstance(batch.errors[2], ValidationError)
+    assert len(batch) == 3
+    assert batch.success_count == 1
+    assert batch.error_count == 2
+    assert [c.result for c in batch.calculations] == [Decimal("2")]
+
+
+def test_evaluate_batch_wraps_unexpected_errors():
+    class Broken(Operation):
+        def execute(self, a, b):
+            raise RuntimeError("boom")
+
+    batch = evaluate_batch(Broken(), ["1"], ["2"])
+    assert batch.mask == [False]
+    assert isinstance(batch.errors[0], OperationError)
+
+
+def test_evaluate_batch_length_mismatch():
+    with pytest.raises(ValidationError):
+        evaluate_batch(Division(), ["1", "2"], ["1"])
@@ -0,0 +1,57 @@
+import json
+
+from benchmarks import suite
+from benchmarks.__main__ import main
+
+
+def _report(**results):
+    return {"meta": {}, "results": {name: {"ns_per_item": ns} for name, ns in results.items()}}
+
+
+def test_compare_flags_regressions():
+    current = _report(a=130.0, b=100.0, c=70.0, new=5.0)
+    baseline = _report(a=100.0, b=95.0, c=100.0, gone=1.0)
+    statuses = {item.name: item.status for item in suite.compare(current, baseline, threshold=0.25)}
+    assert statuses == {
+        "a": "regression", "b": "ok", "c": "improvement", "new": "new", "gone": "missing",
+    }
+    comparison = suite.compare(current, baseline)[0]
+    assert comparison.ratio == 1.3
+    assert suite.Comparison("x", None, 1.0, "new").ratio is None
+
+
+def test_workloads_are_deterministic():
+    assert suite.operands("root", 5) == suite.operands("root", 5)
+    assert suite.operands("root", 5) != suite.operands("power", 5)
+    assert all(int(b) >= 2 for _, b in suite.operands("root", 50))
+    first, second = suite.calculations(3), suite.calculations(3)
+    assert [c.result for c in first] == [c.result for c in second]
+    assert first[0].result == first[0].calculate()
+
+
+def test_run_and_compare_cli(tmp_path, capsys):
+    results = tmp_path / "results.json"
+    assert main(["--quick", "--repeat", "1", "--filter", "validate_number", "--output", str(results)]) == 0
+    report = json.loads(results.read_text())
+    assert set(report["results"]) == {
+        "validate_number[str]", "validate_number[int]",
+        "validate_number[float]", "validate_number[Decimal]",
+    }
+    assert report["meta"]["quick"] is True
+
+    # A baseline ten times faster than reality must be flagged
+    for result in report["results"].values():
+        result["ns_per_item"] /= 10
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(report))
+    status = main(["--quick", "--repeat", "1", "--filter", "validate_number[int]",
+                   "--baseline", str(baseline)])
+    assert status == 1
+    assert "regression" in capsys.readouterr().out
+
+
+def test_configured_restores_config():
+    size = suite.config.max_history_size
+    with suite.configured(max_history_size=size + 1):
+        assert suite.config.max_history_size == size + 1
+    assert suite.config.max_history_size == size
@@ -0,0 +1,58 @@
+import threading
+
+import pytest
+
+from app.cache import LRUCache
+
+
+def test_lru_cache_hits_misses_and_evictions():
+    cache = LRUCache(2)
+    assert cache.get("a") is None
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)  # evicts "b", the least recently used
+    assert "b" not in cache
+    assert cache.get("b", "missing") == "missing"
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.size, stats.maxsize) == (3, 2, 1, 2, 2)
+    assert stats.hit_rate == pytest.approx(0.6)
+
+
+def test_lru_cache_overwrite_and_clear():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("a", 2)
+    assert len(cache) == 1
+    assert cache.get("a") == 2
+    cache.clear()
+    assert len(cache) == 0
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions) == (0, 0, 0)
+    assert stats.hit_rate == 0.0
+
+
+def test_lru_cache_rejects_non_positive_size():
+    with pytest.raises(ValueError):
+        LRUCache(0)
+
+
+def test_lru_cache_shared_between_threads():
+    cache = LRUCache(16)
+
+    def worker(offset):
+        for i in range(2000):
+            key = (offset + i) % 40
+            if cache.get(key) is None:
+                cache.put(key, key)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(cache) == 16
+    assert all(cache.get(key) in (None, key) for key in range(40))
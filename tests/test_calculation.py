@@ -39,3 +39,60 @@ def test_calculation_zero_division():
     with pytest.raises(OperationError):
         Calculation("Division", Decimal("1"), Decimal("0"))
 
+
+def test_from_result_skips_evaluation(monkeypatch):
+    def fail(self):  # pragma: no cover - must not be called
+        raise AssertionError("calculate() should not run")
+
+    monkeypatch.setattr(Calculation, "calculate", fail)
+    calc = Calculation.from_result("Addition", Decimal("2"), Decimal("3"), Decimal("5"))
+    assert calc.result == Decimal("5")
+    assert calc.timestamp is not None
+
+
+def test_from_dict_verifies_stored_result():
+    data = Calculation("Addition", Decimal("2"), Decimal("3")).to_dict()
+    data["result"] = "6"
+    calc = Calculation.from_dict(data)
+    assert calc.result == Decimal("5")
+
+
+def test_frozen_calculation_value_semantics():
+    import pickle
+    from dataclasses import FrozenInstanceError
+    from app.calculation import FrozenCalculation
+
+    calc = Calculation("Addition", Decimal("2"), Decimal("3"))
+    frozen = calc.freeze()
+    assert isinstance(frozen, FrozenCalculation)
+    assert frozen == calc and calc == frozen
+    assert frozen.result == Decimal("5")
+    assert str(frozen) == str(calc)
+    assert repr(frozen).startswith("FrozenCalculation(")
+    assert frozen.format_result() == "5"
+    assert not hasattr(frozen, "__dict__")
+
+    duplicate = FrozenCalculation("Addition", Decimal("2.0"), Decimal("3"), Decimal("5"))
+    assert hash(duplicate) == hash(frozen)
+    assert len({frozen, duplicate}) == 1
+    assert FrozenCalculation("Addition", Decimal("2"), Decimal("3"), Decimal("6")) != frozen
+
+    with pytest.raises(FrozenInstanceError):
+        frozen.result = Decimal("6")
+    with pytest.raises(FrozenInstanceError):
+        del frozen.result
+
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+    assert frozen.thaw() == calc
+    assert frozen.thaw().timestamp == calc.timestamp
+
+
+def test_frozen_calculation_dict_round_trip():
+    from app.calculation import FrozenCalculation
+
+    calc = Calculation("Multiplication", Decimal("2"), Decimal("4"))
+    frozen = FrozenCalculation.from_dict(calc.to_dict())
+    assert frozen.to_dict() == calc.to_dict()
+    assert Calculation.from_dict(frozen.to_dict()) == frozen
+    with pytest.raises(OperationError):
+        FrozenCalculation.from_dict({"operand1": "1"})
@@ -45,4 +45,199 @@ def test_calculator_observer_called(tmp_path):
     calc._observers = [DummyObserver()]
     calc.set_operation(OperationFactory.create_operation("add"))
     calc.perform_operation("1", "2")
-    assert calls and calls[0][0].result == Decimal("3")
\ No newline at end of file
+    assert calls and calls[0][0].result == Decimal("3")
+
+def test_calculator_records_executed_result():
+    calc = Calculator()
+    calc.set_operation(OperationFactory.create_operation("percent"))
+    result = calc.perform_operation("25", "50")
+    assert calc.get_history()[-1].result == result == Decimal("50")
+
+
+def test_calculator_perform_batch():
+    batches = []
+
+    class BatchObserver:
+        def update(self, calculation, history):  # pragma: no cover - not used
+            raise AssertionError("per-row notification")
+
+        def update_batch(self, calculations, history):
+            batches.append(calculations)
+
+    calc = Calculator()
+    calc._observers = [BatchObserver()]
+    batch = calc.perform_batch("add", ["1", "2", "x"], ["1", "2", "3"])
+    assert batch.mask == [True, True, False]
+    assert [c.result for c in calc.get_history()] == [Decimal("2"), Decimal("4")]
+    assert len(batches) == 1 and len(batches[0]) == 2
+
+    calc.undo()
+    assert calc.get_history() == []
+
+
+def test_calculator_notifies_undo_redo_and_clear():
+    from app.observers import HistoryEventObserver
+
+    events = []
+
+    class EventObserver(HistoryEventObserver):
+        def on_history_events(self, batch, history):
+            events.append(([e.kind for e in batch], len(history)))
+
+    calc = Calculator()
+    calc._observers = [EventObserver()]
+    calc.perform_batch("add", ["1", "2"], ["1", "1"])
+    calc.undo()
+    calc.redo()
+    calc.clear_history()
+    assert events == [(["append"], 2), (["undo"], 0), (["redo"], 2), (["clear"], 0)]
+
+
+def test_calculator_perform_batch_legacy_observer():
+    calls = []
+
+    class DummyObserver:
+        def update(self, calculation, history):
+            calls.append(calculation)
+
+    calc = Calculator()
+    calc._observers = [DummyObserver()]
+    calc.perform_batch("multiply", [2, 3], [4, 5])
+    assert [c.result for c in calls] == [Decimal("8"), Decimal("15")]
+
+
+def test_calculator_perform_batch_unknown_operation():
+    calc = Calculator()
+    with pytest.raises(OperationError):
+        calc.perform_batch("unknown", [1], [1])
+
+
+def test_calculator_calculate_is_stateless():
+    from decimal import localcontext
+
+    calc = Calculator()
+    calc.set_operation(OperationFactory.create_operation("multiply"))
+    with localcontext() as ctx:
+        # The caller's context does not leak into calculate()
+        ctx.prec = 2
+        assert calc.calculate("divide", "1", "3") == Decimal("0." + "3" * calc._context.prec)
+    assert calc.calculate("root", 27, 3) == Decimal(3)
+    assert str(calc.operation_strategy) == "Multiplication"
+    assert [c.operation for c in calc.get_history()] == ["Division", "Root"]
+    calc.undo()
+    assert [c.operation for c in calc.get_history()] == ["Division"]
+
+    with pytest.raises(OperationError):
+        calc.calculate("unknown", 1, 1)
+    from app.exceptions import ValidationError
+    with pytest.raises(ValidationError):
+        calc.calculate("add", "x", 1)
+
+
+def test_calculator_uses_private_decimal_context(monkeypatch):
+    from dataclasses import replace
+    from decimal import getcontext, localcontext
+    from app import calculator as calculator_module
+
+    monkeypatch.setattr(
+        calculator_module,
+        "config",
+        replace(calculator_module.config, auto_save=False, precision=12),
+    )
+    third = Decimal("0." + "3" * 12)
+    with localcontext() as ctx:
+        ctx.prec = 5
+        calc = calculator_module.Calculator()
+        assert getcontext().prec == 5
+        calc.set_operation(OperationFactory.create_operation("divide"))
+        assert calc.perform_operation(1, 3) == third
+        assert calc.perform_batch("divide", [1], [3]).results == [third]
+        assert calc.evaluate("1 / 3") == third
+        assert calc.calculate("divide", 1, 3) == third
+        assert getcontext().prec == 5
+    assert calc.decimal_context.prec == 12
+
+
+def test_calculator_calculate_undo_is_bounded(monkeypatch):
+    from dataclasses import replace
+    from app import calculator as calculator_module, history as history_module
+
+    monkeypatch.setattr(
+        calculator_module,
+        "config",
+        replace(calculator_module.config, auto_save=False, history_buffer_size=16),
+    )
+    monkeypatch.setattr(
+        history_module, "config", replace(history_module.config, max_history_size=10)
+    )
+    calc = calculator_module.Calculator()
+    deliveries = []
+    calc._observers = [
+        type("Counter", (), {"update_batch": lambda self, c, h: deliveries.append(len(c))})()
+    ]
+    for i in range(1000):
+        calc.calculate("add", i, 1)
+    assert len(calc.get_history()) == 10
+    assert len(calc.history._undo_stack) == 10
+    # Buffered calculations reach the observers once per commit
+    assert sum(deliveries) == 1000 and len(deliveries) < 100
+    calc.undo()
+    assert calc.get_history()[-1].operand1 == Decimal(998)
+
+
+def test_calculator_record_calculations_after_buffered(monkeypatch):
+    from dataclasses import replace
+    from app import calculator as calculator_module
+    from app.calculation import Calculation
+
+    monkeypatch.setattr(
+        calculator_module, "config", replace(calculator_module.config, auto_save=False)
+    )
+    calc = calculator_module.Calculator()
+    calc.calculate("add", 1, 1)
+    batch = [Calculation("Multiplication", Decimal(i), Decimal(2)) for i in range(3)]
+    calc.record_calculations(batch)
+    assert [c.operation for c in calc.get_history()] == ["Addition"] + ["Multiplication"] * 3
+    calc.undo()
+    assert [c.operation for c in calc.get_history()] == ["Addition"]
+
+
+def test_calculator_calculate_from_threads(monkeypatch):
+    from dataclasses import replace
+    import threading
+    from app import calculator as calculator_module, history as history_module
+
+    monkeypatch.setattr(
+        calculator_module,
+        "config",
+        replace(calculator_module.config, auto_save=False, history_buffer_size=8),
+    )
+    monkeypatch.setattr(
+        history_module, "config", replace(history_module.config, max_history_size=0)
+    )
+    calc = calculator_module.Calculator()
+    events = []
+    calc._observers = [type("Counter", (), {"update": lambda self, c, h: events.append(c)})()]
+    threads, per_thread = 8, 300
+    barrier = threading.Barrier(threads)
+
+    def worker(index):
+        barrier.wait()
+        for i in range(per_thread):
+            calc.calculate("add", index, i)
+            if i % 100 == 0:
+                calc.get_history()
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+
+    history = calc.get_history()
+    assert len(history) == len(events) == threads * per_thread
+    for index in range(threads):
+        # Each thread's calculations appear in the order it made them
+        mine = [c.operand2 for c in history if c.operand1 == index]
+        assert mine == [Decimal(i) for i in range(per_thread)]
+    assert calc._history_buffer.pending() == 0
@@ -0,0 +1,94 @@
+from dataclasses import replace
+import io
+
+import pytest
+
+from app import calculator as calculator_module
+from app.calculator_repl import calculator_batch
+import main
+
+
+@pytest.fixture(autouse=True)
+def no_auto_save(monkeypatch):
+    monkeypatch.setattr(
+        calculator_module, "config", replace(calculator_module.config, auto_save=False)
+    )
+
+
+def test_calculator_batch_results_and_errors():
+    lines = io.StringIO("add 1 2\n\n# comment\ndivide 1 0\npower 2 10\nfoo 1 2\nadd 1\nmodulus 7 4\n")
+    out = io.StringIO()
+    status = calculator_batch(lines, out)
+    assert status == 1
+    assert out.getvalue().splitlines() == [
+        "3",
+        "Error: Division by zero is not allowed",
+        "1024",
+        "Error: Unknown operation: foo",
+        "Error: Expected '<operation> <a> <b>', got: add 1",
+        "3",
+    ]
+
+
+def test_calculator_batch_streams_in_chunks():
+    writes = []
+
+    class Recorder(io.StringIO):
+        def write(self, text):
+            writes.append(text)
+            return super().write(text)
+
+    lines = (f"multiply {i} 2\n" for i in range(10))
+    out = Recorder()
+    assert calculator_batch(lines, out, chunk_size=4) == 0
+    assert out.getvalue().splitlines() == [str(i * 2) for i in range(10)]
+    assert len([w for w in writes if w]) == 3
+
+
+def test_calculator_batch_bounds_undo_and_appends(monkeypatch):
+    from app import calculator_repl
+
+    modes = []
+    calculators = []
+
+    class AutoSave:
+        def __init__(self, mode=None):
+            modes.append(mode)
+
+        def on_history_events(self, events, history):
+            pass
+
+    class Recording(calculator_module.Calculator):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            calculators.append(self)
+
+    monkeypatch.setattr(
+        calculator_module, "config", replace(calculator_module.config, auto_save=True)
+    )
+    monkeypatch.setattr(calculator_module, "AutoSaveObserver", AutoSave)
+    monkeypatch.setattr(calculator_repl, "Calculator", Recording)
+    lines = (f"add {i} 1\n" for i in range(10))
+    assert calculator_batch(lines, io.StringIO(), chunk_size=4) == 0
+    assert modes == ["append"]
+    # Undo steps are dropped after each chunk of 4 lines
+    assert len(calculators[0].history._undo_stack) == 2
+    assert len(calculators[0].get_history()) == 10
+
+
+def test_main_batch_file(tmp_path, capsys):
+    script = tmp_path / "ops.txt"
+    script.write_text("subtract 5 3\nabs_dif 2 9\n")
+    assert main.main(["--batch", str(script)]) == 0
+    assert capsys.readouterr().out.splitlines() == ["2", "7"]
+
+
+def test_main_batch_stdin(monkeypatch, capsys):
+    monkeypatch.setattr("sys.stdin", io.StringIO("percent 25 50\n"))
+    assert main.main(["--batch", "-"]) == 0
+    assert capsys.readouterr().out == "50\n"
+
+
+def test_main_batch_missing_file(tmp_path, capsys):
+    assert main.main(["--batch", str(tmp_path / "missing.txt")]) == 2
+    assert "Error" in capsys.readouterr().err
@@ -70,4 +70,172 @@ def test_history_respects_size(monkeypatch):
     hist.add_calculation(c)
     hist.add_calculation(c)
     hist.add_calculation(c)
-    assert len(hist.get_history()) == 2
\ No newline at end of file
+    assert len(hist.get_history()) == 2
+
+def test_load_config_auto_save_mode(tmp_path, monkeypatch):
+    from app.exceptions import ConfigurationError
+
+    # Restore the environment that load_dotenv overrides
+    monkeypatch.setenv("CALCULATOR_AUTO_SAVE_MODE", "rewrite")
+    monkeypatch.setenv("CALCULATOR_AUTO_SAVE_FSYNC_INTERVAL", "100")
+    env_file = tmp_path / ".env"
+    env_file.write_text("CALCULATOR_AUTO_SAVE_MODE=APPEND\nCALCULATOR_AUTO_SAVE_FSYNC_INTERVAL=7\n")
+    cfg = load_config(env_file)
+    assert cfg.auto_save_mode == "append"
+    assert cfg.auto_save_fsync_interval == 7
+
+    env_file.write_text("CALCULATOR_AUTO_SAVE_MODE=sometimes\n")
+    with pytest.raises(ConfigurationError):
+        load_config(env_file)
+
+
+def test_load_config_async_observers(tmp_path, monkeypatch):
+    from app.exceptions import ConfigurationError
+
+    for key, value in [
+        ("CALCULATOR_ASYNC_OBSERVERS", "false"),
+        ("CALCULATOR_OBSERVER_QUEUE_SIZE", "1000"),
+        ("CALCULATOR_OBSERVER_BACKPRESSURE", "block"),
+    ]:
+        monkeypatch.setenv(key, value)
+    env_file = tmp_path / ".env"
+    env_file.write_text(
+        "CALCULATOR_ASYNC_OBSERVERS=true\n"
+        "CALCULATOR_OBSERVER_QUEUE_SIZE=8\n"
+        "CALCULATOR_OBSERVER_BACKPRESSURE=Coalesce\n"
+    )
+    cfg = load_config(env_file)
+    assert cfg.async_observers is True
+    assert cfg.observer_queue_size == 8
+    assert cfg.observer_backpressure == "coalesce"
+
+    env_file.write_text("CALCULATOR_OBSERVER_BACKPRESSURE=panic\n")
+    with pytest.raises(ConfigurationError):
+        load_config(env_file)
+
+
+def test_load_config_history_backend(tmp_path, monkeypatch):
+    from app.exceptions import ConfigurationError
+
+    monkeypatch.setenv("CALCULATOR_HISTORY_BACKEND", "deque")
+    env_file = tmp_path / ".env"
+    env_file.write_text("CALCULATOR_HISTORY_BACKEND=Columnar\n")
+    assert load_config(env_file).history_backend == "columnar"
+
+    env_file.write_text("CALCULATOR_HISTORY_BACKEND=tape\n")
+    with pytest.raises(ConfigurationError):
+        load_config(env_file)
+
+
+def test_load_config_sqlite_history(tmp_path, monkeypatch):
+    for key, value in {
+        "CALCULATOR_SQLITE_HISTORY": "false",
+        "CALCULATOR_HISTORY_DB": "history.db",
+        "CALCULATOR_HISTORY_DB_BATCH_SIZE": "100",
+        "CALCULATOR_HISTORY_DIR": "history",
+    }.items():
+        monkeypatch.setenv(key, value)
+    env_file = tmp_path / ".env"
+    env_file.write_text(
+        "CALCULATOR_SQLITE_HISTORY=true\n"
+        "CALCULATOR_HISTORY_DB=audit.db\n"
+        "CALCULATOR_HISTORY_DB_BATCH_SIZE=10\n"
+    )
+    cfg = load_config(env_file)
+    assert cfg.sqlite_history is True
+    assert cfg.history_db == Path("history") / "audit.db"
+    assert cfg.history_db_batch_size == 10
+
+
+def test_load_config_operation_cache_size(tmp_path, monkeypatch):
+    from app.exceptions import ConfigurationError
+
+    monkeypatch.setenv("CALCULATOR_OPERATION_CACHE_SIZE", "0")
+    env_file = tmp_path / ".env"
+    env_file.write_text("CALCULATOR_OPERATION_CACHE_SIZE=512\n")
+    assert load_config(env_file).operation_cache_size == 512
+
+    env_file.write_text("CALCULATOR_OPERATION_CACHE_SIZE=-1\n")
+    with pytest.raises(ConfigurationError):
+        load_config(env_file)
+
+
+def test_load_config_parse_cache_size(tmp_path, monkeypatch):
+    from app.exceptions import ConfigurationError
+
+    monkeypatch.setenv("CALCULATOR_PARSE_CACHE_SIZE", "0")
+    env_file = tmp_path / ".env"
+    env_file.write_text("CALCULATOR_PARSE_CACHE_SIZE=256\n")
+    assert load_config(env_file).parse_cache_size == 256
+
+    env_file.write_text("CALCULATOR_PARSE_CACHE_SIZE=-5\n")
+    with pytest.raises(ConfigurationError):
+        load_config(env_file)
+
+
+def test_load_config_parallel(tmp_path, monkeypatch):
+    from app.exceptions import ConfigurationError
+
+    monkeypatch.setenv("CALCULATOR_PARALLEL_WORKERS", "0")
+    monkeypatch.setenv("CALCULATOR_PARALLEL_CHUNK_SIZE", "1000")
+    env_file = tmp_path / ".env"
+    env_file.write_text("CALCULATOR_PARALLEL_WORKERS=4\nCALCULATOR_PARALLEL_CHUNK_SIZE=50\n")
+    cfg = load_config(env_file)
+    assert (cfg.parallel_workers, cfg.parallel_chunk_size) == (4, 50)
+
+    env_file.write_text("CALCULATOR_PARALLEL_CHUNK_SIZE=0\n")
+    with pytest.raises(ConfigurationError):
+        load_config(env_file)
+
+
+def test_load_config_expression_cache_size(tmp_path, monkeypatch):
+    from app.exceptions import ConfigurationError
+
+    monkeypatch.setenv("CALCULATOR_EXPRESSION_CACHE_SIZE", "256")
+    env_file = tmp_path / ".env"
+    env_file.write_text("CALCULATOR_EXPRESSION_CACHE_SIZE=0\n")
+    assert load_config(env_file).expression_cache_size == 0
+
+    env_file.write_text("CALCULATOR_EXPRESSION_CACHE_SIZE=-1\n")
+    with pytest.raises(ConfigurationError):
+        load_config(env_file)
+
+
+def test_load_config_stage_timing(tmp_path, monkeypatch):
+    monkeypatch.setenv("CALCULATOR_STAGE_TIMING", "false")
+    env_file = tmp_path / ".env"
+    env_file.write_text("CALCULATOR_STAGE_TIMING=TRUE\n")
+    assert load_config(env_file).stage_timing is True
+
+
+def test_load_config_metrics(tmp_path, monkeypatch):
+    from app.exceptions import ConfigurationError
+
+    for name in ("CALCULATOR_METRICS", "CALCULATOR_METRICS_FILE", "CALCULATOR_METRICS_INTERVAL"):
+        monkeypatch.setenv(name, "")
+    env_file = tmp_path / ".env"
+    env_file.write_text(
+        "CALCULATOR_LOG_DIR=var\nCALCULATOR_METRICS=true\n"
+        "CALCULATOR_METRICS_FILE=calc.prom\nCALCULATOR_METRICS_INTERVAL=2.5\n"
+    )
+    cfg = load_config(env_file)
+    assert cfg.metrics is True
+    assert cfg.metrics_file == Path("var") / "calc.prom"
+    assert cfg.metrics_interval == 2.5
+
+    env_file.write_text("CALCULATOR_METRICS_INTERVAL=-1\n")
+    with pytest.raises(ConfigurationError):
+        load_config(env_file)
+
+
+def test_load_config_history_buffer_size(tmp_path, monkeypatch):
+    from app.exceptions import ConfigurationError
+
+    monkeypatch.setenv("CALCULATOR_HISTORY_BUFFER_SIZE", "")
+    env_file = tmp_path / ".env"
+    env_file.write_text("CALCULATOR_HISTORY_BUFFER_SIZE=8\n")
+    assert load_config(env_file).history_buffer_size == 8
+
+    env_file.write_text("CALCULATOR_HISTORY_BUFFER_SIZE=0\n")
+    with pytest.raises(ConfigurationError):
+        load_config(env_file)
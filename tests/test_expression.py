@@ -0,0 +1,133 @@
+from dataclasses import replace
+from decimal import Decimal
+import re
+
+import pytest
+
+from app import calculator as calculator_module
+from app import expression as expression_module
+from app.calculator import Calculator
+from app.calculator_repl import parse_variables
+from app.exceptions import OperationError, ValidationError
+from app.expression import CompiledExpression, compile_expression, tokenize
+
+
+@pytest.fixture(autouse=True)
+def no_auto_save(monkeypatch):
+    monkeypatch.setattr(
+        calculator_module, "config", replace(calculator_module.config, auto_save=False)
+    )
+
+
+@pytest.mark.parametrize(
+    "source,expected",
+    [
+        ("1 + 2 * 3", "7"),
+        ("(1 + 2) * 3", "9"),
+        ("10 - 4 - 3", "3"),
+        ("2 ^ 3 ^ 2", "512"),
+        ("-2 ^ 2", "-4"),
+        ("2 * -3", "-6"),
+        ("-(1 + 2)", "-3"),
+        ("+4", "4"),
+        ("7 // 2 % 3", "0"),
+        ("9 / 4", "2.25"),
+        ("root(27, 3) + abs_dif(2, 5)", "6"),
+        ("percent(1, 8)", "12.5"),
+        ("1.5e2 - .5", "149.5"),
+        ("42", "42"),
+    ],
+)
+def test_expression_results(source, expected):
+    result, _ = CompiledExpression(source).evaluate()
+    assert result == Decimal(expected)
+
+
+def test_expression_variables_and_steps():
+    plan = CompiledExpression("(a + b) * c / d")
+    assert plan.variables == {"a", "b", "c", "d"}
+    values = {name: Decimal(v) for name, v in zip("abcd", ["1", "2", "3", "4"])}
+    result, steps = plan.evaluate(values)
+    assert result == Decimal("2.25")
+    assert [(s.operation, s.operand1, s.operand2, s.result) for s in steps] == [
+        ("Addition", 1, 2, 3),
+        ("Multiplication", 3, 3, 9),
+        ("Division", 9, 4, Decimal("2.25")),
+    ]
+    assert len({s.timestamp for s in steps}) == 1
+
+    result, steps = CompiledExpression("-x").evaluate({"x": Decimal(5)})
+    assert result == Decimal(-5)
+    assert steps == []
+
+
+@pytest.mark.parametrize(
+    "source,message",
+    [
+        ("", "cannot be empty"),
+        ("1 +", "end of input"),
+        ("2 $ 3", "unexpected '$' at position 2"),
+        ("(1", "expected ')'"),
+        ("1 2", "expected an operator, got '2' at position 2"),
+        ("root(1)", "expected ','"),
+        ("(" * 5000 + "1" + ")" * 5000, "nested too deeply"),
+    ],
+)
+def test_expression_syntax_errors(source, message):
+    with pytest.raises(ValidationError, match=re.escape(message)):
+        CompiledExpression(source)
+
+
+def test_expression_runtime_errors():
+    with pytest.raises(OperationError, match="Unknown function: foo"):
+        CompiledExpression("foo(1, 2)")
+    with pytest.raises(ValidationError, match="Undefined variable: y"):
+        CompiledExpression("x + y").evaluate({"x": Decimal(1)})
+    with pytest.raises(ValidationError, match="Division by zero"):
+        CompiledExpression("1 / (2 - 2)").evaluate()
+
+
+def test_tokenize_positions():
+    assert tokenize(" a//2 ") == [("name", "a", 1), ("op", "//", 2), ("number", "2", 4)]
+
+
+def test_compile_expression_caches_plans(monkeypatch):
+    monkeypatch.setattr(
+        expression_module, "config", replace(expression_module.config, expression_cache_size=2)
+    )
+    monkeypatch.setattr(expression_module, "_plan_cache", None)
+    plan = compile_expression("a + 1")
+    assert compile_expression("a + 1") is plan
+    assert expression_module._plan_cache.stats().hits == 1
+
+    monkeypatch.setattr(
+        expression_module, "config", replace(expression_module.config, expression_cache_size=0)
+    )
+    assert compile_expression("a + 1") is not compile_expression("a + 1")
+
+
+def test_calculator_evaluate_records_one_undo_step():
+    calc = Calculator()
+    calc.clear_history()
+    assert calc.evaluate("(a + b) * c", a="1", b=2, c=Decimal("1.5")) == Decimal("4.5")
+    assert [c.operation for c in calc.get_history()] == ["Addition", "Multiplication"]
+    calc.undo()
+    assert calc.get_history() == []
+
+    with pytest.raises(ValidationError):
+        calc.evaluate("a * 2", a="abc")
+    with pytest.raises(ValidationError):
+        calc.evaluate("1 / 0")
+    assert calc.get_history() == []
+    calc.close()
+
+
+def test_parse_variables():
+    assert parse_variables("") == {}
+    assert parse_variables("a=1, b = 2.5,") == {"a": "1", "b": "2.5"}
+    with pytest.raises(ValidationError):
+        parse_variables("a")
+    with pytest.raises(ValidationError):
+        parse_variables("1a=2")
+    with pytest.raises(ValidationError):
+        parse_variables("a=")
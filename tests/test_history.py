@@ -49,4 +49,248 @@ def test_history_undo_error():
 def test_history_redo_error():
     hist = History()
     with pytest.raises(IndexError):
-        hist.redo()
\ No newline at end of file
+        hist.redo()
+
+def test_history_add_calculations_single_undo_step():
+    hist = History()
+    calcs = [Calculation("Addition", Decimal(i), Decimal(1)) for i in range(3)]
+    hist.add_calculations(calcs)
+    hist.add_calculations([])
+    assert len(hist.get_history()) == 3
+    hist.undo()
+    assert hist.get_history() == []
+    hist.redo()
+    assert len(hist.get_history()) == 3
+
+
+def test_history_undo_redo_matches_snapshots(monkeypatch):
+    import random
+    from dataclasses import replace
+    from app import history as history_module
+
+    monkeypatch.setattr(
+        history_module, "config", replace(history_module.config, max_history_size=4)
+    )
+    rng = random.Random(0)
+    hist = History()
+    states = [[]]  # snapshots reachable through undo
+    position = 0
+    for step in range(300):
+        action = rng.choice(["add", "batch", "undo", "redo"])
+        if action == "add":
+            new = [Calculation("Addition", Decimal(step), Decimal(1))]
+            hist.add_calculation(new[0])
+        elif action == "batch":
+            new = [Calculation("Addition", Decimal(step), Decimal(i)) for i in range(rng.randint(1, 6))]
+            hist.add_calculations(new)
+        elif action == "undo" and position > 0:
+            hist.undo()
+            position -= 1
+            assert hist.get_history() == states[position]
+            continue
+        elif action == "redo" and position < len(states) - 1:
+            hist.redo()
+            position += 1
+            assert hist.get_history() == states[position]
+            continue
+        else:
+            continue
+        assert hist.get_history() == (states[position] + new)[-4:]
+        del states[position + 1 :]
+        states.append(hist.get_history())
+        position += 1
+        if position > 4:
+            # Only the newest maxlen steps can be undone
+            del states[0]
+            position -= 1
+        assert len(hist._undo_stack) == position
+
+
+def test_history_ring_buffer_evicts_and_undo_restores(monkeypatch):
+    from dataclasses import replace
+    from app import history as history_module
+
+    monkeypatch.setattr(
+        history_module, "config", replace(history_module.config, max_history_size=2)
+    )
+    hist = History()
+    calcs = [Calculation("Addition", Decimal(i), Decimal(0)) for i in range(3)]
+    for c in calcs:
+        hist.add_calculation(c)
+    assert hist.get_history() == calcs[1:]
+    hist.undo()
+    assert hist.get_history() == calcs[:2]
+    hist.redo()
+    assert hist.get_history() == calcs[1:]
+
+
+def test_history_unbounded_when_size_zero(monkeypatch):
+    from dataclasses import replace
+    from app import history as history_module
+
+    monkeypatch.setattr(
+        history_module, "config", replace(history_module.config, max_history_size=0)
+    )
+    hist = History()
+    hist.add_calculations([Calculation("Addition", Decimal(i), Decimal(0)) for i in range(250)])
+    assert len(hist.get_history()) == 250
+
+
+def test_history_view_is_live_and_read_only():
+    hist = History()
+    view = hist.view()
+    calcs = [Calculation("Addition", Decimal(i), Decimal(0)) for i in range(5)]
+    hist.add_calculations(calcs)
+    assert len(view) == 5
+    assert view[0] == calcs[0] and view[-1] == calcs[-1]
+    assert view[1:3] == calcs[1:3]
+    assert view[::2] == calcs[::2]
+    assert list(reversed(view)) == calcs[::-1]
+    assert calcs[2] in view
+    assert "HistoryView" in repr(view)
+    with pytest.raises(TypeError):
+        view[0] = calcs[1]
+
+
+def _kinds(events):
+    return [(e.kind, [c.operand1 for c in e.calculations], [c.operand1 for c in e.restored])
+            for e in events]
+
+
+def test_history_emits_change_events(monkeypatch, tmp_path):
+    from dataclasses import replace
+    from app import history as history_module
+
+    monkeypatch.setattr(
+        history_module, "config", replace(history_module.config, max_history_size=3)
+    )
+    hist = History()
+    received = []
+
+    def listener(events):
+        received.append(_kinds(events))
+
+    hist.subscribe(listener)
+    hist.subscribe(listener)
+
+    hist.add_calculations([Calculation("Addition", Decimal(i), Decimal(0)) for i in range(2)])
+    hist.add_calculations([Calculation("Addition", Decimal(i), Decimal(0)) for i in range(2, 4)])
+    hist.undo()
+    hist.redo()
+    hist.clear()
+    assert received == [
+        [("append", [0, 1], [])],
+        [("append", [2, 3], []), ("evict", [0], [])],
+        [("undo", [2, 3], [0])],
+        [("redo", [2, 3], []), ("evict", [0], [])],
+        [("clear", [], [])],
+    ]
+
+    received.clear()
+    path = tmp_path / "hist.csv"
+    _write_history_csv(path, [(i, 1, None) for i in range(5)])
+    hist.load_from_csv(path)
+    assert received == [[("load", [2, 3, 4], [])]]
+
+    hist.unsubscribe(listener)
+    hist.add_calculation(Calculation("Addition", Decimal(9), Decimal(0)))
+    assert len(received) == 1
+
+
+def test_history_oversized_batch_memento_is_bounded(monkeypatch):
+    from dataclasses import replace
+    from app import history as history_module
+
+    monkeypatch.setattr(
+        history_module, "config", replace(history_module.config, max_history_size=3)
+    )
+    hist = History()
+    received = []
+    hist.subscribe(lambda events: received.append(_kinds(events)))
+    hist.add_calculations([Calculation("Addition", Decimal(i), Decimal(0)) for i in range(2)])
+    hist.add_calculations([Calculation("Addition", Decimal(i), Decimal(0)) for i in range(2, 1002)])
+
+    memento = hist._undo_stack[-1]
+    assert [int(c.operand1) for c in memento.added] == [999, 1000, 1001]
+    assert [int(c.operand1) for c in memento.evicted] == [0, 1]
+    # Observers still see every appended and evicted entry
+    (_, appended, _), (_, evicted, _) = received[-1]
+    assert len(appended) == 1000 and len(evicted) == 999
+
+    hist.undo()
+    assert [int(c.operand1) for c in hist.get_history()] == [0, 1]
+    hist.redo()
+    assert [int(c.operand1) for c in hist.get_history()] == [999, 1000, 1001]
+
+
+def _write_history_csv(path, rows, header="operation,operand1,operand2,result,timestamp"):
+    lines = [header] + [
+        f"Addition,{a},{b},{a + b if result is None else result},2024-01-01T00:00:{a % 60:02d}"
+        for a, b, result in rows
+    ]
+    path.write_text("\n".join(lines) + "\n")
+
+
+def test_load_from_csv_streams_tail(tmp_path, monkeypatch):
+    from dataclasses import replace
+    from app import history as history_module
+
+    monkeypatch.setattr(
+        history_module, "config", replace(history_module.config, max_history_size=3)
+    )
+    monkeypatch.setattr(history_module, "LOAD_CHUNK_SIZE", 2)
+    path = tmp_path / "big.csv"
+    _write_history_csv(path, [(i, 1, None) for i in range(1000)])
+
+    hist = History()
+    view = hist.view()
+    hist.add_calculation(Calculation("Addition", Decimal("1"), Decimal("1")))
+    hist.load_from_csv(path)
+    assert [c.operand1 for c in view] == [Decimal(997), Decimal(998), Decimal(999)]
+    assert view[-1].result == Decimal(1000)
+    assert view[-1].timestamp.second == 999 % 60
+    with pytest.raises(IndexError):
+        hist.undo()
+
+
+def test_load_from_csv_verification_sampling(tmp_path):
+    path = tmp_path / "corrupt.csv"
+    _write_history_csv(path, [(1, 1, 99), (2, 2, None), (3, 3, 99)])
+
+    hist = History()
+    hist.load_from_csv(path, verify_every=0)
+    assert [c.result for c in hist.get_history()] == [Decimal(99), Decimal(4), Decimal(99)]
+
+    hist.load_from_csv(path, verify_every=2)
+    assert [c.result for c in hist.get_history()] == [Decimal(2), Decimal(4), Decimal(6)]
+
+
+def test_load_from_csv_empty_and_malformed(tmp_path):
+    hist = History()
+    empty = tmp_path / "empty.csv"
+    empty.write_text("")
+    hist.load_from_csv(empty)
+    assert hist.get_history() == []
+
+    # Written by earlier auto-saves of an empty history
+    blank_header = tmp_path / "blank_header.csv"
+    blank_header.write_text("\n")
+    hist.load_from_csv(blank_header)
+    assert hist.get_history() == []
+
+    missing_column = tmp_path / "missing_column.csv"
+    missing_column.write_text("operation,operand1\nAddition,1\n")
+    with pytest.raises(DataError):
+        hist.load_from_csv(missing_column)
+
+    ragged = tmp_path / "ragged.csv"
+    _write_history_csv(ragged, [(1, 1, None)])
+    with open(ragged, "a") as fh:
+        fh.write("Addition,1\n")
+    with pytest.raises(DataError):
+        hist.load_from_csv(ragged)
+
+    bad_number = tmp_path / "bad_number.csv"
+    _write_history_csv(bad_number, [(1, 1, "x")])
+    with pytest.raises(DataError):
+        hist.load_from_csv(bad_number)
@@ -0,0 +1,212 @@
+from dataclasses import replace
+import datetime
+from decimal import Decimal
+import struct
+
+import pytest
+
+from app.calculation import Calculation
+from app.calculator import Calculator
+from app.exceptions import DataError
+from app.operations import OperationFactory
+from app import history as history_module
+from app.history import History
+from app.history_binary import (
+    HEADER,
+    BinaryHistoryFile,
+    binary_to_csv,
+    csv_to_binary,
+    main,
+    write_binary_history,
+)
+
+
+def _calc(i, operation="Addition", timestamp=None):
+    return Calculation.from_result(
+        operation,
+        Decimal(i),
+        Decimal("0.25"),
+        Decimal(i) + Decimal("0.25"),
+        timestamp or datetime.datetime(2024, 1, 1) + datetime.timedelta(seconds=i),
+    )
+
+
+def _key(calc):
+    return (calc.operation, str(calc.operand1), str(calc.operand2), str(calc.result), calc.timestamp)
+
+
+def _rows(calcs):
+    return [
+        (c.operation, str(c.operand1), str(c.operand2), str(c.result), c.timestamp.isoformat())
+        for c in calcs
+    ]
+
+
+def test_binary_round_trip_preserves_entries(tmp_path):
+    aware = datetime.datetime(2024, 5, 1, 12, 30, tzinfo=datetime.timezone(datetime.timedelta(hours=-5)))
+    calcs = [
+        _calc(1),
+        _calc(2, "Division", aware),
+        _calc(3, "Power"),
+        Calculation.from_result("Multiplication", Decimal("1E+30"), Decimal("-0"), Decimal("-0E+30"),
+                                datetime.datetime(1969, 12, 31, 23, 59, 59, 999999)),
+    ]
+    path = tmp_path / "history.chist"
+    assert write_binary_history(path, _rows(calcs)) == 4
+
+    with BinaryHistoryFile(path) as history_file:
+        assert len(history_file) == 4
+        assert [_key(c) for c in history_file] == [_key(c) for c in calcs]
+        assert history_file[1].timestamp == aware
+        assert history_file[1].timestamp.utcoffset() == aware.utcoffset()
+        assert _key(history_file[-1]) == _key(calcs[-1])
+        assert list(history_file.iter_rows()) == _rows(calcs)
+
+
+def test_binary_indexing_slicing_and_tail(tmp_path):
+    calcs = [_calc(i) for i in range(10)]
+    path = tmp_path / "history.chist"
+    write_binary_history(path, _rows(calcs))
+
+    with BinaryHistoryFile(path) as history_file:
+        assert [_key(c) for c in history_file[2:8:3]] == [_key(c) for c in calcs[2:8:3]]
+        assert [_key(c) for c in history_file.tail(3)] == [_key(c) for c in calcs[-3:]]
+        assert len(history_file.tail(50)) == 10
+        with pytest.raises(IndexError):
+            history_file[10]
+        with pytest.raises(IndexError):
+            history_file[-11]
+
+
+def test_binary_empty_file(tmp_path):
+    path = tmp_path / "empty.chist"
+    assert write_binary_history(path, []) == 0
+    with BinaryHistoryFile(path) as history_file:
+        assert len(history_file) == 0
+        assert history_file.tail(5) == []
+
+
+def test_binary_rejects_bad_files(tmp_path):
+    with pytest.raises(DataError, match="File not found"):
+        BinaryHistoryFile(tmp_path / "missing.chist")
+
+    bad_magic = tmp_path / "magic.chist"
+    bad_magic.write_bytes(b"NOTAHIST" + bytes(HEADER.size))
+    with pytest.raises(DataError, match="Not a binary history file"):
+        BinaryHistoryFile(bad_magic)
+
+    path = tmp_path / "history.chist"
+    write_binary_history(path, _rows([_calc(i) for i in range(5)]))
+    data = bytearray(path.read_bytes())
+
+    bad_version = tmp_path / "version.chist"
+    struct.pack_into("<H", data, 8, 99)
+    bad_version.write_bytes(bytes(data))
+    with pytest.raises(DataError, match="Unsupported binary history version"):
+        BinaryHistoryFile(bad_version)
+
+    truncated = tmp_path / "truncated.chist"
+    truncated.write_bytes(path.read_bytes()[:-10])
+    with pytest.raises(DataError, match="Truncated"):
+        BinaryHistoryFile(truncated)
+
+    short = tmp_path / "short.chist"
+    short.write_bytes(b"CALCHIST")
+    with pytest.raises(DataError, match="Corrupt"):
+        BinaryHistoryFile(short)
+
+    empty = tmp_path / "empty.chist"
+    empty.write_bytes(b"")
+    with pytest.raises(DataError):
+        BinaryHistoryFile(empty)
+
+
+def test_write_binary_history_rejects_bad_rows(tmp_path):
+    path = tmp_path / "history.chist"
+    with pytest.raises(DataError):
+        write_binary_history(path, [("Addition", "1", "2", "3", "not a timestamp")])
+    assert not path.exists()
+    assert not (tmp_path / "history.chist.tmp").exists()
+
+
+def test_csv_binary_conversion_round_trip(tmp_path):
+    history = History()
+    history.add_calculations([_calc(i) for i in range(6)])
+    csv_path = tmp_path / "history.csv"
+    history.save_to_csv(csv_path)
+
+    binary_path = tmp_path / "history.chist"
+    assert csv_to_binary(csv_path, binary_path) == 6
+    back_path = tmp_path / "out" / "history.csv"
+    assert binary_to_csv(binary_path, back_path) == 6
+    assert back_path.read_text() == csv_path.read_text()
+
+
+def test_csv_to_binary_errors(tmp_path):
+    with pytest.raises(DataError, match="File not found"):
+        csv_to_binary(tmp_path / "missing.csv", tmp_path / "out.chist")
+
+    missing_column = tmp_path / "columns.csv"
+    missing_column.write_text("operation,operand1\nAddition,1\n")
+    with pytest.raises(DataError, match="Missing history column"):
+        csv_to_binary(missing_column, tmp_path / "out.chist")
+
+    short_row = tmp_path / "short.csv"
+    short_row.write_text("operation,operand1,operand2,result,timestamp\nAddition,1\n")
+    with pytest.raises(DataError, match="Malformed"):
+        csv_to_binary(short_row, tmp_path / "out.chist")
+    assert not (tmp_path / "out.chist.tmp").exists()
+    assert not (tmp_path / "out.chist").exists()
+
+
+def test_main_converts_files(tmp_path, capsys):
+    history = History()
+    history.add_calculations([_calc(i) for i in range(3)])
+    csv_path = tmp_path / "history.csv"
+    history.save_to_csv(csv_path)
+    binary_path = tmp_path / "history.chist"
+
+    assert main(["to-binary", str(csv_path), str(binary_path)]) == 0
+    assert "Converted 3 records" in capsys.readouterr().out
+    assert main(["to-csv", str(binary_path), str(tmp_path / "copy.csv")]) == 0
+    assert main(["to-csv", str(tmp_path / "missing.chist"), str(tmp_path / "x.csv")]) == 1
+    assert "Error: File not found" in capsys.readouterr().out
+
+
+def test_history_load_from_binary_keeps_tail(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        history_module, "config", replace(history_module.config, max_history_size=5)
+    )
+    path = tmp_path / "history.chist"
+    calcs = [_calc(i) for i in range(20)]
+    write_binary_history(path, _rows(calcs))
+
+    history = History()
+    history.add_calculation(_calc(99))
+    history.load_from_binary(path, verify_every=1)
+    assert [_key(c) for c in history.get_history()] == [_key(c) for c in calcs[-5:]]
+    with pytest.raises(IndexError):
+        history.undo()
+
+
+def test_history_load_from_binary_fixes_wrong_results(tmp_path):
+    path = tmp_path / "history.chist"
+    write_binary_history(path, [("Addition", "1", "2", "4", "2024-01-01T00:00:00")])
+    history = History()
+    history.load_from_binary(path, verify_every=1)
+    assert history.get_history()[0].result == Decimal("3")
+
+
+def test_calculator_save_and_load_binary_history(tmp_path):
+    calc = Calculator()
+    calc.clear_history()
+    calc.set_operation(OperationFactory.create_operation("add"))
+    calc.perform_operation(2, 3)
+    calc.perform_operation(4, 5)
+    path = tmp_path / "saved.chist"
+    calc.save_history(path)
+    assert path.read_bytes().startswith(b"CALCHIST")
+
+    calc.clear_history()
+    calc.load_history(path)
+    assert [c.result for c in calc.get_history()] == [Decimal("5"), Decimal("9")]
@@ -0,0 +1,41 @@
+import threading
+
+from app.history_buffer import HistoryBuffer
+
+
+def test_history_buffer_commits_in_call_order():
+    committed = []
+    buffer = HistoryBuffer(committed.extend, threading.RLock(), buffer_size=3)
+    buffer.record("a")
+    buffer.record("b")
+    assert committed == [] and buffer.pending() == 2
+
+    other = threading.Thread(target=lambda: [buffer.record(x) for x in ("c", "d")])
+    other.start()
+    other.join()
+    buffer.record("e")  # fills this thread's buffer and drains both
+    assert committed == ["a", "b", "c", "d", "e"]
+    assert buffer.pending() == 0
+    # The exited thread's buffer is forgotten
+    assert len(buffer._buffers) == 1
+
+
+def test_history_buffer_orders_concurrent_drains():
+    committed = []
+    buffer = HistoryBuffer(committed.extend, threading.RLock(), buffer_size=5)
+    sequence = iter(range(10**9))
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(2_000):
+            # Take the value and record it atomically so values follow call order
+            with lock:
+                buffer.record(next(sequence))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    buffer.drain()
+    assert committed == list(range(8_000))
@@ -0,0 +1,136 @@
+from collections import deque
+import datetime
+from decimal import Decimal
+import random
+
+import pytest
+
+from app.calculation import Calculation
+from app.exceptions import ConfigurationError
+from app.history import History
+from app.history_columnar import ColumnarStore
+
+
+def _calc(i, operation="Addition"):
+    return Calculation.from_result(
+        operation,
+        Decimal(i),
+        Decimal("0.5"),
+        Decimal(i) + Decimal("0.5"),
+        datetime.datetime(2024, 1, 1) + datetime.timedelta(microseconds=i),
+    )
+
+
+def _key(calc):
+    return (calc.operation, str(calc.operand1), str(calc.operand2), str(calc.result), calc.timestamp)
+
+
+@pytest.mark.parametrize("maxlen", [None, 5, 40])
+def test_columnar_store_matches_deque(maxlen):
+    rng = random.Random(maxlen)
+    store = ColumnarStore(maxlen=maxlen)
+    reference = deque(maxlen=maxlen)
+    operations = ["Addition", "Division", "Power"]
+    for step in range(2000):
+        action = rng.choice(["append", "append", "appendleft", "pop", "popleft", "extend"])
+        calc = _calc(step, rng.choice(operations))
+        if action == "append":
+            store.append(calc)
+            reference.append(calc)
+        elif action == "appendleft":
+            store.appendleft(calc)
+            reference.appendleft(calc)
+        elif action == "extend":
+            batch = [_calc(step * 10 + i) for i in range(rng.randint(0, 7))]
+            store.extend(batch)
+            reference.extend(batch)
+        elif reference:
+            assert _key(getattr(store, action)()) == _key(getattr(reference, action)())
+        assert len(store) == len(reference)
+    assert [_key(c) for c in store] == [_key(c) for c in reference]
+    assert [_key(c) for c in reversed(store)] == [_key(c) for c in reversed(reference)]
+    if reference:
+        assert _key(store[0]) == _key(reference[0])
+        assert _key(store[-1]) == _key(reference[-1])
+
+
+def test_columnar_store_preserves_values():
+    aware = datetime.datetime(2024, 5, 1, 12, tzinfo=datetime.timezone.utc)
+    values = [
+        Decimal("2.50"),
+        Decimal("-0"),
+        Decimal("NaN"),
+        Decimal("-Infinity"),
+        Decimal("123456789012345678901234567890"),
+        Decimal("-1E-30"),
+        Decimal("0.3333333333333333"),
+    ]
+    store = ColumnarStore([
+        Calculation.from_result("Division", value, value, value, aware if i % 2 else datetime.datetime(1960, 1, 1))
+        for i, value in enumerate(values)
+    ])
+    for i, (calc, value) in enumerate(zip(store, values)):
+        assert str(calc.operand1) == str(value)
+        assert str(calc.result) == str(value)
+        assert calc.timestamp == (aware if i % 2 else datetime.datetime(1960, 1, 1))
+    rows = list(store.iter_rows())
+    assert rows[0] == ("Division", "2.50", "2.50", "2.50", "1960-01-01T00:00:00")
+    assert rows[1][4] == aware.isoformat()
+
+
+def test_columnar_store_edges():
+    store = ColumnarStore(maxlen=0)
+    store.append(_calc(1))
+    store.appendleft(_calc(2))
+    assert len(store) == 0
+    with pytest.raises(IndexError):
+        store.pop()
+    with pytest.raises(IndexError):
+        store.popleft()
+    with pytest.raises(IndexError):
+        store[0]
+
+    store = ColumnarStore([_calc(i) for i in range(3)], maxlen=3)
+    store.extendleft([_calc(9)])
+    assert [c.operand1 for c in store] == [Decimal(9), Decimal(0), Decimal(1)]
+    store.clear()
+    assert list(store) == []
+
+
+def test_columnar_store_reuses_overflow_slots():
+    # With an odd maxlen every slot alternates between NaN and a number
+    store = ColumnarStore(maxlen=3)
+    for i in range(100):
+        value = Decimal("NaN") if i % 2 else Decimal(i)
+        store.append(Calculation.from_result("Addition", value, value, value))
+    assert [str(c.operand1) for c in store] == ["NaN", "98", "NaN"]
+    assert len(store._operand1.overflow) == 2
+
+
+def test_history_columnar_backend(tmp_path, monkeypatch):
+    from dataclasses import replace
+    from app import history as history_module
+
+    monkeypatch.setattr(
+        history_module, "config", replace(history_module.config, max_history_size=3)
+    )
+    hist = History(backend="columnar")
+    calcs = [Calculation("Addition", Decimal(i), Decimal(1)) for i in range(4)]
+    for calc in calcs:
+        hist.add_calculation(calc)
+    assert hist.get_history() == calcs[1:]
+    hist.undo()
+    assert hist.get_history() == calcs[:3]
+    hist.redo()
+    assert [c.operand1 for c in hist.view()] == [Decimal(1), Decimal(2), Decimal(3)]
+
+    path = tmp_path / "hist.csv"
+    hist.save_to_csv(path)
+    loaded = History(backend="columnar")
+    loaded.load_from_csv(path, verify_every=1)
+    assert list(loaded.iter_rows()) == list(hist.iter_rows())
+
+
+def test_history_unknown_backend():
+    with pytest.raises(ConfigurationError):
+        History(backend="tape")
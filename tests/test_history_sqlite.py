@@ -0,0 +1,188 @@
+from dataclasses import replace
+import datetime
+from decimal import Decimal
+import sqlite3
+
+import pytest
+
+from app import calculator as calculator_module
+from app.calculation import Calculation
+from app.calculator import Calculator
+from app.calculator_repl import parse_query_filters
+from app.exceptions import DataError, ValidationError
+from app.history import History
+from app.history_sqlite import SQLiteHistoryStore
+from app.observers import SQLiteHistoryObserver
+from app.operations import OperationFactory
+
+
+def _calc(i, operation="Addition", result=None, timestamp=None):
+    return Calculation.from_result(
+        operation,
+        Decimal(i),
+        Decimal("1"),
+        Decimal(i) + 1 if result is None else Decimal(result),
+        timestamp or datetime.datetime(2024, 1, 1) + datetime.timedelta(days=i),
+    )
+
+
+def _results(calcs):
+    return [str(c.result) for c in calcs]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SQLiteHistoryStore(tmp_path / "db" / "history.db")
+    yield store
+    store.close()
+
+
+def test_store_uses_wal_and_indexes(store):
+    store.add_calculations([_calc(1)])
+    connection = sqlite3.connect(store.db_file)
+    try:
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        indexes = {row[1] for row in connection.execute("PRAGMA index_list(calculations)")}
+        plan = " ".join(
+            str(row) for row in connection.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM calculations WHERE operation = 'Addition'"
+            )
+        )
+    finally:
+        connection.close()
+    assert {
+        "idx_calculations_operation",
+        "idx_calculations_timestamp",
+        "idx_calculations_result",
+    } <= indexes
+    assert "idx_calculations_operation" in plan
+
+
+def test_store_round_trip_and_filters(store):
+    aware = datetime.datetime(2024, 1, 3, 12, tzinfo=datetime.timezone(datetime.timedelta(hours=2)))
+    calcs = [
+        _calc(0),
+        _calc(1, "Multiplication", "0.1"),
+        _calc(2, "Addition", "1E+400", aware),
+        _calc(3, "Addition", "-7.25"),
+        _calc(4, "Division", "0.30000000000000000001"),
+    ]
+    assert store.add_calculations(calcs) == 5
+    assert store.count() == 5
+
+    everything = list(store.query())
+    assert [(c.operation, c.operand1, c.result, c.timestamp) for c in everything] == [
+        (c.operation, c.operand1, c.result, c.timestamp) for c in calcs
+    ]
+    assert everything[2].timestamp.utcoffset() == datetime.timedelta(hours=2)
+
+    assert _results(store.query(operation="Addition")) == ["1", "1E+400", "-7.25"]
+    assert _results(store.query(
+        start=datetime.datetime(2024, 1, 2), end=datetime.datetime(2024, 1, 4)
+    )) == ["0.1", "1E+400", "-7.25"]
+    assert _results(store.query(min_result=Decimal("1E+399"))) == ["1E+400"]
+    # Bounds are exact even where the REAL index cannot tell values apart
+    assert _results(store.query(
+        min_result=Decimal("0.3"), max_result=Decimal("0.3")
+    )) == []
+    assert _results(store.query(min_result=Decimal("0.3"), max_result=Decimal("1"))) == [
+        "1",
+        "0.30000000000000000001",
+    ]
+    assert _results(store.query(operation="Addition", limit=2)) == ["1", "1E+400"]
+    assert _results(store.query(limit=0)) == []
+
+
+def test_store_query_missing_database(tmp_path):
+    store = SQLiteHistoryStore(tmp_path / "missing.db")
+    assert list(store.query()) == []
+    assert not store.db_file.exists()
+
+
+def test_store_rejects_malformed_rows(store):
+    with pytest.raises(DataError):
+        store.add_rows([("Addition", "1", "1", "two", "2024-01-01T00:00:00")])
+
+
+def test_store_csv_import_export(store, tmp_path):
+    history = History()
+    history.add_calculations([_calc(i) for i in range(5)])
+    csv_path = tmp_path / "history.csv"
+    history.save_to_csv(csv_path)
+
+    assert store.import_csv(csv_path, chunk_size=2) == 5
+    out = tmp_path / "out" / "export.csv"
+    assert store.export_csv(out, min_result=Decimal("3")) == 3
+
+    loaded = History()
+    loaded.load_from_csv(out)
+    assert _results(loaded.get_history()) == ["3", "4", "5"]
+
+    with pytest.raises(DataError, match="File not found"):
+        store.import_csv(tmp_path / "missing.csv")
+    bad = tmp_path / "bad.csv"
+    bad.write_text("operation,result\nAddition,1\n")
+    with pytest.raises(DataError, match="Missing history column"):
+        store.import_csv(bad)
+
+
+def test_observer_batches_inserts(tmp_path):
+    observer = SQLiteHistoryObserver(tmp_path / "history.db", batch_size=3)
+    observer.update(_calc(0), [])
+    observer.update_batch([_calc(1)], [])
+    assert not observer.store.db_file.exists()
+    observer.update(_calc(2), [])
+    assert observer.store.count() == 3
+    observer.update(_calc(3), [])
+    observer.close()
+    assert len(list(observer.store.query())) == 4
+
+
+def test_calculator_query_history(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        calculator_module,
+        "config",
+        replace(
+            calculator_module.config,
+            auto_save=False,
+            sqlite_history=True,
+            history_db=tmp_path / "history.db",
+            history_db_batch_size=100,
+        ),
+    )
+    from app import observers as observers_module
+    monkeypatch.setattr(observers_module, "config", calculator_module.config)
+
+    calc = Calculator()
+    calc.set_operation(OperationFactory.create_operation("add"))
+    calc.perform_operation(1, 2)
+    calc.set_operation(OperationFactory.create_operation("multiply"))
+    calc.perform_operation(3, 4)
+    calc.undo()
+
+    # Pending rows are flushed before querying; undo does not remove them
+    assert _results(calc.query_history()) == ["3", "12"]
+    assert _results(calc.query_history(operation="Multiplication")) == ["12"]
+    calc.close()
+
+    other = Calculator()
+    assert _results(other.query_history(max_result=Decimal("5"))) == ["3"]
+    other.close()
+
+
+def test_parse_query_filters():
+    assert parse_query_filters() == {}
+    filters = parse_query_filters(" add ", "2024-01-01", "2024-01-31", "1.5", "")
+    assert filters == {
+        "operation": "Addition",
+        "start": datetime.datetime(2024, 1, 1),
+        "end": datetime.datetime(2024, 1, 31, 23, 59, 59, 999999),
+        "min_result": Decimal("1.5"),
+    }
+    assert parse_query_filters("Addition", end="2024-01-31T08:00")["end"] == datetime.datetime(2024, 1, 31, 8)
+    with pytest.raises(ValidationError):
+        parse_query_filters(start="yesterday")
+    with pytest.raises(ValidationError):
+        parse_query_filters(max_result="lots")
+    with pytest.raises(ValidationError):
+        parse_query_filters(min_result="NaN")
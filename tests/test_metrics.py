@@ -0,0 +1,132 @@
+from dataclasses import replace
+from decimal import Decimal
+import json
+
+import pytest
+
+from app.calculation import Calculation
+from app.exceptions import OperationError, ValidationError
+from app.metrics import MetricsRegistry, registry
+from app.observers import MetricsObserver
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    registry.reset()
+    yield
+    registry.reset()
+
+
+def test_registry_prometheus_format():
+    metrics = MetricsRegistry()
+    metrics.inc("calculator_calculations_total", operation="Addition")
+    metrics.inc("calculator_calculations_total", 2, operation="Addition")
+    metrics.inc("calculator_errors_total", kind="validation", type='Bad"Name')
+    metrics.set("calculator_history_size", 7)
+    metrics.observe("calculator_history_save_seconds", 0.003, format="csv")
+    metrics.observe("calculator_history_save_seconds", 2.5, format="csv")
+    assert metrics.value("calculator_calculations_total", operation="Addition") == 3
+
+    lines = metrics.render_prometheus().splitlines()
+    assert "# TYPE calculator_calculations_total counter" in lines
+    assert 'calculator_calculations_total{operation="Addition"} 3' in lines
+    assert 'calculator_errors_total{kind="validation",type="Bad\\"Name"} 1' in lines
+    assert "calculator_history_size 7" in lines
+    assert 'calculator_history_save_seconds_bucket{format="csv",le="0.001"} 0' in lines
+    assert 'calculator_history_save_seconds_bucket{format="csv",le="0.005"} 1' in lines
+    assert 'calculator_history_save_seconds_bucket{format="csv",le="+Inf"} 2' in lines
+    assert 'calculator_history_save_seconds_sum{format="csv"} 2.503' in lines
+    assert 'calculator_history_save_seconds_count{format="csv"} 2' in lines
+
+    data = metrics.to_dict()["metrics"]
+    assert data["calculator_history_size"] == {"type": "gauge", "series": [{"labels": {}, "value": 7}]}
+    histogram = data["calculator_history_save_seconds"]["series"][0]
+    assert histogram["count"] == 2 and histogram["buckets"]["5.0"] == 2
+
+    metrics.reset()
+    assert metrics.render_prometheus() == ""
+
+
+def test_record_error_kinds():
+    metrics = MetricsRegistry()
+    metrics.record_error(ValidationError("bad"))
+    metrics.record_error(OperationError("failed"))
+    metrics.record_error(ZeroDivisionError())
+    assert metrics.value("calculator_errors_total", kind="validation", type="ValidationError") == 1
+    assert metrics.value("calculator_errors_total", kind="operation", type="OperationError") == 1
+    assert metrics.value("calculator_errors_total", kind="operation", type="ZeroDivisionError") == 1
+
+
+def test_metrics_observer_tracks_history(tmp_path, monkeypatch):
+    from app import history as history_module
+
+    monkeypatch.setattr(
+        history_module, "config", replace(history_module.config, max_history_size=3)
+    )
+    path = tmp_path / "metrics" / "calculator.prom"
+    observer = MetricsObserver(path, interval=3600)
+    history = history_module.History()
+    history.subscribe(lambda events: observer.on_history_events(events, None))
+
+    history.add_calculations([Calculation("Addition", Decimal(i), Decimal(1)) for i in range(2)])
+    history.add_calculations([Calculation("Subtraction", Decimal(i), Decimal(1)) for i in range(2)])
+    assert registry.value("calculator_history_size") == 3
+    history.undo()
+    assert registry.value("calculator_history_size") == 2
+    history.redo()
+    history.clear()
+    assert registry.value("calculator_history_size") == 0
+    assert registry.value("calculator_calculations_total", operation="Addition") == 2
+    assert registry.value("calculator_calculations_total", operation="Subtraction") == 2
+    assert registry.value("calculator_undo_total") == 1
+    assert registry.value("calculator_redo_total") == 1
+    assert registry.value("calculator_history_clears_total") == 1
+
+    # Files are only written once the interval has passed, or on close
+    assert not path.exists()
+    observer.close()
+    assert 'calculator_calculations_total{operation="Addition"} 2' in path.read_text()
+    assert "calculator_undo_total" in json.loads(path.with_suffix(".json").read_text())["metrics"]
+    assert not path.with_name("calculator.prom.tmp").exists()
+
+
+def test_calculator_metrics(tmp_path, monkeypatch):
+    from app import calculator as calculator_module
+
+    metrics_file = tmp_path / "calculator.prom"
+    monkeypatch.setattr(
+        calculator_module,
+        "config",
+        replace(
+            calculator_module.config,
+            auto_save=False,
+            metrics=True,
+            metrics_file=metrics_file,
+            metrics_interval=0,
+        ),
+    )
+    calc = calculator_module.Calculator()
+    calc.perform_batch("divide", ["1", "x", "4"], ["2", "1", "0"])
+    assert registry.value("calculator_calculations_total", operation="Division") == 1
+    assert registry.value("calculator_errors_total", kind="validation", type="ValidationError") == 2
+    assert 'calculator_history_size 1' in metrics_file.read_text()
+
+    history_file = tmp_path / "history.csv"
+    calc.save_history(history_file)
+    calc.load_history(history_file)
+    calc.close()
+    text = metrics_file.read_text()
+    assert 'calculator_history_save_seconds_count{format="csv"} 1' in text
+    assert 'calculator_history_load_seconds_count{format="csv"} 1' in text
+
+
+def test_auto_save_counts_bytes(tmp_path):
+    from app.observers import AutoSaveObserver
+
+    path = tmp_path / "hist.csv"
+    obs = AutoSaveObserver(path, mode="append")
+    calcs = [Calculation("Addition", Decimal(i), Decimal(1)) for i in range(3)]
+    obs.update(calcs[0], calcs[:1])
+    obs.update_batch(calcs[1:], calcs)
+    obs.close()
+    assert registry.value("calculator_autosave_bytes_written_total") == path.stat().st_size
@@ -0,0 +1,209 @@
+from decimal import Decimal
+from dataclasses import replace
+import threading
+
+import pytest
+
+from app.calculation import Calculation
+from app.exceptions import ConfigurationError, OperationError
+from app.history import HistoryEvent
+from app.observer_dispatch import AsyncObserverDispatcher
+
+
+def _calc(i):
+    return Calculation("Addition", Decimal(i), Decimal("1"))
+
+
+def _append(i):
+    return [HistoryEvent("append", [_calc(i)])]
+
+
+def _operands(events):
+    return [c.operand1 for event in events for c in event.calculations]
+
+
+def _blocked_dispatcher(delivered, **kwargs):
+    """Return a dispatcher whose worker waits on the returned event."""
+    gate = threading.Event()
+
+    def deliver(events, history):
+        gate.wait(5)
+        delivered.append((_operands(events), None if history is None else len(history)))
+
+    return AsyncObserverDispatcher(deliver, **kwargs), gate
+
+
+def test_dispatcher_delivers_in_order():
+    delivered = []
+    dispatcher = AsyncObserverDispatcher(
+        lambda events, hist: delivered.extend(_operands(events)), maxsize=2
+    )
+    for i in range(50):
+        dispatcher.submit(_append(i), [])
+    assert dispatcher.flush(timeout=5)
+    assert dispatcher.pending() == 0
+    dispatcher.close()
+    assert delivered == [Decimal(i) for i in range(50)]
+
+
+def test_dispatcher_drop_policy():
+    delivered = []
+    dispatcher, gate = _blocked_dispatcher(delivered, maxsize=1, backpressure="drop")
+    dispatcher.submit(_append(0), [])
+    # Wait for the worker to pick up the first event and block on the gate
+    while dispatcher._events:
+        pass
+    dispatcher.submit(_append(1), [])
+    dispatcher.submit(_append(2), [])
+    assert dispatcher.dropped == 1
+    gate.set()
+    dispatcher.close()
+    assert [ops for ops, _ in delivered] == [[Decimal(0)], [Decimal(1)]]
+
+
+def test_dispatcher_coalesce_policy():
+    delivered = []
+    dispatcher, gate = _blocked_dispatcher(delivered, maxsize=1, backpressure="coalesce")
+    dispatcher.submit(_append(0), [0])
+    while dispatcher._events:
+        pass
+    dispatcher.submit(_append(1), [0, 1], needs_history=False)
+    dispatcher.submit(_append(2), [0, 1, 2])
+    dispatcher.submit(_append(3), [0, 1, 2, 3], needs_history=False)
+    assert dispatcher.pending() == 2
+    gate.set()
+    dispatcher.close()
+    # The merged notification carries the newest snapshot once one was asked for
+    assert delivered == [
+        ([Decimal(0)], 1),
+        ([Decimal(1), Decimal(2), Decimal(3)], 4),
+    ]
+    assert dispatcher.dropped == 0
+
+
+def test_dispatcher_skips_unneeded_snapshot():
+    delivered = []
+    dispatcher = AsyncObserverDispatcher(lambda events, hist: delivered.append(hist))
+    history = [_calc(0)]
+    dispatcher.submit(_append(0), history, needs_history=False)
+    dispatcher.submit(_append(1), history)
+    history.append(_calc(1))
+    dispatcher.close()
+    assert delivered[0] is None
+    assert delivered[1] == [_calc(0)] and delivered[1] is not history
+
+
+def test_dispatcher_closed_and_invalid_policy():
+    dispatcher = AsyncObserverDispatcher(lambda events, hist: None)
+    dispatcher.close()
+    with pytest.raises(OperationError):
+        dispatcher.submit(_append(0), [])
+    with pytest.raises(ConfigurationError):
+        AsyncObserverDispatcher(lambda events, hist: None, backpressure="later")
+
+
+def test_calculator_async_observers(monkeypatch):
+    from app import calculator as calculator_module
+    from app.operations import OperationFactory
+
+    monkeypatch.setattr(
+        calculator_module,
+        "config",
+        replace(calculator_module.config, async_observers=True, auto_save=False),
+    )
+    seen = []
+
+    class RecordingObserver:
+        def update(self, calculation, history):
+            seen.append((calculation.result, threading.current_thread().name))
+
+        def close(self):
+            seen.append("closed")
+
+    calc = calculator_module.Calculator()
+    calc._observers = [RecordingObserver()]
+    calc.set_operation(OperationFactory.create_operation("add"))
+    calc.perform_operation("1", "2")
+    calc.perform_batch("add", ["1", "2"], ["1", "1"])
+    calc.flush()
+    assert seen[0] == (Decimal("3"), "calculator-observers")
+    calc.close()
+    assert seen[-1] == "closed"
+    assert len(seen) == 4
+
+    # After closing, notifications are delivered synchronously
+    calc.perform_operation("2", "2")
+    assert seen[-1] == (Decimal("4"), threading.current_thread().name)
+
+
+def test_calculator_async_event_observer_gets_no_snapshot(monkeypatch):
+    from app import calculator as calculator_module
+    from app.observers import HistoryEventObserver
+
+    monkeypatch.setattr(
+        calculator_module,
+        "config",
+        replace(calculator_module.config, async_observers=True, auto_save=False),
+    )
+    seen = []
+
+    class EventObserver(HistoryEventObserver):
+        def on_history_events(self, events, history):
+            seen.append(([event.kind for event in events], history))
+
+    calc = calculator_module.Calculator()
+    calc._observers = [EventObserver()]
+    calc.perform_batch("add", ["1", "2"], ["1", "1"])
+    calc.undo()
+    calc.flush()
+    calc.close()
+    assert seen == [(["append"], None), (["undo"], None)]
+
+
+def test_dispatcher_drop_policy_keeps_undroppable_events():
+    delivered = []
+    dispatcher, gate = _blocked_dispatcher(delivered, maxsize=1, backpressure="drop")
+    dispatcher.submit(_append(0), [])
+    while dispatcher._events:
+        pass
+    dispatcher.submit(_append(1), [])
+    dispatcher.submit(_append(2), [], droppable=False)
+    assert dispatcher.dropped == 0
+    gate.set()
+    dispatcher.close()
+    assert [ops for ops, _ in delivered] == [[Decimal(0)], [Decimal(1), Decimal(2)]]
+
+
+def test_calculator_drop_policy_keeps_auto_save_complete(monkeypatch, tmp_path):
+    import csv
+    from app import calculator as calculator_module
+    from app.observers import AutoSaveObserver
+    from app.operations import OperationFactory
+
+    monkeypatch.setattr(
+        calculator_module,
+        "config",
+        replace(
+            calculator_module.config,
+            async_observers=True, auto_save=False,
+            observer_queue_size=1, observer_backpressure="drop",
+        ),
+    )
+    gate = threading.Event()
+
+    class SlowObserver:
+        def update(self, calculation, history):
+            gate.wait(5)
+
+    path = tmp_path / "hist.csv"
+    calc = calculator_module.Calculator()
+    calc._observers = [SlowObserver(), AutoSaveObserver(path, mode="append")]
+    calc.set_operation(OperationFactory.create_operation("add"))
+    for i in range(20):
+        calc.perform_operation(i, 1)
+    calc.undo()
+    gate.set()
+    calc.close()
+    with open(path, newline="") as fh:
+        rows = list(csv.DictReader(fh))
+    assert [row["operand1"] for row in rows] == [str(i) for i in range(19)]
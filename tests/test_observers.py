@@ -13,10 +13,25 @@ def test_logging_observer(tmp_path):
     obs = LoggingObserver(log_file)
     calc = Calculation("Addition", Decimal("1"), Decimal("2"))
     obs.update(calc, [calc])
+    obs.flush()
     content = log_file.read_text().strip()
     assert "Addition" in content
 
 
+def test_logging_observer_batch(tmp_path):
+    log_file = tmp_path / "log.txt"
+    obs = LoggingObserver(log_file)
+    calcs = [
+        Calculation("Addition", Decimal("1"), Decimal("2")),
+        Calculation("Subtraction", Decimal("5"), Decimal("2")),
+    ]
+    obs.update_batch(calcs, calcs)
+    obs.close()
+    lines = log_file.read_text().splitlines()
+    assert len(lines) == 2
+    assert "Subtraction" in lines[1]
+
+
 def test_auto_save_observer(monkeypatch, tmp_path):
     captured = {}
 
@@ -27,10 +42,287 @@ def test_auto_save_observer(monkeypatch, tmp_path):
         def to_csv(self, path, index=False, encoding=None):
             captured["path"] = path
 
-    fake_pd = types.SimpleNamespace(DataFrame=lambda d: FakeDF(d))
+    fake_pd = types.SimpleNamespace(DataFrame=lambda d, columns=None: FakeDF(d))
     monkeypatch.setitem(sys.modules, "pandas", fake_pd)
 
     obs = AutoSaveObserver(tmp_path / "hist.csv")
     calc = Calculation("Addition", Decimal("1"), Decimal("2"))
     obs.update(calc, [calc])
-    assert captured["path"].name == "hist.csv"
\ No newline at end of file
+    assert captured["path"].name == "hist.csv"
+
+def test_auto_save_observer_batch_saves_once(monkeypatch, tmp_path):
+    saves = []
+
+    class FakeDF:
+        def __init__(self, data):
+            self.data = data
+
+        def to_csv(self, path, index=False, encoding=None):
+            saves.append(len(self.data))
+
+    fake_pd = types.SimpleNamespace(DataFrame=lambda d, columns=None: FakeDF(d))
+    monkeypatch.setitem(sys.modules, "pandas", fake_pd)
+
+    obs = AutoSaveObserver(tmp_path / "hist.csv")
+    calcs = [Calculation("Addition", Decimal(i), Decimal("2")) for i in range(3)]
+    obs.update_batch(calcs, calcs)
+    obs.update_batch([], calcs)
+    assert saves == [3]
+
+
+def _read_rows(path):
+    import csv
+
+    with open(path, newline="") as fh:
+        return list(csv.DictReader(fh))
+
+
+def _subscribed(history, observer):
+    """Deliver the history's change events to ``observer`` as the calculator does."""
+    history.subscribe(lambda events: observer.on_history_events(events, history.view()))
+    return history
+
+
+def test_auto_save_observer_append_mode(tmp_path):
+    from app.history import History
+
+    path = tmp_path / "hist.csv"
+    path.write_text("stale,data\n")
+    obs = AutoSaveObserver(path, mode="append", fsync_interval=2)
+    hist = _subscribed(History(), obs)
+    for i in range(3):
+        hist.add_calculation(Calculation("Addition", Decimal(i), Decimal("1")))
+
+    rows = _read_rows(path)
+    assert [r["operand1"] for r in rows] == ["0", "1", "2"]
+    assert rows[0]["result"] == "1"
+
+    # Undo removes the last row from the file without reading the history
+    assert obs.needs_history([]) is False
+    hist.undo()
+    assert [r["operand1"] for r in _read_rows(path)] == ["0", "1"]
+    hist.redo()
+    hist.undo()
+    hist.add_calculation(Calculation("Subtraction", Decimal("5"), Decimal("1")))
+    rows = _read_rows(path)
+    assert [r["operation"] for r in rows] == ["Addition", "Addition", "Subtraction"]
+
+    batch = [Calculation("Multiplication", Decimal(i), Decimal("2")) for i in range(2)]
+    hist.add_calculations(batch)
+    obs.update_batch([], hist.view())
+    obs.close()
+    obs.close()
+    assert len(_read_rows(path)) == 5
+
+    hist.clear()
+    assert _read_rows(path) == []
+    hist.add_calculation(batch[0])
+    assert [r["operation"] for r in _read_rows(path)] == ["Multiplication"]
+
+
+def test_auto_save_observer_append_compacts_evicted_rows(tmp_path, monkeypatch):
+    from dataclasses import replace
+    from app import history as history_module
+
+    monkeypatch.setattr(
+        history_module, "config", replace(history_module.config, max_history_size=2)
+    )
+    path = tmp_path / "hist.csv"
+    obs = AutoSaveObserver(path, mode="append")
+    hist = _subscribed(history_module.History(), obs)
+    for i in range(10):
+        hist.add_calculation(Calculation("Addition", Decimal(i), Decimal("1")))
+        assert len(_read_rows(path)) <= 4
+    obs.flush()
+    assert [r["operand1"] for r in _read_rows(path)][-2:] == ["8", "9"]
+
+    # Undoing the last step restores the entry it evicted at the front
+    hist.undo()
+    assert [r["operand1"] for r in _read_rows(path)] == ["7", "8"]
+    hist.redo()
+    assert [r["operand1"] for r in _read_rows(path)][-2:] == ["8", "9"]
+
+
+def test_auto_save_observer_load_event(tmp_path):
+    from app.history import History, HistoryEvent
+
+    path = tmp_path / "hist.csv"
+    obs = AutoSaveObserver(path, mode="append")
+    hist = _subscribed(History(), obs)
+    hist.add_calculation(Calculation("Addition", Decimal(1), Decimal(1)))
+    loaded = [Calculation("Division", Decimal(i), Decimal(2)) for i in range(3)]
+    obs.on_history_events([HistoryEvent("load", loaded)], None)
+    assert [r["operation"] for r in _read_rows(path)] == ["Division"] * 3
+
+
+def test_auto_save_observer_rewrite_clear_stays_loadable(tmp_path):
+    pytest.importorskip("pandas")
+    from app.history import CSV_COLUMNS, History
+
+    path = tmp_path / "hist.csv"
+    hist = _subscribed(History(), AutoSaveObserver(path, mode="rewrite"))
+    hist.add_calculation(Calculation("Addition", Decimal(1), Decimal(1)))
+    hist.clear()
+    assert path.read_text().splitlines() == [",".join(CSV_COLUMNS)]
+    loaded = History()
+    loaded.load_from_csv(path)
+    assert loaded.get_history() == []
+
+
+def test_auto_save_observer_rewrite_needs_history(tmp_path):
+    assert AutoSaveObserver(tmp_path / "hist.csv", mode="rewrite").needs_history([]) is True
+    # Append mode needs the history only to write the file the first time
+    obs = AutoSaveObserver(tmp_path / "hist.csv", mode="append")
+    assert obs.needs_history([]) is True
+    obs.compact([])
+    assert obs.needs_history([]) is False
+
+
+def test_logging_observer_ignores_undo_and_clear(tmp_path):
+    from app.history import History
+
+    log_file = tmp_path / "log.txt"
+    obs = LoggingObserver(log_file, buffer_size=0)
+    hist = _subscribed(History(), obs)
+    hist.add_calculations([Calculation("Addition", Decimal(i), Decimal("2")) for i in range(2)])
+    hist.undo()
+    hist.redo()
+    hist.clear()
+    obs.close()
+    assert len(log_file.read_text().splitlines()) == 2
+    assert obs.needs_history([]) is False
+
+
+def test_legacy_observer_receives_appends_only():
+    from app.history import HistoryEvent
+    from app.observers import Observer
+
+    calls = []
+
+    class LegacyObserver(Observer):
+        def update(self, calculation, history):
+            calls.append((calculation.operand1, history))
+
+    calcs = [Calculation("Addition", Decimal(i), Decimal("2")) for i in range(2)]
+    obs = LegacyObserver()
+    obs.on_history_events(
+        [HistoryEvent("append", calcs), HistoryEvent("evict", calcs[:1]), HistoryEvent("clear")],
+        "history",
+    )
+    obs.on_history_events([HistoryEvent("undo", calcs)], "history")
+    assert calls == [(Decimal(0), "history"), (Decimal(1), "history")]
+    assert obs.needs_history([]) is True
+
+
+def test_auto_save_observer_invalid_mode(tmp_path):
+    from app.exceptions import ConfigurationError
+
+    with pytest.raises(ConfigurationError):
+        AutoSaveObserver(tmp_path / "hist.csv", mode="bogus")
+
+
+def test_logging_observer_buffers_until_size(tmp_path):
+    log_file = tmp_path / "log.txt"
+    obs = LoggingObserver(log_file, buffer_size=200, flush_interval=3600)
+    calc = Calculation("Addition", Decimal("1"), Decimal("2"))
+    obs.update(calc, [calc])
+    assert not log_file.exists()
+    for _ in range(5):
+        obs.update(calc, [calc])
+    assert len(log_file.read_text().splitlines()) >= 4
+    obs.close()
+    assert len(log_file.read_text().splitlines()) == 6
+
+
+def test_logging_observer_flushes_on_interval(tmp_path):
+    log_file = tmp_path / "log.txt"
+    obs = LoggingObserver(log_file, buffer_size=10**6, flush_interval=0)
+    calc = Calculation("Addition", Decimal("1"), Decimal("2"))
+    obs.update(calc, [calc])
+    assert "Addition" in log_file.read_text()
+    obs.close()
+
+
+def test_logging_observer_flushes_on_timer_while_idle(tmp_path):
+    import time
+
+    log_file = tmp_path / "log.txt"
+    obs = LoggingObserver(log_file, buffer_size=10**6, flush_interval=0.2)
+    calc = Calculation("Addition", Decimal("1"), Decimal("2"))
+    obs.update(calc, [calc])
+    assert not log_file.exists()
+    # The timer thread creates the file before writing to it
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        if log_file.exists() and "Addition" in log_file.read_text():
+            break
+        time.sleep(0.01)
+    assert "Addition" in log_file.read_text()
+    assert obs._timer is None
+    obs.close()
+
+
+def test_logging_observer_close_cancels_timer(tmp_path):
+    log_file = tmp_path / "log.txt"
+    obs = LoggingObserver(log_file, buffer_size=10**6, flush_interval=3600)
+    calc = Calculation("Addition", Decimal("1"), Decimal("2"))
+    obs.update(calc, [calc])
+    timer = obs._timer
+    assert timer is not None and timer.daemon
+    obs.close()
+    assert obs._timer is None
+    assert not timer.is_alive() or timer.finished.is_set()
+    assert len(log_file.read_text().splitlines()) == 1
+
+
+def test_logging_observer_rotates(tmp_path):
+    log_file = tmp_path / "log.txt"
+    obs = LoggingObserver(log_file, buffer_size=0, max_bytes=100, backup_count=2)
+    for i in range(12):
+        calc = Calculation("Addition", Decimal(i), Decimal("2"))
+        obs.update(calc, [calc])
+    obs.close()
+    assert log_file.stat().st_size <= 100
+    assert (tmp_path / "log.txt.1").exists()
+    assert (tmp_path / "log.txt.2").exists()
+    assert not (tmp_path / "log.txt.3").exists()
+
+    obs = LoggingObserver(log_file, buffer_size=0, max_bytes=100, backup_count=0)
+    for i in range(3):
+        obs.update(calc, [calc])
+    obs.close()
+    assert len(log_file.read_text().splitlines()) == 1
+
+
+def test_logging_observer_rotation_reopens_app_log_handler(tmp_path, monkeypatch):
+    import logging
+    from app import observers
+
+    log_file = tmp_path / "shared.log"
+    handler = logging.FileHandler(log_file, delay=True)
+    monkeypatch.setattr(observers.logger, "handlers", [handler])
+    obs = LoggingObserver(log_file, buffer_size=0, max_bytes=200, backup_count=1)
+    calc = Calculation("Addition", Decimal("1"), Decimal("2"))
+    obs.update(calc, [calc])
+    # The size check counts what the application logger wrote
+    observers.logger.info("x" * 300)
+    obs.update(calc, [calc])
+    observers.logger.info("after rotation")
+    handler.close()
+    obs.close()
+    backup = (tmp_path / "shared.log.1").read_text()
+    assert "x" * 300 in backup and "after rotation" not in backup
+    current = log_file.read_text()
+    assert "after rotation" in current and "Addition" in current
+
+
+def test_logging_observer_dedupes_app_logger(tmp_path, monkeypatch):
+    import logging
+    from app import observers
+
+    log_file = tmp_path / "shared.log"
+    handler = logging.FileHandler(log_file, delay=True)
+    monkeypatch.setattr(observers.logger, "handlers", [handler])
+    assert LoggingObserver(log_file).log_to_app_logger is False
+    assert LoggingObserver(tmp_path / "other.log").log_to_app_logger is True
+    assert LoggingObserver(log_file, log_to_app_logger=True).log_to_app_logger is True
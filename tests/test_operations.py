@@ -14,7 +14,7 @@ from app.operations import (
     AbsoluteDifference,
     OperationFactory,
 )
-from app.exceptions import ValidationError
+from app.exceptions import OperationError, ValidationError
 
 
 @pytest.mark.parametrize(
@@ -59,7 +59,99 @@ def test_power_negative_exponent():
         op.execute(Decimal(2), Decimal(-1))
 
 
-@pytest.mark.parametrize("a,b", [(-1, 2), (4, 0)])
+def test_power_fractional_exponent_of_negative_base():
+    with pytest.raises(ValidationError):
+        Power().execute(Decimal(-8), Decimal("0.5"))
+    assert Power().execute(Decimal(-2), Decimal(3)) == Decimal(-8)
+
+
+@pytest.mark.parametrize(
+    "a,b,expected",
+    [
+        ("2", "0.5", "1.414213562373095"),
+        ("1.1", "100", "13780.61233982227"),
+        ("0", "0", "1"),
+        ("0", "0.5", "0"),
+        ("2", "10", "1024"),
+        ("1.5", "2", "2.25"),
+    ],
+)
+def test_power_decimal_precision(a, b, expected):
+    from decimal import localcontext
+
+    with localcontext(prec=16):
+        result = Power().execute(Decimal(a), Decimal(b))
+    assert result == Decimal(expected)
+    # No binary-float artifacts beyond the context precision
+    assert len(result.as_tuple().digits) <= 20
+
+
+def test_power_overflow_raises():
+    from decimal import Overflow
+
+    with pytest.raises(Overflow):
+        Power().execute(Decimal(10), Decimal(10) ** 20)
+
+
+@pytest.mark.parametrize(
+    "a,b,expected",
+    [
+        ("27", "3", "3"),
+        ("100", "2", "10"),
+        ("0.001", "3", "0.1"),
+        ("32", "5", "2"),
+        ("2.50", "1", "2.50"),
+        ("16", "-2", "0.25"),
+        ("2", "3", "1.259921049894873"),
+        ("1E+20", "7", "719.6856730011520"),
+        ("16", "0.5", "256"),
+        ("0", "2.5", "0"),
+    ],
+)
+def test_root_decimal_precision(a, b, expected):
+    from decimal import localcontext
+
+    with localcontext(prec=16):
+        result = Root().execute(Decimal(a), Decimal(b))
+    assert result == Decimal(expected)
+    if Decimal(b) == Decimal(b).to_integral_value():
+        # Exact roots carry no spurious trailing zeros
+        assert str(result) == expected
+
+
+def test_root_matches_high_precision_reference():
+    import random
+    from decimal import localcontext
+
+    rng = random.Random(7)
+    for _ in range(200):
+        a = Decimal(rng.randint(1, 10 ** 12)).scaleb(-rng.randint(0, 8))
+        n = Decimal(rng.randint(3, 9))
+        result = Root().execute(a, n)
+        with localcontext() as ctx:
+            ctx.prec = 40
+            reference = a ** (1 / n)
+        assert abs(result - reference) <= abs(reference).scaleb(-15)
+
+
+@pytest.mark.parametrize(
+    "a,n",
+    [("0.5", 400), ("1E-300", 1000), ("0.999", 5000), ("1E-999999", 997), ("7.5E+999999", 1001)],
+)
+def test_root_high_degree_matches_reference(a, n):
+    from decimal import localcontext
+
+    a = Decimal(a)
+    with localcontext(prec=16):
+        result = Root().execute(a, Decimal(n))
+    with localcontext() as ctx:
+        ctx.prec = 40
+        reference = (a.ln() / n).exp()
+    assert result.is_finite()
+    assert abs(result - reference) <= abs(reference).scaleb(-15)
+
+
+@pytest.mark.parametrize("a,b", [(-1, 2), (4, 0), (0, -2)])
 def test_root_invalid(a, b):
     op = Root()
     with pytest.raises(ValidationError):
@@ -99,3 +191,139 @@ def test_operation_factory_register():
     OperationFactory.register_operation("dummy", Dummy)
     op = OperationFactory.create_operation("dummy")
     assert isinstance(op, Dummy)
+
+
+@pytest.mark.parametrize(
+    "cls,a,b,expected,mask",
+    [
+        (Addition, [1, 2], [2, 3], [3, 5], [True, True]),
+        (Subtraction, [5, 1], [3, 4], [2, -3], [True, True]),
+        (Multiplication, [2, 3], [4, 5], [8, 15], [True, True]),
+        (Division, [6, 1], [3, 0], [2, 0], [True, False]),
+        (Power, [2, 2], [3, -1], [8, 0], [True, False]),
+        (Power, [-8.0, -2.0, 4.0], [0.5, 3.0, 0.5], [0, -8, 2], [False, True, True]),
+        (Root, [9, -1, 4], [2, 2, 0], [3, 0, 0], [True, False, False]),
+        (Root, [0.0, 0.0, 4.0], [-2, 2, -2], [0, 0, 0.5], [False, True, True]),
+        (Modulus, [7, -7, 5], [4, 4, 0], [3, -3, 0], [True, True, False]),
+        (IntegerDivision, [7, -7, 5], [3, 2, 0], [2, -3, 0], [True, True, False]),
+        (Percentage, [25, 1], [100, 0], [25, 0], [True, False]),
+        (AbsoluteDifference, [10, 6], [6, 10], [4, 4], [True, True]),
+    ],
+)
+def test_operations_execute_array(cls, a, b, expected, mask):
+    np = pytest.importorskip("numpy")
+    result, valid = cls().execute_array(a, b)
+    assert valid.tolist() == mask
+    assert np.allclose(result, expected)
+    for row_a, row_b, row_result, row_valid in zip(a, b, result, valid):
+        if row_valid:
+            assert Decimal(float(row_result)) == cls().execute(Decimal(row_a), Decimal(row_b))
+
+
+def test_execute_array_integer_dtype():
+    np = pytest.importorskip("numpy")
+    result, _ = Addition().execute_array([1, 2], [3, 4])
+    assert result.dtype == np.int64
+    result, _ = Division().execute_array([1, 2], [4, 4])
+    assert result.dtype == np.float64
+
+
+def test_execute_array_integer_overflow():
+    np = pytest.importorskip("numpy")
+    result, mask = Multiplication().execute_array([10**10, 2], [10**10, 3])
+    assert result.dtype == np.float64
+    assert mask.tolist() == [True, True]
+    assert result.tolist() == [1e20, 6.0]
+    result, _ = Addition().execute_array([2**63 - 1], [1])
+    assert result[0] == 2.0 ** 63
+    result, _ = AbsoluteDifference().execute_array([-(2**62)], [2**62])
+    assert result[0] == 2.0 ** 63
+    # Large operands whose results still fit stay exact in int64
+    result, _ = Addition().execute_array([2**40, 1], [2**40, 2])
+    assert result.dtype == np.int64
+    assert result.tolist() == [2**41, 3]
+
+
+def test_operation_factory_vectorized():
+    pytest.importorskip("numpy")
+    op = OperationFactory.create_operation("divide", vectorized=True)
+    assert isinstance(op, Division)
+
+
+def test_operation_factory_vectorized_unsupported():
+    pytest.importorskip("numpy")
+
+    class Scalar(Addition.__base__):
+        def execute(self, a: Decimal, b: Decimal) -> Decimal:
+            return a
+
+    OperationFactory.register_operation("scalar_only", Scalar)
+    with pytest.raises(OperationError):
+        OperationFactory.create_operation("scalar_only", vectorized=True)
+    with pytest.raises(OperationError):
+        Scalar().execute_array([1], [1])
+
+
+def test_operation_factory_vectorized_without_numpy(monkeypatch):
+    import sys
+
+    monkeypatch.setitem(sys.modules, "numpy", None)
+    with pytest.raises(OperationError):
+        OperationFactory.create_operation("add", vectorized=True)
+
+
+@pytest.fixture
+def operation_cache(monkeypatch):
+    from dataclasses import replace
+    from app import operations as operations_module
+
+    monkeypatch.setattr(
+        operations_module, "config", replace(operations_module.config, operation_cache_size=2)
+    )
+    monkeypatch.setattr(OperationFactory, "_cache", None)
+    return OperationFactory.get_cache()
+
+
+def test_operation_factory_cache_disabled_by_default():
+    assert OperationFactory.get_cache() is None
+    assert OperationFactory.cache_stats() is None
+    assert isinstance(OperationFactory.create_operation("power"), Power)
+
+
+def test_cached_operation_memoizes_results(operation_cache):
+    from decimal import localcontext
+    from app.operations import CachedOperation
+
+    op = OperationFactory.create_operation("power")
+    assert isinstance(op, CachedOperation)
+    assert str(op) == "Power"
+    # Cheap operations are not worth a cache lookup
+    assert isinstance(OperationFactory.create_operation("add"), Addition)
+
+    assert op.execute(Decimal("2"), Decimal("10")) == Decimal("1024")
+    assert op.execute(Decimal("2"), Decimal("10")) == Decimal("1024")
+    # Different spelling or context precision means a different entry
+    op.execute(Decimal("2.0"), Decimal("10"))
+    with localcontext() as ctx:
+        ctx.prec = 5
+        OperationFactory.create_operation("root").execute(Decimal("2"), Decimal("2"))
+
+    stats = OperationFactory.cache_stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.size) == (1, 3, 1, 2)
+
+    with pytest.raises(ValidationError):
+        op.execute(Decimal("0"), Decimal("-1"))
+    with pytest.raises(ValidationError):
+        op.validate_operands(Decimal("0"), Decimal("-1"))
+    assert OperationFactory.cache_stats().size == 2
+
+
+def test_cached_operation_keeps_vectorized_path(operation_cache):
+    pytest.importorskip("numpy")
+    from app.operations import CachedOperation
+
+    assert isinstance(OperationFactory.create_operation("power", vectorized=True), Power)
+    cached = CachedOperation(Power(), operation_cache)
+    results, mask = cached.execute_array([2, 3], [2, 2])
+    assert list(results) == [4, 9]
+    assert list(mask) == [True, True]
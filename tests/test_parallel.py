@@ -0,0 +1,66 @@
+from dataclasses import replace
+from decimal import Decimal, localcontext
+import multiprocessing
+
+import pytest
+
+from app import calculator as calculator_module
+from app import parallel as parallel_module
+from app.calculator import Calculator
+from app.exceptions import OperationError, ValidationError
+from app.parallel import ParallelBatchExecutor
+
+
+@pytest.fixture(autouse=True)
+def no_auto_save(monkeypatch):
+    monkeypatch.setattr(
+        calculator_module, "config", replace(calculator_module.config, auto_save=False)
+    )
+
+
+def test_parallel_batch_merges_chunks_in_order():
+    calc = Calculator()
+    a = [str(i) for i in range(25)] + ["x", "5"]
+    b = ["2"] * 25 + ["1", "0"]
+    with ParallelBatchExecutor(calc, max_workers=2, chunk_size=4) as executor:
+        batch = executor.evaluate("int_divide", a, b)
+
+    assert batch.operation == "IntegerDivision"
+    assert len(batch) == 27
+    assert batch.results[:25] == [Decimal(i // 2) for i in range(25)]
+    assert batch.mask[25:] == [False, False]
+    assert isinstance(batch.errors[25], ValidationError)
+    assert "cannot be zero" in str(batch.errors[26])
+
+    assert len({c.timestamp for c in batch.calculations}) == 1
+    history = calc.get_history()
+    assert len(history) == min(25, calculator_module.config.max_history_size)
+    assert history[-1].operand1 == Decimal(24)
+    calc.undo()
+    assert calc.get_history() == []
+
+
+def test_parallel_workers_share_config_and_context(monkeypatch):
+    monkeypatch.setattr(
+        parallel_module, "config", replace(parallel_module.config, max_input_value=10)
+    )
+    # A fresh interpreter proves the state is passed in, not inherited
+    spawn = multiprocessing.get_context("spawn")
+    with localcontext() as ctx:
+        ctx.prec = 50
+        with ParallelBatchExecutor(max_workers=1, chunk_size=2, mp_context=spawn) as executor:
+            batch = executor.evaluate("divide", ["1", "2", "11"], ["3", "3", "1"])
+
+    assert len(batch.results[0].as_tuple().digits) == 50
+    assert batch.mask == [True, True, False]
+    assert "exceeds maximum allowed value 10" in str(batch.errors[2])
+
+
+def test_parallel_batch_rejects_bad_input():
+    with ParallelBatchExecutor(max_workers=1) as executor:
+        with pytest.raises(OperationError):
+            executor.evaluate("foo", ["1"], ["2"])
+        with pytest.raises(ValidationError):
+            executor.evaluate("add", ["1", "2"], ["3"])
+        empty = executor.evaluate("add", [], [])
+    assert len(empty) == 0
@@ -0,0 +1,52 @@
+"""Cold-start benchmark for the CLI entry point, based on ``python -X importtime``."""
+
+import os
+from pathlib import Path
+import subprocess
+import sys
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Generous ceiling for importing main.py; catches regressions such as an
+# eager pandas import without being sensitive to machine speed.
+STARTUP_BUDGET_US = 1_500_000
+
+# Modules that must only be imported when they are actually used
+LAZY_MODULES = ("pandas", "numpy", "colorama")
+
+
+def _import_times(tmp_path):
+    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+    for key in list(env):
+        if key.startswith("CALCULATOR_"):
+            del env[key]
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=tmp_path,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_startup_import_time(tmp_path):
+    times = _import_times(tmp_path)
+    assert "main" in times
+    assert times["main"] < STARTUP_BUDGET_US
+
+
+def test_startup_defers_heavy_work(tmp_path):
+    times = _import_times(tmp_path)
+    for module in LAZY_MODULES:
+        assert not any(name == module or name.startswith(module + ".") for name in times), module
+    # No log or history directories are created just by importing
+    assert list(tmp_path.iterdir()) == []
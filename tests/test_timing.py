@@ -0,0 +1,90 @@
+from dataclasses import replace
+import random
+
+from app.timing import (
+    LatencyHistogram,
+    StageTimer,
+    _bucket_index,
+    _bucket_upper_bound,
+    format_stats,
+)
+
+
+def test_bucket_bounds_cover_values():
+    for value in list(range(200)) + [10**6, 10**9 + 7, 2**63]:
+        index = _bucket_index(value)
+        assert value <= _bucket_upper_bound(index)
+        assert index == 0 or value > _bucket_upper_bound(index - 1)
+
+
+def test_histogram_percentiles_within_bucket_error():
+    rng = random.Random(7)
+    values = [rng.randrange(1_000, 5_000_000) for _ in range(10_000)]
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+    ordered = sorted(values)
+    summary = histogram.summary()
+    assert summary.count == len(values)
+    assert summary.max_ns == ordered[-1]
+    assert summary.mean_ns == sum(values) / len(values)
+    for reported, fraction in ((summary.p50_ns, 0.50), (summary.p95_ns, 0.95), (summary.p99_ns, 0.99)):
+        exact = ordered[round(fraction * len(values)) - 1]
+        assert exact <= reported <= exact * 1.125
+
+
+def test_empty_histogram_and_stats():
+    assert LatencyHistogram().summary().p99_ns == 0
+    assert LatencyHistogram().summary().mean_ns == 0.0
+    assert format_stats({}) == "No timings recorded."
+
+
+def test_stage_timer_snapshot_and_reset():
+    timer = StageTimer()
+    timer.record("Addition", "execute", 1_500)
+    timer.record("Addition", "execute", 2_500)
+    timer.record("Power", "validate", 700)
+    stats = timer.snapshot()
+    assert list(stats) == ["Addition", "Power"]
+    assert stats["Addition"]["execute"].count == 2
+    assert stats["Addition"]["execute"].max_ns == 2_500
+    table = format_stats(stats)
+    assert "Addition" in table and "2.5" in table
+    timer.reset()
+    assert timer.snapshot() == {}
+
+
+def test_calculator_stage_timing(monkeypatch, tmp_path):
+    from app import calculator as calculator_module
+    from app.observers import LoggingObserver
+    from app.operations import OperationFactory
+
+    monkeypatch.setattr(
+        calculator_module,
+        "config",
+        replace(calculator_module.config, auto_save=False, stage_timing=False),
+    )
+    calc = calculator_module.Calculator()
+    calc._observers = [LoggingObserver(tmp_path / "log.txt")]
+    calc.set_operation(OperationFactory.create_operation("power"))
+    calc.perform_operation("2", "3")
+    assert calc.get_stats() == {}
+
+    calc.enable_stats()
+    for _ in range(5):
+        calc.perform_operation("2", "3")
+    calc.undo()
+    stats = calc.get_stats()
+    assert set(stats["Power"]) == {
+        "validate", "execute", "calculation", "history", "total", "observer:LoggingObserver",
+    }
+    assert stats["Power"]["total"].count == 5
+    assert stats["Power"]["total"].max_ns >= stats["Power"]["execute"].max_ns
+    assert stats["undo"]["observer:LoggingObserver"].count == 1
+
+    calc.reset_stats()
+    assert calc.get_stats() == {}
+    calc.enable_stats(False)
+    calc.perform_operation("2", "3")
+    assert calc.get_stats() == {}
+    calc.close()
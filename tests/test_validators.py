@@ -70,3 +70,62 @@ def test_validate_number_negative_exponent():
     assert isinstance(result, Decimal)
     assert result == Decimal("0.0000000001")
 
+
+
+def test_validate_number_fast_paths():
+    value = Decimal("2.50")
+    assert InputValidator.validate_number(value) is value
+    assert str(InputValidator.validate_number(7)) == "7"
+    # Floats go through their shortest repr, not the binary expansion
+    assert str(InputValidator.validate_number(0.1)) == "0.1"
+    with pytest.raises(ValidationError):
+        InputValidator.validate_number(True)
+    with pytest.raises(ValidationError):
+        InputValidator.validate_number(Decimal("NaN"))
+    with pytest.raises(ValidationError, match="cannot be empty"):
+        InputValidator.validate_number(" \t ")
+
+
+def test_validate_number_bound_follows_config(monkeypatch):
+    from dataclasses import replace
+    from app import input_validators
+
+    monkeypatch.setattr(input_validators, "config", replace(input_validators.config, max_input_value=5))
+    assert InputValidator.validate_number(5) == 5
+    with pytest.raises(ValidationError, match="maximum allowed value 5"):
+        InputValidator.validate_number(Decimal("5.1"))
+    monkeypatch.setattr(input_validators, "config", replace(input_validators.config, max_input_value=10))
+    assert InputValidator.validate_number(Decimal("5.1")) == Decimal("5.1")
+
+
+def test_validate_number_parse_cache(monkeypatch):
+    from dataclasses import replace
+    from app import input_validators
+
+    monkeypatch.setattr(input_validators, "config", replace(input_validators.config, parse_cache_size=2))
+    monkeypatch.setattr(input_validators, "_parse_cache", None)
+    assert InputValidator.validate_number(" 1.5 ") == Decimal("1.5")
+    assert InputValidator.validate_number(" 1.5 ") == Decimal("1.5")
+    with pytest.raises(ValidationError):
+        InputValidator.validate_number("abc")
+    with pytest.raises(ValidationError):
+        InputValidator.validate_number("")
+
+    stats = input_validators._parse_cache.stats()
+    assert (stats.hits, stats.size) == (1, 1)
+
+    # Cached values are still checked against the current bound
+    monkeypatch.setattr(
+        input_validators, "config", replace(input_validators.config, max_input_value=1)
+    )
+    with pytest.raises(ValidationError):
+        InputValidator.validate_number(" 1.5 ")
+
+
+def test_validate_numbers_reports_per_item_errors():
+    numbers, errors = InputValidator.validate_numbers(["1", "x", None, 2, Decimal("3")])
+    assert numbers == [Decimal("1"), None, None, Decimal("2"), Decimal("3")]
+    assert [type(e) if e else None for e in errors] == [
+        None, ValidationError, ValidationError, None, None,
+    ]
+    assert InputValidator.validate_numbers([]) == ([], [])